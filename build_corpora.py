@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+'''
+Builds the corpora bundled with the seeder from their source lists
+
+Every corpora/<name>.txt file is a newline separated list of entries, where
+blank lines and lines starting with "#" (the description and source of the
+list) are left out. Each list is written to data_seeder/corpora/<name>.bin
+with write_corpus.
+'''
+
+import glob
+import os
+import sys
+
+from data_seeder.corpus import CORPORA_DIR, write_corpus
+
+SOURCES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "corpora")
+
+
+def read_source(path):
+    with open(path, encoding="utf-8") as source_file:
+        lines = [line.strip() for line in source_file]
+
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or [
+        os.path.splitext(os.path.basename(path))[0]
+        for path in sorted(glob.glob(os.path.join(SOURCES_DIR, "*.txt")))
+    ]
+
+    for name in names:
+        values = read_source(os.path.join(SOURCES_DIR, "%s.txt" % name))
+        write_corpus(os.path.join(CORPORA_DIR, "%s.bin" % name), values)
+        print("%s: %d entries" % (name, len(values)))
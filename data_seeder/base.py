@@ -5,9 +5,36 @@ These are the classes that do the most work in terms of deciding how to seed
 data and what to do with it.
 '''
 
-from django.db import models
+import contextlib
+import queue
+import random
+import threading
+import time
+
+from array import array
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.color import no_style
+from django.db import connections, models, router, transaction
 
 from . import generators
+from .batch import ColumnarBatch, Constant
+from .churn import ChurnReport, select_pks
+from .factory import get_factory
+from .keys import ExistingKeys
+from .trickle import MonotonicTimestamps, TokenBucket, TrickleReport
+from .tuning import get_profile, tuned_database
+from .writers import OrmWriter
+
+try:
+    from django.contrib.postgres.fields import ArrayField
+except ImportError:
+    ArrayField = None
+
+# time.perf_counter_ns only exists from Python 3.7
+perf_counter_ns = getattr(time, "perf_counter_ns",
+                          lambda: int(time.perf_counter() * 1e9))
 
 
 class DataSeeder:
@@ -33,32 +60,109 @@ class DataSeeder:
         whether or not to follow and generate foreign relations recursively
 
     values : dict
-        a dictionary of static values to use instead of random generators
+        a dictionary mapping field names to static values, generators or
+        callables to use instead of the default generators
+
+    field_options : dict
+        a dictionary mapping field names to the distribution their values
+        are drawn from
+
+    compiled : bool
+        whether instances are built by a code-generated row factory
+
+    hooks : list
+        the data_seeder.hooks.SeedHooks objects observing the seeder
+
+    tuning : bool or data_seeder.tuning.TuningProfile
+        whether, or with which profile, the session settings of the
+        connection are relaxed while seeding
+
+    batch_size : int
+        the number of seeds committed together in a single transaction
+
+    checkpoint : data_seeder.checkpoint.Checkpoint
+        a checkpoint to record progress to after every committed batch
+
+    related_pks : dict
+        a dictionary mapping foreign key field names to the primary keys to
+        assign to them, in turn
+
+    return_seeds : bool
+        whether seed() returns model instances or only primary keys
+
+    pipeline : bool
+        whether batches are written by a separate writer thread while the
+        next batch is generated
+
+    queue_size : int
+        the maximum number of generated batches waiting to be written in
+        pipelined mode
+
+    preallocate_pks : bool
+        whether primary keys are assigned to seeds before they are written
+
+    tree_field : str
+        the name of a foreign key to the model itself to seed a hierarchy
+        through, or None to seed flat rows
+
+    depth : int
+        the number of levels of a seeded hierarchy
+
+    branching : int
+        the number of children of every non-leaf node of a seeded hierarchy
+
+    target_count : int
+        the number of rows the model's table should hold once seeded, or
+        None to always generate new seeds
+
+    approximate_count : bool
+        whether the current number of rows may be estimated when topping up
+        to target_count
+
+    using : str
+        the alias of the database seeds are written to
+
+    writer_class : type
+        the writer class used to write every batch
 
 
     Methods
     -------
 
+    compile()
+        compiles the field plan for the attributed model
+
     seed()
         generates seed(s) for the attrributed model
 
+    trickle(rate, duration) : data_seeder.trickle.TrickleReport
+        writes seeds at a target rate for a duration
+
+    churn(update, delete) : data_seeder.churn.ChurnReport
+        updates and deletes a fraction of the existing rows
+
     '''
 
     field_generators = [
         (models.BigIntegerField, generators.IntegerGenerator),
+        (models.BinaryField, generators.BinaryGenerator),
         (models.BooleanField, generators.BooleanGenerator),
         (models.CharField, generators.StringGenerator),
         (models.DateField, generators.DateGenerator),
         (models.DateTimeField, generators.DateTimeGenerator),
         (models.DecimalField, generators.DecimalGenerator),
+        (models.DurationField, generators.DurationGenerator),
         (models.EmailField, generators.EmailGenerator),
+        (models.FileField, generators.FileGenerator),
         (models.FloatField, generators.FloatGenerator),
+        (models.ImageField, generators.ImageGenerator),
         (models.IntegerField, generators.IntegerGenerator),
         (models.GenericIPAddressField, generators.IpAddressGenerator),
         (models.NullBooleanField, generators.BooleanGenerator),
         (models.PositiveIntegerField, generators.PositiveIntegerGenerator),
         (models.PositiveSmallIntegerField,
             generators.PositiveIntegerGenerator),
+        (models.SlugField, generators.SlugGenerator),
         (models.SmallIntegerField, generators.IntegerGenerator),
         (models.TextField, generators.StringGenerator),
         (models.TimeField, generators.TimeGenerator),
@@ -66,7 +170,21 @@ class DataSeeder:
         (models.UUIDField, generators.UuidGenerator)
     ]
 
-    def __init__(self, model, seeds=1, generate_related=False, values={}):
+    # JSONField was added in Django 3.1
+    if hasattr(models, "JSONField"):
+        field_generators.append((models.JSONField, generators.JsonGenerator))
+
+    batch_size = 1000
+    queue_size = 2
+    writer_class = OrmWriter
+
+    def __init__(self, model, seeds=1, generate_related=False, values={},
+                 batch_size=None, checkpoint=None, related_pks={},
+                 return_seeds=True, writer=None, pipeline=False,
+                 queue_size=None, preallocate_pks=False, tree_field=None,
+                 depth=1, branching=2, target_count=None,
+                 approximate_count=False, field_options={}, compiled=False,
+                 hooks=(), tuning=False):
         '''
         Parameters
         ----------
@@ -83,66 +201,894 @@ class DataSeeder:
             (default is False)
 
         values : dict, optional
-            a dictionary of static values to use instead of random generators
-            (default is {})
+            a dictionary mapping field names to what to use instead of their
+            default generators: a static value, a generator instance, a
+            callable called once per row, or a batch callable decorated with
+            data_seeder.generators.batch_values and called once per batch as
+            f(size, rng), where rng is the random module (default is {})
+
+        batch_size : int, optional
+            the number of seeds committed together in a single transaction
+            (default is 1000)
+
+        checkpoint : data_seeder.checkpoint.Checkpoint, optional
+            a checkpoint to record progress to after every committed batch.
+            If the checkpoint already holds progress for the model, seeding
+            resumes from the last committed batch (default is None)
+
+        related_pks : dict, optional
+            a dictionary mapping foreign key field names to a sequence of
+            primary keys, such as a data_seeder.keys.ExistingKeys. Seeds are
+            assigned these keys in turn, so that every key is referenced the
+            same number of times (default is {})
+
+        return_seeds : bool, optional
+            whether seed() returns the generated model instances. When False
+            only their primary keys are returned, and instances are never
+            built unless the writer needs them (default is True)
+
+        writer : type, optional
+            the writer class used to write every batch, such as
+            data_seeder.writers.RawWriter (default is OrmWriter)
+
+        pipeline : bool, optional
+            whether to write batches from a separate writer thread while the
+            next batch is generated (default is False)
+
+        queue_size : int, optional
+            the maximum number of generated batches waiting to be written in
+            pipelined mode (default is 2)
+
+        preallocate_pks : bool, optional
+            whether to reserve a range of integer primary keys for every
+            batch and assign them before it is written, so that the keys of
+            every seed are known whatever the writer or database. Once
+            seeding ends, database sequences are moved past the reserved
+            keys. The model must have an integer auto primary key, and no
+            other process should insert into its table while seeding
+            (default is False)
+
+        tree_field : str, optional
+            the name of a foreign key to the model itself. When given, seeds
+            is the number of root nodes and every node of the hierarchy
+            below them has tree_field set to its parent. Cannot be combined
+            with a checkpoint (default is None)
+
+        depth : int, optional
+            the number of levels of the hierarchy, including the roots
+            (default is 1)
+
+        branching : int, optional
+            the number of children of every node above the last level of the
+            hierarchy (default is 2)
+
+        target_count : int, optional
+            the number of rows the model's table should hold once seeded.
+            When given, seeds is ignored and only the rows missing from the
+            table are generated, so repeated runs do nothing once the target
+            is reached. Cannot be combined with a checkpoint or a tree_field
+            (default is None)
+
+        approximate_count : bool, optional
+            whether the current number of rows may be taken from the
+            planner's estimate rather than counted, when topping up to
+            target_count on Postgres (default is False)
+
+        field_options : dict, optional
+            a dictionary mapping field names to a dictionary naming the
+            distribution to draw their values from (i.e. {"distribution":
+            "normal", "mean": 50, "stddev": 10}), along with the keyword
+            arguments of its generator. For foreign keys the distribution
+            picks which related rows are referenced, so that {"distribution":
+            "zipf", "s": 1.2} makes a few related rows far more popular than
+            the rest. The weighted distribution draws from the field's
+            choices, weighted by its weights option (i.e. {"distribution":
+            "weighted", "weights": {"draft": 1, "published": 9}}), and
+            fields with choices draw from them evenly when not given any
+            options (default is {})
+
+        compiled : bool, optional
+            whether to build model instances with a row factory generated
+            and cached for the model and the shape of its batches, rather
+            than through Model.__init__. Factories do not send pre_init or
+            post_init, so models with receivers for either are always built
+            through Model.__init__ (default is False)
+
+        hooks : iterable, optional
+            data_seeder.hooks.SeedHooks objects called when the field plan
+            is compiled, when every batch is generated and flushed, and when
+            seeding fails, such as a data_seeder.metrics.MetricsCollector
+            (default is ())
+
+        tuning : bool or data_seeder.tuning.TuningProfile, optional
+            True to relax the session settings of the connection seeds are
+            written over with the tuning profile registered for its vendor
+            while seeding (i.e. synchronous=off on SQLite), a profile to use
+            instead, or False to leave the connection untouched. Settings
+            are reverted once seeding is done (default is False)
         '''
 
         self.model = model
         self.seeds = seeds
         self.generate_related = generate_related
         self.values = values
+        self.checkpoint = checkpoint
+        self.related_pks = related_pks
+        self.return_seeds = return_seeds
+        self.pipeline = pipeline
+        self.preallocate_pks = preallocate_pks
+        self.tree_field = tree_field
+        self.depth = depth
+        self.branching = branching
+        self.target_count = target_count
+        self.approximate_count = approximate_count
+        self.field_options = field_options
+        self.compiled = compiled
+        self.hooks = list(hooks)
+        self.tuning = tuning
+        self.using = router.db_for_write(model)
+
+        if batch_size is not None:
+            self.batch_size = batch_size
+
+        if writer is not None:
+            self.writer_class = writer
+
+        if queue_size is not None:
+            self.queue_size = queue_size
+
+        if preallocate_pks and \
+                not isinstance(model._meta.pk, models.AutoField):
+            raise ValueError('"%s" does not have an integer auto primary key'
+                             % model._meta.label)
+
+        if tree_field is not None:
+            self._check_tree_field()
+
+        for field_name, options in field_options.items():
+            distribution = options.get("distribution")
+            if distribution not in generators.DISTRIBUTIONS:
+                raise ValueError('Unknown distribution "%s" for "%s"' %
+                                 (distribution, field_name))
+
+        if target_count is not None and \
+                (checkpoint is not None or tree_field is not None):
+            raise ValueError("target_count cannot be combined with a "
+                             "checkpoint or a tree_field")
+
+        # Levels of a hierarchy are seeded by seeders of their own, which
+        # would never record progress to the checkpoint
+        if tree_field is not None and checkpoint is not None:
+            raise ValueError("tree_field cannot be combined with a "
+                             "checkpoint")
+
+        self._field_plan = None
+        self._associated_pks = {}
+        self._next_pk = None
+        self._flushed = 0
+
+    def compile(self):
+        '''
+        Compiles the field plan for the attributed model
+
+        The field plan maps every concrete field to a function building the
+        column of that field for a batch of seeds. It is only compiled once
+        per seeder, so generators are looked up once rather than once per
+        field of every seed.
+
+        Returns
+        -------
+
+        list
+            a list of (attribute name, column function) tuples
+        '''
+
+        if self._field_plan is None:
+            started = perf_counter_ns()
+            self._field_plan = [
+                (field.attname, self._compile_field(field))
+                for field in self.model._meta.concrete_fields
+            ]
+
+            self._notify("on_plan_compiled", self.seeds,
+                         len(self._field_plan),
+                         perf_counter_ns() - started)
+
+        return self._field_plan
 
     def seed(self):
         '''
         Generates and saves seeds for the objects model
+
+        Seeds are generated and committed in batches of batch_size. When a
+        checkpoint is provided, progress is recorded after every committed
+        batch.
+
+        When a target_count is given, only the seeds missing from the
+        model's table are generated.
+
+        When a tree_field is given, a hierarchy is seeded one level at a
+        time. Every level is seeded in bulk, with the parents of its nodes
+        taken from the primary keys seeded for the level above.
+
+        In pipelined mode, batches are written by a separate writer thread
+        over its own database connection while the next batch is generated.
+        At most queue_size generated batches wait to be written at any time.
+        An error raised while writing stops generation and is raised again
+        from this method.
+
+        Returns
+        -------
+
+        list
+            the seeds generated by this call, or their primary keys if
+            return_seeds is False
+        '''
+
+        if self.tree_field is not None:
+            return self._seed_tree()
+
+        if self.target_count is not None:
+            self.seeds = max(0, self.target_count - self._count_existing())
+
+        committed = 0
+        self._associated_pks = {}
+
+        if self.checkpoint is not None:
+            committed, related = self.checkpoint.restore(self.model)
+            for label, pk in related.items():
+                self._associated_pks[apps.get_model(label)] = pk
+
+        self._next_pk = None
+        self._flushed = 0
+        started = perf_counter_ns()
+
+        try:
+            # The writer thread of a pipelined seeder opens its connection
+            # once the database settings are applied
+            with tuned_database(self.using, self.tuning):
+                if self.pipeline:
+                    return self._seed_pipelined(committed)
+
+                writer = self.writer_class(self.model, self.using)
+                seeds = []
+
+                with self._tuned():
+                    for batch, progress in self._generate_batches(
+                            committed):
+                        seeds.extend(self._write_batch(writer, batch,
+                                                       progress))
+
+                return seeds
+
+        except BaseException as e:
+            self._notify("on_error", e, self._flushed,
+                         perf_counter_ns() - started)
+            raise
+
+        finally:
+            if self._next_pk is not None:
+                self._reset_sequences()
+
+    def trickle(self, rate, duration, batch_size=None):
+        '''
+        Writes seeds at a target rate for a duration
+
+        Seeds are written in micro-batches, each let through by a token
+        bucket once enough rows have accrued at the target rate, so that the
+        database sees a steady write load rather than bulk inserts. The
+        DateTimeFields not given in values hold monotonically increasing
+        timestamps. seeds is ignored, and checkpoints, hierarchies and
+        target counts are not supported.
+
+        Parameters
+        ----------
+
+        rate : float
+            the target number of rows written per second
+
+        duration : float
+            the number of seconds to write for
+
+        batch_size : int, optional
+            the number of rows in a micro-batch (default is a tenth of the
+            rate, at most batch_size)
+
+
+        Returns
+        -------
+
+        data_seeder.trickle.TrickleReport
+            the achieved rate and the latency of every micro-batch
+        '''
+
+        if self.checkpoint is not None or self.tree_field is not None or \
+                self.target_count is not None:
+            raise ValueError("A trickle cannot be combined with a "
+                             "checkpoint, a tree_field or a target_count")
+
+        size = batch_size or max(1, min(self.batch_size, int(rate / 10)))
+        bucket = TokenBucket(rate, capacity=size)
+        timestamps = MonotonicTimestamps(rate)
+        attnames = [
+            field.attname for field in self.model._meta.concrete_fields
+            if isinstance(field, models.DateTimeField) and
+            field.name not in self.values
+        ]
+
+        report = TrickleReport(rate)
+        writer = self.writer_class(self.model, self.using)
+        self._associated_pks = {}
+        self._next_pk = None
+        self._flushed = 0
+        started = time.monotonic()
+
+        try:
+            with tuned_database(self.using, self.tuning), self._tuned():
+                while bucket.acquire(size, deadline=started + duration):
+                    batch = self.generate_batch(self._flushed, size)
+                    if attnames:
+                        values = timestamps.next(size)
+                        for attname in attnames:
+                            batch[attname] = values
+
+                    written = perf_counter_ns()
+                    self._write_batch(writer, batch, None)
+                    report.record(size, perf_counter_ns() - written)
+
+        except BaseException as e:
+            self._notify("on_error", e, self._flushed,
+                         int((time.monotonic() - started) * 1e9))
+            raise
+
+        finally:
+            report.elapsed = time.monotonic() - started
+            if self._next_pk is not None:
+                self._reset_sequences()
+
+        return report
+
+    def churn(self, update=0.0, delete=0.0, fields=None,
+              selection="sample"):
+        '''
+        Updates and deletes a fraction of the model's existing rows
+
+        The fields of updated rows are regenerated as they would be for new
+        seeds (by values, field_options or the registered generators) and
+        written by the writer (with bulk_update by the OrmWriter, or an
+        executemany of a cached UPDATE statement by the RawWriter), and
+        deleted rows are deleted, batch_size rows per transaction. Updated
+        and deleted rows never overlap.
+
+        Parameters
+        ----------
+
+        update : float, optional
+            the fraction of the rows to update, between 0 and 1
+            (default is 0)
+
+        delete : float, optional
+            the fraction of the rows to delete, between 0 and 1
+            (default is 0)
+
+        fields : list, optional
+            the names of the fields to regenerate (default is every
+            concrete field but the primary key)
+
+        selection : str, optional
+            sample to churn rows sampled from the whole table, or range to
+            churn a contiguous range of primary keys (default is sample)
+
+
+        Returns
+        -------
+
+        data_seeder.churn.ChurnReport
+            the number of rows updated and deleted and their throughput
+        '''
+
+        if update < 0 or delete < 0 or update + delete > 1:
+            raise ValueError("The fractions of rows to update and delete "
+                             "must be positive and add up to at most 1")
+
+        if fields is None:
+            fields = [field for field in self.model._meta.concrete_fields
+                      if not field.primary_key]
+        else:
+            fields = [self.model._meta.get_field(name) for name in fields]
+
+        manager = self.model._default_manager.using(self.using)
+        total = manager.count()
+        update_count = int(total * update)
+        delete_count = int(total * delete)
+
+        # Selecting both at once keeps updated and deleted rows apart
+        selected = select_pks(manager.all(), update_count + delete_count,
+                              selection)
+        if selection == "sample":
+            random.shuffle(selected)
+            update_pks = sorted(selected[:update_count])
+            delete_pks = sorted(selected[update_count:])
+        else:
+            update_pks = selected[:update_count]
+            delete_pks = selected[update_count:]
+
+        report = ChurnReport()
+        column_plan = dict(self.compile())
+        writer = self.writer_class(self.model, self.using)
+
+        with tuned_database(self.using, self.tuning), self._tuned():
+            started = time.monotonic()
+            for start in range(0, len(update_pks), self.batch_size):
+                chunk = update_pks[start:start + self.batch_size]
+
+                batch = ColumnarBatch(self.model, len(chunk))
+                batch[self.model._meta.pk.attname] = chunk
+                for field in fields:
+                    batch[field.attname] = column_plan[field.attname](
+                        start, len(chunk))
+
+                with transaction.atomic(using=self.using):
+                    writer.update(batch, fields)
+
+                report.updated += len(chunk)
+
+            report.update_time = time.monotonic() - started
+
+            started = time.monotonic()
+            for start in range(0, len(delete_pks), self.batch_size):
+                chunk = delete_pks[start:start + self.batch_size]
+
+                with transaction.atomic(using=self.using):
+                    manager.filter(pk__in=chunk).delete()
+
+                report.deleted += len(chunk)
+
+            report.delete_time = time.monotonic() - started
+
+        return report
+
+    def generate_batch(self, start, size):
         '''
+        Generates a batch of seeds without writing it
+
+        Parameters
+        ----------
+
+        start : int
+            the index of the first seed of the batch
+
+        size : int
+            the number of seeds to generate
+
+
+        Returns
+        -------
+
+        data_seeder.batch.ColumnarBatch
+            the generated batch
+        '''
+
+        field_plan = self.compile()
+
+        started = perf_counter_ns()
+        batch = ColumnarBatch(self.model, size)
+        for attname, column in field_plan:
+            batch[attname] = column(start, size)
+
+        if self.preallocate_pks:
+            batch[self.model._meta.pk.attname] = self._reserve_pks(size)
+
+        if self.compiled:
+            batch.factory = get_factory(batch)
+
+        if self.hooks:
+            self._notify("on_batch_generated", batch, size, batch.nbytes(),
+                         perf_counter_ns() - started)
+
+        return batch
+
+    def _count_existing(self):
+        connection = connections[self.using]
+
+        if self.approximate_count and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = %s::regclass",
+                    [connection.ops.quote_name(self.model._meta.db_table)]
+                )
+                row = cursor.fetchone()
+
+            # Tables that were never analyzed have no estimate
+            if row is not None and row[0] >= 0:
+                return row[0]
+
+        return self.model._default_manager.using(self.using).count()
+
+    def _seed_tree(self):
+        seeds = []
+        parent_pks = None
+
+        for i in range(self.depth):
+            values = dict(self.values)
+            related_pks = dict(self.related_pks)
+
+            if parent_pks is None:
+                values[self.tree_field] = None
+                level_seeds = self.seeds
+            else:
+                related_pks[self.tree_field] = parent_pks
+                level_seeds = len(parent_pks) * self.branching
+
+            level_seeder = DataSeeder(
+                self.model,
+                seeds=level_seeds,
+                generate_related=self.generate_related,
+                values=values,
+                batch_size=self.batch_size,
+                related_pks=related_pks,
+                return_seeds=self.return_seeds,
+                writer=self.writer_class,
+                pipeline=self.pipeline,
+                queue_size=self.queue_size,
+                preallocate_pks=self.preallocate_pks,
+                field_options=self.field_options,
+                compiled=self.compiled,
+                hooks=self.hooks,
+                tuning=self.tuning
+            )
+
+            generated = level_seeder.seed()
+            seeds.extend(generated)
+
+            parent_pks = [seed.pk for seed in generated] \
+                if self.return_seeds else generated
+
+            if None in parent_pks:
+                raise ValueError('The primary keys of "%s" seeds are not '
+                                 'known, use preallocate_pks to seed a '
+                                 'hierarchy' % self.model._meta.label)
+
+        return seeds
+
+    def _check_tree_field(self):
+        try:
+            field = self.model._meta.get_field(self.tree_field)
+        except FieldDoesNotExist:
+            field = None
+
+        if field is None or not field.many_to_one or \
+                field.related_model != self.model:
+            raise ValueError('"%s" is not a foreign key of "%s" to itself' %
+                             (self.tree_field, self.model._meta.label))
+
+        if self.depth < 1 or self.branching < 1:
+            raise ValueError("depth and branching must be at least 1")
+
+        # Every level needs the keys of the level above, so a writer that
+        # does not return them would fail once the root level is written
+        if not self.preallocate_pks and \
+                not getattr(self.writer_class, "returns_pks", True):
+            raise ValueError('The primary keys of "%s" seeds are not known '
+                             'to %s, use preallocate_pks to seed a '
+                             'hierarchy' % (self.model._meta.label,
+                                            self.writer_class.__name__))
 
+    def _generate_batches(self, committed):
+        # Yields every remaining batch along with the progress to checkpoint
+        # once it has been committed. The RNG state is captured as soon as the
+        # batch is generated, since the next batch may be generated before
+        # this one is written
+        while committed < self.seeds:
+            batch = self.generate_batch(committed,
+                                        min(self.batch_size,
+                                            self.seeds - committed))
+            committed += len(batch)
+
+            yield batch, (committed, random.getstate(), {
+                associated_cls._meta.label: pk
+                for associated_cls, pk in self._associated_pks.items()
+                if pk is not None
+            })
+
+    def _write_batch(self, writer, batch, progress):
+        # Instances are built ahead of the write when hooks are observing,
+        # so that building and writing are reported separately
+        if self.hooks and getattr(writer, "builds_instances", False):
+            started = perf_counter_ns()
+            batch.instances()
+            self._notify("on_batch_built", batch, len(batch), batch.nbytes(),
+                         perf_counter_ns() - started)
+
+        started = perf_counter_ns()
+        with transaction.atomic(using=self.using):
+            writer.write(batch)
+
+        self._flushed += len(batch)
+        if self.hooks:
+            self._notify("on_batch_flushed", batch, len(batch),
+                         batch.nbytes(), perf_counter_ns() - started)
+
+        if self.checkpoint is not None:
+            committed, rng_state, related = progress
+            self.checkpoint.update(self.model, self.seeds, committed,
+                                   related, rng_state=rng_state)
+
+        return batch.instances() if self.return_seeds else batch.pks
+
+    def _seed_pipelined(self, committed):
+        batches = queue.Queue(maxsize=self.queue_size)
         seeds = []
-        associated_models = {}
+        errors = []
 
-        for i in range(self.seeds):
+        def write():
+            # Django connections are per thread, so this thread writes over
+            # its own connection, which must be closed once it is done
+            writer = self.writer_class(self.model, self.using)
+            done = False
 
-            generated = self.model()
+            try:
+                with self._tuned():
+                    while True:
+                        item = batches.get()
+                        if item is None:
+                            done = True
+                            return
 
-            for field in self.model._meta.fields:
-                field_cls = field.__class__
-                generator = self._get_generator(field_cls)
+                        # Keep draining after an error so generation never
+                        # blocks
+                        if errors:
+                            continue
 
-                # If this field has been provided by the generator, use that
-                if field.name in self.values:
-                    setattr(generated, field.name, self.values[field.name])
-                    continue
+                        try:
+                            seeds.extend(self._write_batch(writer, *item))
+                        except BaseException as e:
+                            errors.append(e)
 
-                # If this is a foreign key field, we need to do some special
-                # logic to get a properly generated value
-                if field_cls == models.ForeignKey and self.generate_related:
-                    associated_cls = field.related_model
-                    association = associated_models.get(associated_cls)
-                    if associated_cls != self.model and association is None:
-                        # Avoid if FK is same as model, otherwise we will hit
-                        # infinite recursion
-                        associated = DataSeeder(associated_cls,
-                                                generate_related=True).seed()
+            except BaseException as e:
+                # The connection could not be tuned or reverted
+                errors.append(e)
+                while not done:
+                    done = batches.get() is None
 
-                        # There should be one entity in associated
-                        association = associated[0]
+            finally:
+                connections[self.using].close()
 
-                    setattr(generated, field.name, association)
-                    associated_models[associated_cls] = association
+        writer_thread = threading.Thread(target=write, daemon=True)
+        writer_thread.start()
 
-                    continue
+        try:
+            for item in self._generate_batches(committed):
+                if errors:
+                    break
 
-                # If the field can be generated, do so
-                # There are some cases (Auto increments) where we do not
-                # need to bother generating
-                if generator is not None:
-                    setattr(generated, field.name, generator.generate())
+                batches.put(item)
 
-            generated.save()
-            seeds.append(generated)
+        finally:
+            batches.put(None)
+            writer_thread.join()
+
+        if errors:
+            raise errors[0]
 
         return seeds
 
+    @contextlib.contextmanager
+    def _tuned(self):
+        # Tunes the connection of the current thread, which in pipelined
+        # mode is the writer thread's own connection. The database settings
+        # are applied by tuned_database() instead
+        profile = get_profile(self.using, self.tuning)
+        if profile is None:
+            yield
+            return
+
+        connection = connections[self.using]
+        previous = profile.apply(connection)
+
+        try:
+            yield
+        finally:
+            profile.revert(connection, previous)
+
+    def _notify(self, hook, *args):
+        for hooks in self.hooks:
+            getattr(hooks, hook)(self, *args)
+
+    def _reserve_pks(self, size):
+        if self._next_pk is None:
+            current = self.model._default_manager.using(self.using) \
+                .aggregate(max_pk=models.Max("pk"))["max_pk"]
+            self._next_pk = (current or 0) + 1
+
+        start = self._next_pk
+        self._next_pk += size
+
+        return array("q", range(start, start + size))
+
+    def _reset_sequences(self):
+        # Databases with sequences (i.e. Postgres) need them moved past the
+        # keys that were assigned explicitly
+        connection = connections[self.using]
+        statements = connection.ops.sequence_reset_sql(no_style(),
+                                                       [self.model])
+
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+
+    def _compile_field(self, field):
+        # If this field has been provided by the generator, use that
+        if field.name in self.values:
+            return self._compile_value(field, self.values[field.name])
+
+        # If this is a foreign key field, we need to do some special
+        # logic to get a properly generated value
+        if field.many_to_one:
+            if field.name in self.related_pks:
+                pks = self.related_pks[field.name]
+                if field.name in self.field_options:
+                    # Ranks index a sample of the keys, rather than reading
+                    # them all at random
+                    if isinstance(pks, ExistingKeys):
+                        pks = pks.pool()
+
+                    return self._compile_fan_out(field, list(pks))
+
+                if not isinstance(pks, ExistingKeys):
+                    pks = list(pks)
+
+                return lambda start, size: [
+                    pks[i % len(pks)] for i in range(start, start + size)
+                ]
+
+            if self.generate_related:
+                return lambda start, size: Constant(
+                    self._get_association(field)
+                )
+
+            # Otherwise use a randomly selected existing model
+            pks = ExistingKeys(field.related_model._default_manager
+                               .using(self.using).all())
+            if pks and field.name in self.field_options:
+                return self._compile_fan_out(field, pks.pool())
+
+            if pks:
+                return lambda start, size: pks.sample(size)
+
+        # If the field can be generated, do so
+        # There are some cases (Auto increments) where we do not
+        # need to bother generating
+        if field.name in self.field_options:
+            generator = self._get_distribution(
+                field, integer=isinstance(field, models.IntegerField)
+            )
+        elif field.choices:
+            generator = generators.WeightedChoiceGenerator(
+                choices=self._get_choices(field)
+            )
+        else:
+            generator = self._get_field_generator(field)
+
+        if generator is not None:
+            return lambda start, size: generator.generate_batch(size)
+
+        # Anything else gets its default, as it would from Model.__init__
+        if field.has_default() and callable(field.default):
+            return lambda start, size: [
+                field.get_default() for i in range(size)
+            ]
+
+        default = field.get_default()
+        return lambda start, size: Constant(default)
+
+    def _compile_value(self, field, value):
+        if isinstance(value, generators.AbstractGenerator):
+            return lambda start, size: value.generate_batch(size)
+
+        # Batch callables fill a whole column in a single call
+        if getattr(value, "batch_values", False):
+            def column(start, size):
+                values = value(size, random)
+                if len(values) != size:
+                    raise ValueError('"%s" returned %d values instead of %d'
+                                     % (field.name, len(values), size))
+
+                return values
+
+            return column
+
+        if callable(value) and not isinstance(value, type):
+            return lambda start, size: [value() for i in range(size)]
+
+        if field.many_to_one and isinstance(value, models.Model):
+            value = value.pk
+
+        return lambda start, size: Constant(value)
+
+    def _compile_fan_out(self, field, pks):
+        # Draw the index of the related row from the distribution, so that
+        # the most likely indexes are the most referenced rows
+        generator = self._get_distribution(field, integer=True,
+                                           ranks=len(pks))
+
+        return lambda start, size: [
+            pks[int(i) % len(pks)] for i in generator.generate_batch(size)
+        ]
+
+    def _get_distribution(self, field, integer=False, ranks=None):
+        # ranks is the number of related rows when drawing the index of a
+        # foreign key's related row
+        options = dict(self.field_options[field.name])
+        generator_cls = generators.DISTRIBUTIONS[options.pop("distribution")]
+
+        if generator_cls is generators.WeightedChoiceGenerator:
+            if ranks is not None:
+                options.setdefault("choices", range(ranks))
+            else:
+                options.setdefault("choices", self._get_choices(field))
+
+            return generator_cls(**options)
+
+        if generator_cls is generators.ZipfGenerator and ranks is not None:
+            options.setdefault("n", ranks)
+            options.setdefault("first", 0)
+
+        options.setdefault("integer", integer)
+
+        return generator_cls(**options)
+
+    def _get_choices(self, field):
+        return [choice for choice, label in field.flatchoices]
+
+    def _get_association(self, field):
+        associated_cls = field.related_model
+        association = self._associated_pks.get(associated_cls)
+        if associated_cls != self.model and association is None:
+            # Avoid if FK is same as model, otherwise we will hit
+            # infinite recursion
+            associated = DataSeeder(associated_cls,
+                                    generate_related=True,
+                                    return_seeds=False).seed()
+
+            # There should be one entity in associated
+            association = associated[0]
+
+        self._associated_pks[associated_cls] = association
+
+        return association
+
+    def _get_field_generator(self, field):
+        # Array items and files need more than the class of their field
+        if ArrayField is not None and isinstance(field, ArrayField):
+            item_generator = self._get_field_generator(field.base_field)
+            if item_generator is None:
+                return None
+
+            max_length = generators.ArrayGenerator.max_length
+            if field.size is not None:
+                max_length = min(max_length, field.size)
+
+            return generators.ArrayGenerator(item_generator,
+                                             max_length=max_length)
+
+        generator = self._get_generator(field.__class__)
+        if isinstance(generator, generators.FileGenerator):
+            generator.storage = field.storage
+            if field.upload_to:
+                generator.upload_to = field.upload_to
+
+        # Strings are cut to the length of their column
+        if type(generator) in (generators.StringGenerator,
+                               generators.SlugGenerator) and \
+                field.max_length is not None:
+            generator.max_length = min(generator.max_length,
+                                       field.max_length)
+
+        return generator
+
     def _get_generator(self, field_cls):
         for field_generator in self.field_generators:
             if field_generator[0] == field_cls:
@@ -0,0 +1,230 @@
+'''
+Columnar batches of generated seeds
+
+Rather than building a model instance for every generated row, seeds are
+generated one column at a time into a ColumnarBatch. Numeric columns are held
+in compact typed arrays, values shared by every row are held once, and model
+instances are only materialized when something asks for them.
+'''
+
+import itertools
+
+from array import array
+
+# The number of values of a list column sized to estimate its total size
+SAMPLE_SIZE = 16
+
+
+class Constant:
+    '''
+    A column value shared by every row of a batch
+
+    Attributes
+    ----------
+
+    value : object
+        the value of every row
+    '''
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class ColumnarBatch:
+    '''
+    A batch of generated seeds held as one buffer per field
+
+    Attributes
+    ----------
+
+    model : type
+        the subclass of django.db.models.Model the batch was generated for
+
+    size : int
+        the number of rows in the batch
+
+    columns : dict
+        a dictionary mapping field attribute names to a sequence holding the
+        value of every row (an array.array for numeric fields, a list
+        otherwise)
+
+    constants : dict
+        a dictionary mapping field attribute names to the value shared by
+        every row
+
+    pks : list
+        the primary keys of the rows once written, if they are known
+
+    factory : callable
+        a compiled row factory building the batch's instances, or None to
+        build them through Model.__init__
+
+
+    Methods
+    -------
+
+    column(attname) : iterable
+        returns the values of a column
+
+    rows(attnames) : iterator
+        returns an iterator of row tuples for the given columns
+
+    instances() : list
+        materializes and returns the model instances for the batch
+
+    nbytes() : int
+        estimates the size of the batch's values in bytes
+    '''
+
+    def __init__(self, model, size):
+        '''
+        Parameters
+        ----------
+
+        model : type
+            the subclass of django.db.models.Model the batch is generated for
+
+        size : int
+            the number of rows in the batch
+        '''
+
+        self.model = model
+        self.size = size
+        self.columns = {}
+        self.constants = {}
+        self.pks = None
+        self.factory = None
+        self._instances = None
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, attname):
+        return attname in self.columns or attname in self.constants
+
+    def __setitem__(self, attname, values):
+        if isinstance(values, Constant):
+            self.columns.pop(attname, None)
+            self.constants[attname] = values.value
+        else:
+            self.constants.pop(attname, None)
+            self.columns[attname] = values
+
+    def column(self, attname):
+        '''
+        Returns the values of a column
+
+        Columns that have not been generated are None for every row.
+
+        Parameters
+        ----------
+
+        attname : str
+            the attribute name of the field
+
+
+        Returns
+        -------
+
+        iterable
+            the value of the column for every row
+        '''
+
+        if attname in self.columns:
+            return self.columns[attname]
+
+        return itertools.repeat(self.constants.get(attname), self.size)
+
+    def rows(self, attnames):
+        '''
+        Returns the rows of the batch for the given columns
+
+        Parameters
+        ----------
+
+        attnames : list
+            the attribute names of the fields to include in every row
+
+
+        Returns
+        -------
+
+        iterator
+            an iterator of tuples, one per row
+        '''
+
+        return zip(*[self.column(attname) for attname in attnames])
+
+    def instances(self):
+        '''
+        Materializes the model instances for the batch
+
+        Instances are built once and cached, so writers and callers share
+        the same objects.
+
+        Returns
+        -------
+
+        list
+            a list of unsaved model instances
+        '''
+
+        if self._instances is None and self.factory is not None:
+            self._instances = self.factory(self)
+
+        if self._instances is None:
+            attnames = [
+                field.attname for field in self.model._meta.concrete_fields
+            ]
+
+            # Positional arguments in concrete field order take the fast
+            # path through Model.__init__
+            model = self.model
+            self._instances = [model(*row) for row in self.rows(attnames)]
+
+        return self._instances
+
+    def nbytes(self):
+        '''
+        Estimates the size of the batch's values in bytes
+
+        The estimate approximates the size of the values as written to the
+        database rather than as Python objects: typed arrays count their
+        buffer, strings and bytes their length, and every other value eight
+        bytes. List columns are estimated from a sample of their values, so
+        that estimating is cheap whatever the size of the batch.
+
+        Returns
+        -------
+
+        int
+            the estimated size of every row of the batch
+        '''
+
+        total = 0
+        for values in self.columns.values():
+            if isinstance(values, array):
+                total += len(values) * values.itemsize
+            elif len(values):
+                step = max(1, len(values) // SAMPLE_SIZE)
+                sample = values[::step]
+                total += len(values) * sum(
+                    _value_size(value) for value in sample
+                ) // len(sample)
+
+        for value in self.constants.values():
+            total += self.size * _value_size(value)
+
+        return total
+
+
+def _value_size(value):
+    if value is None:
+        return 0
+
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return len(value)
+
+    return 8
@@ -0,0 +1,153 @@
+'''
+Checkpoint support for long running seeding jobs
+
+A checkpoint records, for every model seeded in a run, how many rows have
+been committed so far along with the state of the random number generator
+at that point. A job that dies part way through can then be resumed from the
+last committed batch without duplicating or skipping rows.
+'''
+
+import json
+import os
+import random
+import threading
+
+
+class CheckpointError(Exception):
+    '''
+    Raised when a checkpoint file cannot be read or does not exist
+    '''
+
+    pass
+
+
+class Checkpoint:
+    '''
+    A JSON file based record of the progress of a seeding run
+
+    Attributes
+    ----------
+
+    path : str
+        the path of the checkpoint file
+
+    models : dict
+        a dictionary mapping model labels (i.e. app.Model) to their
+        recorded progress
+
+
+    Methods
+    -------
+
+    restore(model) : tuple
+        restores the RNG state for a model and returns its progress
+
+    update(model, seeds, committed, related, rng_state)
+        records the progress of a model and writes the checkpoint file
+    '''
+
+    def __init__(self, path, resume=False):
+        '''
+        Parameters
+        ----------
+
+        path : str
+            the path of the checkpoint file
+
+        resume : bool, optional
+            whether or not to load the progress already recorded in the
+            checkpoint file (default is False)
+        '''
+
+        self.path = path
+        self.models = {}
+        self._lock = threading.Lock()
+
+        if resume:
+            self._load()
+
+    def restore(self, model):
+        '''
+        Restores the RNG state recorded for a model, if any
+
+        Parameters
+        ----------
+
+        model : type
+            a subclass of django.db.models.Model
+
+
+        Returns
+        -------
+
+        tuple
+            the number of committed rows and a dictionary mapping related
+            model labels to the primary key of the related seed in use
+        '''
+
+        entry = self.models.get(model._meta.label)
+        if entry is None:
+            return 0, {}
+
+        version, internal_state, gauss_next = entry["rng_state"]
+        random.setstate((version, tuple(internal_state), gauss_next))
+
+        return entry["committed"], entry["related"]
+
+    def update(self, model, seeds, committed, related=None, rng_state=None):
+        '''
+        Records the progress of a model along with an RNG state and writes
+        the checkpoint file
+
+        Parameters
+        ----------
+
+        model : type
+            a subclass of django.db.models.Model
+
+        seeds : int
+            the total number of seeds requested for the model
+
+        committed : int
+            the number of seeds that have been committed so far
+
+        related : dict, optional
+            a dictionary mapping related model labels to the primary key of
+            the related seed in use
+
+        rng_state : tuple, optional
+            the RNG state to resume from, as returned by random.getstate()
+            (default is the current RNG state)
+        '''
+
+        # Models may be seeded concurrently, from different threads
+        with self._lock:
+            self.models[model._meta.label] = {
+                "seeds": seeds,
+                "committed": committed,
+                "related": related or {},
+                "rng_state": rng_state or random.getstate()
+            }
+
+            self._write()
+
+    def _load(self):
+        try:
+            with open(self.path) as checkpoint_file:
+                self.models = json.load(checkpoint_file)["models"]
+
+        except FileNotFoundError:
+            raise CheckpointError('Checkpoint "%s" does not exist' %
+                                  self.path)
+
+        except (ValueError, KeyError):
+            raise CheckpointError('Checkpoint "%s" is not valid' % self.path)
+
+    def _write(self):
+        # Write to a temporary file first so that a crash while writing can
+        # never leave a truncated checkpoint behind
+        tmp_path = "%s.tmp" % self.path
+        with open(tmp_path, "w") as checkpoint_file:
+            json.dump({"models": self.models}, checkpoint_file)
+
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,183 @@
+'''
+Churning seeded rows
+
+Seeding only ever inserts rows. Churning updates and deletes a fraction of
+the rows already in a table, to benchmark what production churn does to it
+(i.e. vacuum, index bloat or cache eviction). Rows are either sampled from
+the whole table, or taken from a contiguous range of primary keys, which
+concentrates the churn on neighbouring pages.
+'''
+
+import random
+
+from django.db.models import Max, Min
+
+SELECTIONS = ("sample", "range")
+
+
+def select_pks(queryset, count, selection="sample", chunk_size=10000):
+    '''
+    Selects primary keys to churn
+
+    Keys are selected without loading every key of the table: a range
+    starts at a random key between the lowest and the highest (or at a
+    random offset when keys are not integers), and a sample is drawn while
+    reading the keys chunk_size at a time, keeping only those selected.
+
+    Parameters
+    ----------
+
+    queryset : django.db.models.QuerySet
+        the rows to select keys from
+
+    count : int
+        the number of keys to select
+
+    selection : str, optional
+        sample to select keys at random from the whole table, or range to
+        select a contiguous range of keys at a random position
+        (default is sample)
+
+    chunk_size : int, optional
+        the number of keys read at a time when sampling (default is 10000)
+
+
+    Returns
+    -------
+
+    list
+        the selected keys, in order
+    '''
+
+    if selection not in SELECTIONS:
+        raise ValueError('Unknown selection "%s"' % selection)
+
+    ordered = queryset.order_by("pk").values_list("pk", flat=True)
+
+    if selection == "range":
+        return _select_range(ordered, count)
+
+    total = queryset.count()
+    count = min(count, total)
+
+    # Selection sampling keeps every key with the probability that exactly
+    # count keys are selected once every key has been read
+    selected = []
+    seen = 0
+    last = None
+    while len(selected) < count:
+        chunk = ordered if last is None else ordered.filter(pk__gt=last)
+        chunk = list(chunk[:chunk_size])
+        if not chunk:
+            break
+
+        for pk in chunk:
+            if random.random() * (total - seen) < count - len(selected):
+                selected.append(pk)
+
+            seen += 1
+
+        last = chunk[-1]
+
+    return selected
+
+
+def _select_range(ordered, count):
+    bounds = ordered.aggregate(low=Min("pk"), high=Max("pk"))
+
+    if not isinstance(bounds["low"], int):
+        total = ordered.count()
+        count = min(count, total)
+        offset = random.randint(0, total - count)
+        return list(ordered[offset:offset + count])
+
+    # Keys past the end of the table are made up from the keys before the
+    # start, so that the range is always count keys long
+    start = random.randint(bounds["low"], bounds["high"])
+    after = list(ordered.filter(pk__gte=start)[:count])
+    before = list(ordered.filter(pk__lt=start).order_by("-pk")
+                  [:count - len(after)]) if len(after) < count else []
+
+    return before[::-1] + after
+
+
+class ChurnReport:
+    '''
+    The outcome of a churn
+
+    Attributes
+    ----------
+
+    updated : int
+        the number of rows updated
+
+    deleted : int
+        the number of rows deleted
+
+    update_time : float
+        the number of seconds spent updating rows
+
+    delete_time : float
+        the number of seconds spent deleting rows
+
+
+    Methods
+    -------
+
+    update_rate() : float
+        returns the number of rows updated per second
+
+    delete_rate() : float
+        returns the number of rows deleted per second
+
+    summary() : str
+        returns a summary of the churn
+    '''
+
+    def __init__(self):
+        self.updated = 0
+        self.deleted = 0
+        self.update_time = 0.0
+        self.delete_time = 0.0
+
+    def update_rate(self):
+        '''
+        Returns the number of rows updated per second
+
+        Returns
+        -------
+
+        float
+            the update throughput, or 0 if nothing was updated
+        '''
+
+        return self.updated / self.update_time if self.update_time else 0.0
+
+    def delete_rate(self):
+        '''
+        Returns the number of rows deleted per second
+
+        Returns
+        -------
+
+        float
+            the delete throughput, or 0 if nothing was deleted
+        '''
+
+        return self.deleted / self.delete_time if self.delete_time else 0.0
+
+    def summary(self):
+        '''
+        Returns a summary of the churn
+
+        Returns
+        -------
+
+        str
+            the number of rows updated and deleted, and their throughput
+        '''
+
+        return ("Updated %d row(s) in %.1fs (%.1f rows/s), deleted %d row(s) "
+                "in %.1fs (%.1f rows/s)" % (
+                    self.updated, self.update_time, self.update_rate(),
+                    self.deleted, self.delete_time, self.delete_rate()))
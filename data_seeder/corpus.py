@@ -0,0 +1,193 @@
+'''
+Memory-mapped corpora of realistic values
+
+A corpus is a list of strings (i.e. first names or words) stored in a compact
+offset-indexed binary file::
+
+    magic    8 bytes    b"DSCORP1\\0"
+    count    uint32     the number of entries
+    offsets  uint32[]   count + 1 offsets of the entries into the data
+    data     bytes      the UTF-8 encoded entries, back to back
+
+All integers are little-endian. Corpora are memory-mapped read-only the
+first time they are used, so importing the seeder stays fast, processes
+seeding at the same time share the same pages, and fetching any entry is a
+constant time slice of the mapping.
+
+The corpora bundled with the seeder live in data_seeder/corpora and are
+built by build_corpora.py from the newline separated lists of the top-level
+corpora directory, which also record where every list comes from.
+'''
+
+import mmap
+import os
+import random
+import struct
+import threading
+
+MAGIC = b"DSCORP1\0"
+HEADER = struct.Struct("<8sI")
+OFFSET = struct.Struct("<I")
+
+CORPORA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "corpora")
+
+_corpora = {}
+_lock = threading.Lock()
+
+
+class CorpusError(Exception):
+    '''
+    Raised when a corpus file does not exist or is not valid
+    '''
+
+    pass
+
+
+class Corpus:
+    '''
+    A read-only list of strings backed by a memory-mapped corpus file
+
+    Attributes
+    ----------
+
+    path : str
+        the path of the corpus file
+
+
+    Methods
+    -------
+
+    sample(size) : list
+        returns a list of randomly chosen entries
+    '''
+
+    def __init__(self, path):
+        '''
+        Parameters
+        ----------
+
+        path : str
+            the path of the corpus file
+        '''
+
+        self.path = path
+        self._mmap = None
+        self._count = None
+
+    def __len__(self):
+        self._open()
+        return self._count
+
+    def __getitem__(self, index):
+        self._open()
+        if not 0 <= index < self._count:
+            raise IndexError("corpus index out of range")
+
+        start, = OFFSET.unpack_from(self._mmap, self._offsets + index * 4)
+        end, = OFFSET.unpack_from(self._mmap, self._offsets + index * 4 + 4)
+
+        return str(self._mmap[self._data + start:self._data + end], "utf-8")
+
+    def sample(self, size):
+        '''
+        Returns randomly chosen entries of the corpus
+
+        Entries are chosen with replacement, using the random module so that
+        seeding the random number generator makes samples reproducible.
+
+        Parameters
+        ----------
+
+        size : int
+            the number of entries to choose
+
+
+        Returns
+        -------
+
+        list
+            a list of strings
+        '''
+
+        return [self[i] for i in random.choices(range(len(self)), k=size)]
+
+    def _open(self):
+        if self._mmap is not None:
+            return
+
+        try:
+            with open(self.path, "rb") as corpus_file:
+                mapped = mmap.mmap(corpus_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            raise CorpusError('Corpus "%s" does not exist or is empty' %
+                              self.path)
+
+        if len(mapped) < HEADER.size:
+            raise CorpusError('Corpus "%s" is not valid' % self.path)
+
+        magic, count = HEADER.unpack_from(mapped)
+        if magic != MAGIC or count == 0:
+            raise CorpusError('Corpus "%s" is not valid' % self.path)
+
+        self._offsets = HEADER.size
+        self._data = HEADER.size + (count + 1) * OFFSET.size
+        self._count = count
+        self._mmap = mapped
+
+
+def get_corpus(name):
+    '''
+    Returns a bundled corpus by name
+
+    Every corpus is opened once per process and shared by every generator.
+
+    Parameters
+    ----------
+
+    name : str
+        the name of the corpus (i.e. first_names)
+
+
+    Returns
+    -------
+
+    Corpus
+        the corpus, mapped the first time an entry is read
+    '''
+
+    with _lock:
+        if name not in _corpora:
+            _corpora[name] = Corpus(os.path.join(CORPORA_DIR,
+                                                 "%s.bin" % name))
+
+        return _corpora[name]
+
+
+def write_corpus(path, values):
+    '''
+    Writes a corpus file
+
+    Parameters
+    ----------
+
+    path : str
+        the path of the corpus file to write
+
+    values : iterable
+        the strings to store in the corpus
+    '''
+
+    encoded = [value.encode("utf-8") for value in values]
+    if not encoded:
+        raise CorpusError("A corpus needs at least one entry")
+
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+
+    with open(path, "wb") as corpus_file:
+        corpus_file.write(HEADER.pack(MAGIC, len(encoded)))
+        corpus_file.write(struct.pack("<%dI" % len(offsets), *offsets))
+        corpus_file.write(b"".join(encoded))
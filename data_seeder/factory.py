@@ -0,0 +1,133 @@
+'''
+Code-generated row factories
+
+Materializing a batch through Model.__init__ pays, for every row, for the
+signals it sends, the loop over the model's fields and a setattr per field.
+A row factory is a Python function generated for one model and one shape of
+batch (which fields vary per row and which are shared by every row), with
+one local per column and the instance dictionary written in a single update,
+so that building a row costs little more than the tuple it is made from.
+
+Factories only build instances from values already generated: the values of
+a batch are drawn one column at a time by the generator of each field, which
+already avoids a call per field and row, so generator calls are not inlined
+into factories.
+
+Factories are compiled once per shape and cached. They skip Model.__init__
+entirely, so models with pre_init or post_init receivers (such as models
+with image dimension fields) are always materialized through the model.
+'''
+
+import threading
+
+from django.db.models.base import ModelState
+from django.db.models.signals import post_init, pre_init
+
+_factories = {}
+_lock = threading.Lock()
+
+
+def get_factory(batch):
+    '''
+    Returns the row factory for the model and shape of a batch
+
+    Parameters
+    ----------
+
+    batch : data_seeder.batch.ColumnarBatch
+        the batch to build rows for
+
+
+    Returns
+    -------
+
+    callable
+        a function taking a batch and returning its model instances, or None
+        if the model's instances must be built through Model.__init__
+    '''
+
+    model = batch.model
+    if pre_init.has_listeners(model) or post_init.has_listeners(model):
+        return None
+
+    attnames = [field.attname for field in model._meta.concrete_fields]
+    columns = tuple(attname for attname in attnames
+                    if attname in batch.columns)
+    key = (model, columns)
+
+    with _lock:
+        if key not in _factories:
+            _factories[key] = compile_factory(model, attnames, columns)
+
+        return _factories[key]
+
+
+def compile_factory(model, attnames, columns):
+    '''
+    Generates the row factory of a model for a shape of batch
+
+    Parameters
+    ----------
+
+    model : type
+        the subclass of django.db.models.Model to build instances of
+
+    attnames : list
+        the attribute names of every concrete field of the model
+
+    columns : tuple
+        the attribute names held in a column, rather than shared by every
+        row
+
+
+    Returns
+    -------
+
+    callable
+        a function taking a batch and returning its model instances. Its
+        source is available as its source attribute
+    '''
+
+    names = {attname: "f%d" % i for i, attname in enumerate(attnames)}
+    entries = ", ".join("%r: %s" % (attname, names[attname])
+                        for attname in attnames)
+
+    lines = ["def build(batch, _new=_new, _model=_model, _state=_state):"]
+
+    # Shared values are bound once per batch
+    lines.append("    constants = batch.constants")
+    for attname in attnames:
+        if attname not in columns:
+            lines.append("    %s = constants.get(%r)" %
+                         (names[attname], attname))
+
+    lines.append("    instances = []")
+    lines.append("    append = instances.append")
+
+    if columns:
+        lines.append("    for %s, in zip(%s):" % (
+            ", ".join(names[attname] for attname in columns),
+            ", ".join("batch.columns[%r]" % attname for attname in columns)
+        ))
+    else:
+        lines.append("    for i in range(batch.size):")
+
+    lines.append("        instance = _new(_model)")
+    lines.append("        instance.__dict__.update({'_state': _state(), %s})"
+                 % entries)
+    lines.append("        append(instance)")
+    lines.append("    return instances")
+
+    source = "\n".join(lines) + "\n"
+    namespace = {
+        "_new": object.__new__,
+        "_model": model,
+        "_state": ModelState
+    }
+    exec(compile(source, "<row factory %s>" % model._meta.label, "exec"),
+         namespace)
+
+    build = namespace["build"]
+    build.source = source
+
+    return build
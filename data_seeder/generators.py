@@ -3,28 +3,87 @@ Generator classes
 
 A collections of classes that generate random data of
 different types
+
+DISTRIBUTIONS maps the distribution names accepted in the field_options of
+a seeder to their generator classes.
 '''
 
 import datetime
+import hashlib
+import itertools
+import posixpath
 import random
 import string
+import struct
+import threading
 import uuid
+import zlib
 
 from abc import ABC, abstractmethod
+from array import array
 from decimal import Decimal
 
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from .corpus import get_corpus
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def batch_values(func):
+    '''
+    Marks a callable as generating a whole batch of values at once
+
+    Batch callables given as seeder values are called once per batch as
+    func(size, rng), where rng is the random module, and must return a
+    sequence of size values.
+
+    Parameters
+    ----------
+
+    func : callable
+        the callable to mark
+
+
+    Returns
+    -------
+
+    callable
+        the same callable
+    '''
+
+    func.batch_values = True
+    return func
+
 
 class AbstractGenerator(ABC):
     '''
     An abstract base class for generator classes
 
+    Attributes
+    ----------
+
+    typecode : str
+        the array module typecode used to hold a batch of generated values,
+        or None to hold them in a list
+
+
     Methods
     -------
 
     generate : object
         randomly generates an object
+
+    generate_batch : sequence
+        randomly generates a batch of objects
     '''
 
+    typecode = None
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -42,6 +101,36 @@ class AbstractGenerator(ABC):
 
         pass
 
+    def generate_batch(self, size):
+        '''
+        Generates a batch of random objects
+
+        Parameters
+        ----------
+
+        size : int
+            the number of objects to generate
+
+
+        Returns
+        -------
+
+        sequence
+            an array.array of generated values if the generator has a
+            typecode, otherwise a list
+        '''
+
+        values = [self.generate() for i in range(size)]
+
+        if self.typecode is not None:
+            try:
+                return array(self.typecode, values)
+            except OverflowError:
+                # Custom ranges may not fit the typecode
+                pass
+
+        return values
+
 
 class StaticGenerator(AbstractGenerator):
     '''
@@ -168,6 +257,7 @@ class IntegerGenerator(AbstractGenerator):
 
     range_min = -1000000000
     range_max = 1000000000
+    typecode = "q"
 
     def __init__(self, range_min=None, range_max=None, *args, **kwargs):
         '''
@@ -293,6 +383,7 @@ class FloatGenerator(AbstractGenerator):
     range_min = -1000000000
     range_max = 1000000000
     precision = 1
+    typecode = "d"
 
     def __init__(self, range_min=None, range_max=None, precision=None, *args,
                  **kwargs):
@@ -435,6 +526,8 @@ class DecimalGenerator(FloatGenerator):
         generates a Decimal value
     '''
 
+    typecode = None
+
     def __init__(self, range_min=None, range_max=None, precision=None, *args,
                  **kwargs):
         '''
@@ -868,3 +961,1672 @@ class UuidGenerator(AbstractGenerator):
         '''
 
         return uuid.uuid4()
+
+
+class DistributionGenerator(AbstractGenerator):
+    '''
+    A base class for generators that draw numbers from a probability
+    distribution
+
+    Batches are drawn with numpy when it is installed, from a generator
+    seeded by the random module so that seeding the random module still
+    makes batches reproducible, and with the random module otherwise.
+
+    Attributes
+    ----------
+
+    integer : bool
+        whether generated numbers are rounded to ints
+
+    range_min : float
+        the lower bound generated numbers are clipped to, or None
+
+    range_max : float
+        the upper bound generated numbers are clipped to, or None
+
+
+    Methods
+    -------
+
+    generate : float
+        generates a random number
+
+    generate_batch : sequence
+        generates a batch of random numbers
+    '''
+
+    typecode = "d"
+    integer = False
+    range_min = None
+    range_max = None
+
+    def __init__(self, integer=None, range_min=None, range_max=None, *args,
+                 **kwargs):
+        '''
+        Parameters
+        ----------
+
+        integer : bool, optional
+            whether generated numbers are rounded to ints (default is False)
+
+        range_min : float, optional
+            the lower bound generated numbers are clipped to
+            (default is None)
+
+        range_max : float, optional
+            the upper bound generated numbers are clipped to
+            (default is None)
+        '''
+
+        if integer is not None:
+            self.integer = integer
+
+        if range_min is not None:
+            self.range_min = range_min
+
+        if range_max is not None:
+            self.range_max = range_max
+
+        if self.integer:
+            self.typecode = "q"
+
+        super().__init__(*args, **kwargs)
+
+    def generate(self):
+        '''
+        Generates a random number
+
+        Returns
+        -------
+
+        float
+            a random number, or an int if integer is set
+        '''
+
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, size):
+        '''
+        Generates a batch of random numbers
+
+        Parameters
+        ----------
+
+        size : int
+            the number of numbers to generate
+
+
+        Returns
+        -------
+
+        sequence
+            an array.array of generated numbers, or a list if they do not
+            fit the typecode
+        '''
+
+        if numpy is not None:
+            rng = numpy.random.default_rng(random.getrandbits(64))
+            values = self._sample_numpy(rng, size)
+            if values is not None:
+                return self._from_numpy(values)
+
+        values = self._sample(size)
+
+        if self.range_min is not None or self.range_max is not None:
+            low = -float("inf") if self.range_min is None else self.range_min
+            high = float("inf") if self.range_max is None else self.range_max
+            values = [min(max(value, low), high) for value in values]
+
+        if self.integer:
+            values = [round(value) for value in values]
+
+        try:
+            return array(self.typecode, values)
+        except OverflowError:
+            return values
+
+    @abstractmethod
+    def _sample(self, size):
+        '''
+        Draws numbers from the distribution with the random module
+
+        Parameters
+        ----------
+
+        size : int
+            the number of numbers to draw
+
+
+        Returns
+        -------
+
+        list
+            a list of floats, before clipping and rounding
+        '''
+
+        pass
+
+    def _sample_numpy(self, rng, size):
+        # Distributions without a vectorized path return None
+        return None
+
+    def _from_numpy(self, values):
+        if self.range_min is not None or self.range_max is not None:
+            values = numpy.clip(values, self.range_min, self.range_max)
+
+        if self.integer:
+            values = numpy.rint(values).astype("int64")
+        else:
+            values = values.astype("float64")
+
+        batch = array(self.typecode)
+        batch.frombytes(values.tobytes())
+
+        return batch
+
+
+class NormalGenerator(DistributionGenerator):
+    '''
+    A generator that returns normally distributed numbers
+
+    Attributes
+    ----------
+
+    mean : float
+        the mean of the distribution
+
+    stddev : float
+        the standard deviation of the distribution
+    '''
+
+    def __init__(self, mean=0.0, stddev=1.0, *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        mean : float, optional
+            the mean of the distribution (default is 0.0)
+
+        stddev : float, optional
+            the standard deviation of the distribution (default is 1.0)
+        '''
+
+        self.mean = mean
+        self.stddev = stddev
+        super().__init__(*args, **kwargs)
+
+    def _sample(self, size):
+        return [random.gauss(self.mean, self.stddev) for i in range(size)]
+
+    def _sample_numpy(self, rng, size):
+        return rng.normal(self.mean, self.stddev, size)
+
+
+class LogNormalGenerator(DistributionGenerator):
+    '''
+    A generator that returns log-normally distributed numbers
+
+    Attributes
+    ----------
+
+    mu : float
+        the mean of the underlying normal distribution
+
+    sigma : float
+        the standard deviation of the underlying normal distribution
+    '''
+
+    def __init__(self, mu=0.0, sigma=1.0, *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        mu : float, optional
+            the mean of the underlying normal distribution (default is 0.0)
+
+        sigma : float, optional
+            the standard deviation of the underlying normal distribution
+            (default is 1.0)
+        '''
+
+        self.mu = mu
+        self.sigma = sigma
+        super().__init__(*args, **kwargs)
+
+    def _sample(self, size):
+        return [random.lognormvariate(self.mu, self.sigma)
+                for i in range(size)]
+
+    def _sample_numpy(self, rng, size):
+        return rng.lognormal(self.mu, self.sigma, size)
+
+
+class ExponentialGenerator(DistributionGenerator):
+    '''
+    A generator that returns exponentially distributed numbers
+
+    Attributes
+    ----------
+
+    rate : float
+        the rate of the distribution (one over its mean)
+    '''
+
+    def __init__(self, rate=1.0, *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        rate : float, optional
+            the rate of the distribution, one over its mean (default is 1.0)
+        '''
+
+        self.rate = rate
+        super().__init__(*args, **kwargs)
+
+    def _sample(self, size):
+        return [random.expovariate(self.rate) for i in range(size)]
+
+    def _sample_numpy(self, rng, size):
+        return rng.exponential(1.0 / self.rate, size)
+
+
+class ZipfGenerator(DistributionGenerator):
+    '''
+    A generator that returns Zipf distributed ranks
+
+    Rank k out of n is drawn with a probability proportional to 1 / k ** s,
+    so that a few low ranks are drawn far more often than the rest, as hot
+    keys are in production.
+
+    Attributes
+    ----------
+
+    n : int
+        the number of ranks
+
+    s : float
+        the exponent of the distribution, higher being more skewed
+
+    first : int
+        the value of the most frequent rank
+    '''
+
+    integer = True
+
+    def __init__(self, n=1000, s=1.0, first=1, *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        n : int, optional
+            the number of ranks (default is 1000)
+
+        s : float, optional
+            the exponent of the distribution (default is 1.0)
+
+        first : int, optional
+            the value of the most frequent rank (default is 1)
+        '''
+
+        self.n = n
+        self.s = s
+        self.first = first
+        self._cum_weights = None
+        super().__init__(*args, **kwargs)
+
+    def _sample(self, size):
+        if self._cum_weights is None:
+            self._cum_weights = list(itertools.accumulate(
+                1.0 / k ** self.s for k in range(1, self.n + 1)
+            ))
+
+        return random.choices(range(self.first, self.first + self.n),
+                              cum_weights=self._cum_weights, k=size)
+
+
+class HistogramGenerator(DistributionGenerator):
+    '''
+    A generator that returns numbers following a custom histogram
+
+    A bin is drawn according to the weights of the histogram, then a number
+    is drawn uniformly within the bin.
+
+    Attributes
+    ----------
+
+    bins : list
+        a list of (low, high, weight) tuples
+    '''
+
+    def __init__(self, bins=((0, 1, 1),), *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        bins : list, optional
+            a list of (low, high, weight) tuples (default is a single bin
+            from 0 to 1)
+        '''
+
+        self.bins = [tuple(histogram_bin) for histogram_bin in bins]
+        self._cum_weights = list(itertools.accumulate(
+            weight for low, high, weight in self.bins
+        ))
+        super().__init__(*args, **kwargs)
+
+    def _sample(self, size):
+        uniform = random.uniform
+        return [
+            uniform(low, high) for low, high, weight in random.choices(
+                self.bins, cum_weights=self._cum_weights, k=size)
+        ]
+
+
+class WeightedChoiceGenerator(AbstractGenerator):
+    '''
+    A generator that returns one of a set of choices, according to weights
+
+    A Walker alias table is built once (with Vose's method), after which
+    every value costs a single uniform draw and a coin flip, however many
+    choices there are.
+
+    Attributes
+    ----------
+
+    choices : list
+        the values to choose from
+
+    weights : list
+        the relative weight of every choice
+
+
+    Methods
+    -------
+
+    generate : object
+        generates a random choice
+
+    generate_batch : list
+        generates a batch of random choices
+    '''
+
+    def __init__(self, choices=(), weights=None, *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        choices : list
+            the values to choose from
+
+        weights : list or dict, optional
+            the relative weight of every choice, either in the order of the
+            choices or as a dictionary mapping choices to their weight.
+            Choices missing from a dictionary are never generated
+            (default is equal weights)
+        '''
+
+        self.choices = list(choices)
+
+        if weights is None:
+            weights = [1] * len(self.choices)
+        elif isinstance(weights, dict):
+            weights = [weights.get(choice, 0) for choice in self.choices]
+
+        if len(weights) != len(self.choices) or not self.choices:
+            raise ValueError("Every choice needs exactly one weight")
+
+        if sum(weights) <= 0 or min(weights) < 0:
+            raise ValueError("Weights must be positive")
+
+        self.weights = list(weights)
+        self._probabilities, self._aliases = self._build_table(self.weights)
+        super().__init__(*args, **kwargs)
+
+    def generate(self):
+        '''
+        Generates a random choice
+
+        Returns
+        -------
+
+        object
+            one of the choices
+        '''
+
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, size):
+        '''
+        Generates a batch of random choices
+
+        Parameters
+        ----------
+
+        size : int
+            the number of choices to generate
+
+
+        Returns
+        -------
+
+        list
+            a list of choices
+        '''
+
+        choices = self.choices
+        count = len(choices)
+
+        if numpy is not None:
+            rng = numpy.random.default_rng(random.getrandbits(64))
+            columns = rng.integers(0, count, size)
+            coins = rng.random(size)
+            indexes = numpy.where(
+                coins < numpy.asarray(self._probabilities)[columns],
+                columns, numpy.asarray(self._aliases)[columns]
+            )
+            return [choices[i] for i in indexes.tolist()]
+
+        probabilities = self._probabilities
+        aliases = self._aliases
+        uniform = random.random
+
+        values = []
+        for i in range(size):
+            column = int(uniform() * count)
+            if uniform() < probabilities[column]:
+                values.append(choices[column])
+            else:
+                values.append(choices[aliases[column]])
+
+        return values
+
+    def _build_table(self, weights):
+        count = len(weights)
+        total = float(sum(weights))
+        scaled = [weight * count / total for weight in weights]
+
+        probabilities = [1.0] * count
+        aliases = list(range(count))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+
+            scaled[more] = scaled[more] + scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Whatever is left is 1 up to rounding errors
+        return probabilities, aliases
+
+
+DISTRIBUTIONS = {
+    "normal": NormalGenerator,
+    "lognormal": LogNormalGenerator,
+    "exponential": ExponentialGenerator,
+    "zipf": ZipfGenerator,
+    "histogram": HistogramGenerator,
+    "weighted": WeightedChoiceGenerator
+}
+
+
+class CorpusGenerator(AbstractGenerator):
+    '''
+    A generator that returns random entries of a memory-mapped corpus
+
+    Attributes
+    ----------
+
+    corpus : str
+        the name of the bundled corpus to sample from
+
+    max_length : int
+        the maximum length of the generated string, or None for no limit
+
+
+    Methods
+    -------
+
+    generate : str
+        generates a random corpus entry
+    '''
+
+    corpus = "words"
+    max_length = None
+
+    def __init__(self, corpus=None, max_length=None, *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        corpus : str, optional
+            the name of the bundled corpus to sample from (default is words)
+
+        max_length : int, optional
+            the maximum length of the generated string (default is None)
+        '''
+
+        if corpus is not None:
+            self.corpus = corpus
+
+        if max_length is not None:
+            self.max_length = max_length
+
+        super().__init__(*args, **kwargs)
+
+    def generate(self):
+        '''
+        Generates a random corpus entry
+
+        Returns
+        -------
+
+        str
+            a random corpus entry
+        '''
+
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, size):
+        '''
+        Generates a batch of random corpus entries
+
+        Parameters
+        ----------
+
+        size : int
+            the number of entries to generate
+
+
+        Returns
+        -------
+
+        list
+            a list of random corpus entries
+        '''
+
+        return self._truncate(get_corpus(self.corpus).sample(size))
+
+    def _truncate(self, values):
+        if self.max_length is None:
+            return values
+
+        return [value[:self.max_length] for value in values]
+
+
+class WordGenerator(CorpusGenerator):
+    '''
+    A generator that returns a random English word
+
+    Methods
+    -------
+
+    generate : str
+        generates a random word
+    '''
+
+    corpus = "words"
+
+
+class NameGenerator(CorpusGenerator):
+    '''
+    A generator that returns a random full name
+
+    Methods
+    -------
+
+    generate : str
+        generates a random first and last name
+    '''
+
+    def generate_batch(self, size):
+        '''
+        Generates a batch of random full names
+
+        Parameters
+        ----------
+
+        size : int
+            the number of names to generate
+
+
+        Returns
+        -------
+
+        list
+            a list of random full names
+        '''
+
+        first_names = get_corpus("first_names").sample(size)
+        last_names = get_corpus("last_names").sample(size)
+
+        return self._truncate([
+            "%s %s" % name for name in zip(first_names, last_names)
+        ])
+
+
+class SentenceGenerator(CorpusGenerator):
+    '''
+    A generator that returns a random sentence of English words
+
+    Attributes
+    ----------
+
+    min_words : int
+        the minimum number of words in a sentence
+
+    max_words : int
+        the maximum number of words in a sentence
+
+
+    Methods
+    -------
+
+    generate : str
+        generates a random sentence
+    '''
+
+    min_words = 4
+    max_words = 12
+
+    def __init__(self, min_words=None, max_words=None, *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        min_words : int, optional
+            the minimum number of words in a sentence (default is 4)
+
+        max_words : int, optional
+            the maximum number of words in a sentence (default is 12)
+        '''
+
+        if min_words is not None:
+            self.min_words = min_words
+
+        if max_words is not None:
+            self.max_words = max_words
+
+        super().__init__(*args, **kwargs)
+
+    def generate_batch(self, size):
+        '''
+        Generates a batch of random sentences
+
+        Parameters
+        ----------
+
+        size : int
+            the number of sentences to generate
+
+
+        Returns
+        -------
+
+        list
+            a list of random sentences
+        '''
+
+        lengths = [random.randint(self.min_words, self.max_words)
+                   for i in range(size)]
+        words = get_corpus("words").sample(sum(lengths))
+
+        sentences = []
+        start = 0
+        for length in lengths:
+            sentence = " ".join(words[start:start + length])
+            sentences.append(sentence.capitalize() + ".")
+            start += length
+
+        return self._truncate(sentences)
+
+
+class AddressGenerator(CorpusGenerator):
+    '''
+    A generator that returns a random street address
+
+    Methods
+    -------
+
+    generate : str
+        generates a random street address (i.e. 12 Oak Street, Salem)
+    '''
+
+    def generate_batch(self, size):
+        '''
+        Generates a batch of random street addresses
+
+        Parameters
+        ----------
+
+        size : int
+            the number of addresses to generate
+
+
+        Returns
+        -------
+
+        list
+            a list of random street addresses
+        '''
+
+        numbers = [random.randint(1, 9999) for i in range(size)]
+        streets = get_corpus("street_names").sample(size)
+        suffixes = get_corpus("street_suffixes").sample(size)
+        cities = get_corpus("cities").sample(size)
+
+        return self._truncate([
+            "%d %s %s, %s" % address
+            for address in zip(numbers, streets, suffixes, cities)
+        ])
+
+
+# The size of the shared buffer binary payloads are carved out of
+BUFFER_SIZE = 1024 ** 2
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_random_buffer(size=None):
+    '''
+    Returns the shared buffer of random bytes
+
+    Binary payloads are carved out of a single buffer of random bytes rather
+    than generated per row. The buffer is allocated once per process, from
+    its own fixed seed so that it is the same in every process, and only
+    reallocated when a larger buffer is asked for.
+
+    Parameters
+    ----------
+
+    size : int, optional
+        the minimum size of the buffer in bytes (default is BUFFER_SIZE)
+
+
+    Returns
+    -------
+
+    bytes
+        the shared buffer
+    '''
+
+    global _buffer
+
+    size = max(size or 0, BUFFER_SIZE)
+
+    with _buffer_lock:
+        if _buffer is None or len(_buffer) < size:
+            _buffer = random.Random(0).getrandbits(size * 8) \
+                .to_bytes(size, "little")
+
+        return _buffer
+
+
+class BinaryGenerator(AbstractGenerator):
+    '''
+    A generator that returns random bytes
+
+    Values are memoryview slices of the shared random buffer, at random
+    offsets, so that generating them copies nothing.
+
+    Attributes
+    ----------
+
+    min_length : int
+        the minimum length of the generated value
+
+    max_length : int
+        the maximum length of the generated value
+
+
+    Methods
+    -------
+
+    generate : memoryview
+        generates random bytes
+    '''
+
+    min_length = 16
+    max_length = 256
+
+    def __init__(self, min_length=None, max_length=None, *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        min_length : int, optional
+            the minimum length of the generated value (default is 16)
+
+        max_length : int, optional
+            the maximum length of the generated value (default is 256)
+        '''
+
+        if min_length is not None:
+            self.min_length = min_length
+
+        if max_length is not None:
+            self.max_length = max_length
+
+        super().__init__(*args, **kwargs)
+
+    def generate(self):
+        '''
+        Generates random bytes
+
+        Returns
+        -------
+
+        memoryview
+            a read-only view of random bytes
+        '''
+
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, size):
+        '''
+        Generates a batch of random bytes
+
+        Parameters
+        ----------
+
+        size : int
+            the number of values to generate
+
+
+        Returns
+        -------
+
+        list
+            a list of read-only memoryviews of random bytes
+        '''
+
+        view = memoryview(get_random_buffer(self.max_length))
+        values = []
+        for i in range(size):
+            length = random.randint(self.min_length, self.max_length)
+            offset = random.randint(0, len(view) - length)
+            values.append(view[offset:offset + length])
+
+        return values
+
+
+class FileGenerator(AbstractGenerator):
+    '''
+    A generator that returns the names of files in a storage
+
+    Rather than writing a file per row, a small set of blobs is written to
+    the storage the first time values are generated, each named after the
+    SHA-256 of its content, and every row references one of them. Blobs are
+    built from fixed seeds, so that seeding again reuses the blobs already
+    in the storage.
+
+    Attributes
+    ----------
+
+    storage : django.core.files.storage.Storage
+        the storage blobs are written to
+
+    directory : str
+        the directory of the storage blobs are written to
+
+    upload_to : str or callable
+        the upload_to of the file field the blobs are generated for, which
+        replaces directory, or None
+
+    blobs : int
+        the number of distinct blobs
+
+    min_size : int
+        the minimum size of a blob in bytes
+
+    max_size : int
+        the maximum size of a blob in bytes
+
+    extension : str
+        the extension of the blob names
+
+
+    Methods
+    -------
+
+    generate : str
+        generates the name of a blob
+    '''
+
+    directory = "seeds"
+    upload_to = None
+    blobs = 16
+    min_size = 1024
+    max_size = 64 * 1024
+    extension = ".bin"
+
+    def __init__(self, storage=None, directory=None, blobs=None,
+                 min_size=None, max_size=None, upload_to=None, *args,
+                 **kwargs):
+        '''
+        Parameters
+        ----------
+
+        storage : django.core.files.storage.Storage, optional
+            the storage blobs are written to (default is the default
+            storage)
+
+        directory : str, optional
+            the directory of the storage blobs are written to
+            (default is seeds)
+
+        blobs : int, optional
+            the number of distinct blobs (default is 16)
+
+        min_size : int, optional
+            the minimum size of a blob in bytes (default is 1024)
+
+        max_size : int, optional
+            the maximum size of a blob in bytes (default is 65536)
+
+        upload_to : str or callable, optional
+            the upload_to of the file field the blobs are generated for, as
+            given to django.db.models.FileField: a directory formatted with
+            strftime, or a callable returning the name of a file from an
+            instance and a file name. As blobs are shared by every row, the
+            callable is given None as the instance (default is None, for
+            blobs written to directory)
+        '''
+
+        self.storage = storage
+        if directory is not None:
+            self.directory = directory
+
+        if blobs is not None:
+            self.blobs = blobs
+
+        if min_size is not None:
+            self.min_size = min_size
+
+        if max_size is not None:
+            self.max_size = max_size
+
+        if upload_to is not None:
+            self.upload_to = upload_to
+
+        self._names = None
+
+        super().__init__(*args, **kwargs)
+
+    def generate(self):
+        '''
+        Generates the name of a blob
+
+        Returns
+        -------
+
+        str
+            the name of a blob in the storage
+        '''
+
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, size):
+        '''
+        Generates a batch of blob names
+
+        Parameters
+        ----------
+
+        size : int
+            the number of names to generate
+
+
+        Returns
+        -------
+
+        list
+            a list of blob names in the storage
+        '''
+
+        return random.choices(self._get_names(), k=size)
+
+    def _get_names(self):
+        if self._names is None:
+            storage = self.storage or default_storage
+            names = []
+
+            for i in range(self.blobs):
+                content = self._get_content(random.Random(i))
+                name = self._get_name("%s%s" % (
+                    hashlib.sha256(content).hexdigest(), self.extension
+                ), storage)
+
+                if not storage.exists(name):
+                    name = storage.save(name, ContentFile(content))
+
+                names.append(name)
+
+            self._names = names
+
+        return self._names
+
+    def _get_name(self, filename, storage):
+        # As FileField.generate_filename does for uploaded files
+        if callable(self.upload_to):
+            name = self.upload_to(None, filename)
+        else:
+            directory = datetime.datetime.now().strftime(self.upload_to) \
+                if self.upload_to else self.directory
+            name = posixpath.join(directory, filename)
+
+        return storage.generate_filename(name)
+
+    def _get_content(self, rng):
+        size = rng.randint(self.min_size, self.max_size)
+        offset = rng.randint(0, BUFFER_SIZE - size) \
+            if size <= BUFFER_SIZE else 0
+
+        return get_random_buffer(size)[offset:offset + size]
+
+
+class ImageGenerator(FileGenerator):
+    '''
+    A generator that returns the names of PNG images in a storage
+
+    Images are solid colored and shared between rows in the same way as the
+    blobs of a FileGenerator.
+
+    Attributes
+    ----------
+
+    width : int
+        the width of the images in pixels
+
+    height : int
+        the height of the images in pixels
+
+
+    Methods
+    -------
+
+    generate : str
+        generates the name of an image
+    '''
+
+    extension = ".png"
+    width = 16
+    height = 16
+
+    def __init__(self, width=None, height=None, *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        width : int, optional
+            the width of the images in pixels (default is 16)
+
+        height : int, optional
+            the height of the images in pixels (default is 16)
+        '''
+
+        if width is not None:
+            self.width = width
+
+        if height is not None:
+            self.height = height
+
+        super().__init__(*args, **kwargs)
+
+    def _get_content(self, rng):
+        pixel = bytes(rng.randrange(256) for i in range(3))
+        rows = (b"\0" + pixel * self.width) * self.height
+
+        def chunk(kind, data):
+            return struct.pack(">I", len(data)) + kind + data + \
+                struct.pack(">I", zlib.crc32(kind + data))
+
+        return b"".join([
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", struct.pack(">IIBBBBB", self.width, self.height,
+                                       8, 2, 0, 0, 0)),
+            chunk(b"IDAT", zlib.compress(rows)),
+            chunk(b"IEND", b"")
+        ])
+
+
+class JsonGenerator(AbstractGenerator):
+    '''
+    A generator that returns a random JSON object
+
+    Objects map English words to integers, booleans, words or lists of
+    words.
+
+    Attributes
+    ----------
+
+    max_keys : int
+        the maximum number of keys of the generated object
+
+
+    Methods
+    -------
+
+    generate : dict
+        generates a random JSON object
+    '''
+
+    max_keys = 5
+
+    def __init__(self, max_keys=None, *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        max_keys : int, optional
+            the maximum number of keys of the generated object
+            (default is 5)
+        '''
+
+        if max_keys is not None:
+            self.max_keys = max_keys
+
+        super().__init__(*args, **kwargs)
+
+    def generate(self):
+        '''
+        Generates a random JSON object
+
+        Returns
+        -------
+
+        dict
+            a random JSON serializable dictionary
+        '''
+
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, size):
+        '''
+        Generates a batch of random JSON objects
+
+        Parameters
+        ----------
+
+        size : int
+            the number of objects to generate
+
+
+        Returns
+        -------
+
+        list
+            a list of random JSON serializable dictionaries
+        '''
+
+        lengths = [random.randint(1, self.max_keys) for i in range(size)]
+        words = iter(get_corpus("words").sample(sum(lengths) * 4))
+
+        values = []
+        for length in lengths:
+            value = {}
+            for i in range(length):
+                kind = random.randrange(4)
+                if kind == 0:
+                    item = random.randint(0, 1000000)
+                elif kind == 1:
+                    item = random.random() < 0.5
+                elif kind == 2:
+                    item = next(words)
+                else:
+                    item = [next(words), next(words)]
+
+                value[next(words)] = item
+
+            values.append(value)
+
+        return values
+
+
+class DurationGenerator(AbstractGenerator):
+    '''
+    A generator that returns a random duration
+
+    Attributes
+    ----------
+
+    min_duration : datetime.timedelta
+        the lower bounds for the random duration
+
+    max_duration : datetime.timedelta
+        the upper bounds for the random duration
+
+
+    Methods
+    -------
+
+    generate : datetime.timedelta
+        generates a random duration
+    '''
+
+    min_duration = datetime.timedelta(0)
+    max_duration = datetime.timedelta(days=30)
+
+    def __init__(self, min_duration=None, max_duration=None, *args,
+                 **kwargs):
+        '''
+        Parameters
+        ----------
+
+        min_duration : datetime.timedelta, optional
+            the lower bounds for the random duration (default is 0)
+
+        max_duration : datetime.timedelta, optional
+            the upper bounds for the random duration (default is 30 days)
+        '''
+
+        if min_duration is not None:
+            self.min_duration = min_duration
+
+        if max_duration is not None:
+            self.max_duration = max_duration
+
+        super().__init__(*args, **kwargs)
+
+    def generate(self):
+        '''
+        Generates a random duration
+
+        Returns
+        -------
+
+        datetime.timedelta
+            a random duration, to the microsecond
+        '''
+
+        microseconds = random.randint(
+            self.min_duration // datetime.timedelta(microseconds=1),
+            self.max_duration // datetime.timedelta(microseconds=1)
+        )
+
+        return datetime.timedelta(microseconds=microseconds)
+
+
+class SlugGenerator(CorpusGenerator):
+    '''
+    A generator that returns a random slug
+
+    Slugs join English words with hyphens and end with a random suffix, so
+    that they are very likely to be unique.
+
+    Attributes
+    ----------
+
+    max_words : int
+        the maximum number of words of the slug
+
+
+    Methods
+    -------
+
+    generate : str
+        generates a random slug (i.e. quick-brown-fox-3f2a91c0)
+    '''
+
+    max_length = 50
+    max_words = 3
+
+    def __init__(self, max_words=None, *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        max_words : int, optional
+            the maximum number of words of the slug (default is 3)
+        '''
+
+        if max_words is not None:
+            self.max_words = max_words
+
+        super().__init__(*args, **kwargs)
+
+    def generate_batch(self, size):
+        '''
+        Generates a batch of random slugs
+
+        Parameters
+        ----------
+
+        size : int
+            the number of slugs to generate
+
+
+        Returns
+        -------
+
+        list
+            a list of random slugs
+        '''
+
+        lengths = [random.randint(1, self.max_words) for i in range(size)]
+        words = get_corpus("words").sample(sum(lengths))
+
+        slugs = []
+        start = 0
+        for length in lengths:
+            suffix = "%08x" % random.getrandbits(32)
+            slug = "-".join(words[start:start + length]).lower()
+            slug = slug[:self.max_length - len(suffix) - 1].rstrip("-")
+            slugs.append("%s-%s" % (slug, suffix) if slug
+                         else suffix[:self.max_length])
+            start += length
+
+        return slugs
+
+
+class ArrayGenerator(AbstractGenerator):
+    '''
+    A generator that returns a list of random items
+
+    Attributes
+    ----------
+
+    generator : AbstractGenerator
+        the generator of the items
+
+    min_length : int
+        the minimum length of the generated list
+
+    max_length : int
+        the maximum length of the generated list
+
+
+    Methods
+    -------
+
+    generate : list
+        generates a random list
+    '''
+
+    min_length = 0
+    max_length = 5
+
+    def __init__(self, generator=None, min_length=None, max_length=None,
+                 *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        generator : AbstractGenerator, optional
+            the generator of the items (default is an IntegerGenerator)
+
+        min_length : int, optional
+            the minimum length of the generated list (default is 0)
+
+        max_length : int, optional
+            the maximum length of the generated list (default is 5)
+        '''
+
+        self.generator = generator or IntegerGenerator()
+
+        if min_length is not None:
+            self.min_length = min_length
+
+        if max_length is not None:
+            self.max_length = max_length
+
+        super().__init__(*args, **kwargs)
+
+    def generate(self):
+        '''
+        Generates a random list
+
+        Returns
+        -------
+
+        list
+            a list of random items
+        '''
+
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, size):
+        '''
+        Generates a batch of random lists
+
+        Items for the whole batch are generated in a single batch of the
+        item generator.
+
+        Parameters
+        ----------
+
+        size : int
+            the number of lists to generate
+
+
+        Returns
+        -------
+
+        list
+            a list of lists of random items
+        '''
+
+        lengths = [random.randint(self.min_length, self.max_length)
+                   for i in range(size)]
+        items = self.generator.generate_batch(sum(lengths))
+
+        values = []
+        start = 0
+        for length in lengths:
+            values.append(list(items[start:start + length]))
+            start += length
+
+        return values
+
+
+# The length of the shared text buffers large text is carved out of
+TEXT_BUFFER_SIZE = 1024 ** 2
+
+# The sources large text can be carved out of
+TEXT_SOURCES = ("corpus", "random")
+
+_text_buffers = {}
+
+
+def get_text_buffer(source="corpus"):
+    '''
+    Returns a shared buffer of text
+
+    Buffers are built once per process from their own fixed seed, so that
+    they are the same in every process.
+
+    Parameters
+    ----------
+
+    source : str, optional
+        corpus for English words separated by spaces, which compress like
+        prose, or random for random letters and digits, which barely
+        compress (default is corpus)
+
+
+    Returns
+    -------
+
+    str
+        a string of TEXT_BUFFER_SIZE characters
+    '''
+
+    if source not in TEXT_SOURCES:
+        raise ValueError('Unknown text source "%s"' % source)
+
+    with _buffer_lock:
+        if source not in _text_buffers:
+            rng = random.Random(0)
+
+            if source == "corpus":
+                corpus = get_corpus("words")
+                words = []
+                length = 0
+                while length < TEXT_BUFFER_SIZE:
+                    word = corpus[rng.randrange(len(corpus))]
+                    words.append(word)
+                    length += len(word) + 1
+
+                text = " ".join(words)
+            else:
+                text = "".join(rng.choices(
+                    string.ascii_letters + string.digits + " ",
+                    k=TEXT_BUFFER_SIZE
+                ))
+
+            _text_buffers[source] = text[:TEXT_BUFFER_SIZE]
+
+        return _text_buffers[source]
+
+
+class BulkTextGenerator(AbstractGenerator):
+    '''
+    A generator that returns large random text
+
+    Values are carved out of a shared text buffer at random offsets rather
+    than generated a character at a time, so that a value of a few megabytes
+    costs a single slice, or a single join for values longer than the
+    buffer. Their sizes are drawn uniformly between min_size and max_size,
+    or from a distribution.
+
+    Attributes
+    ----------
+
+    min_size : int
+        the minimum number of characters of the generated text
+
+    max_size : int
+        the maximum number of characters of the generated text
+
+    distribution : DistributionGenerator
+        the generator the sizes are drawn from, or None to draw them
+        uniformly
+
+    source : str
+        the text buffer values are carved out of, corpus or random
+
+
+    Methods
+    -------
+
+    generate : str
+        generates random text
+    '''
+
+    min_size = 1024
+    max_size = 64 * 1024
+    source = "corpus"
+
+    def __init__(self, min_size=None, max_size=None, distribution=None,
+                 source=None, *args, **kwargs):
+        '''
+        Parameters
+        ----------
+
+        min_size : int, optional
+            the minimum number of characters of the generated text
+            (default is 1024)
+
+        max_size : int, optional
+            the maximum number of characters of the generated text
+            (default is 65536)
+
+        distribution : object, optional
+            a DistributionGenerator drawing the sizes, or a dictionary
+            naming the distribution along with the keyword arguments of its
+            generator, as in field_options (i.e. {"distribution":
+            "lognormal", "mu": 9, "sigma": 1}). Sizes are clipped to
+            min_size and max_size (default is None)
+
+        source : str, optional
+            corpus to carve values out of English words, or random to carve
+            them out of random characters, which barely compress
+            (default is corpus)
+        '''
+
+        if min_size is not None:
+            self.min_size = min_size
+
+        if max_size is not None:
+            self.max_size = max_size
+
+        if source is not None:
+            if source not in TEXT_SOURCES:
+                raise ValueError('Unknown text source "%s"' % source)
+
+            self.source = source
+
+        if isinstance(distribution, dict):
+            options = dict(distribution)
+            generator_cls = DISTRIBUTIONS[options.pop("distribution")]
+            if issubclass(generator_cls, DistributionGenerator):
+                options.setdefault("integer", True)
+
+            distribution = generator_cls(**options)
+
+        self.distribution = distribution
+
+        super().__init__(*args, **kwargs)
+
+    def generate(self):
+        '''
+        Generates random text
+
+        Returns
+        -------
+
+        str
+            random text
+        '''
+
+        return self.generate_batch(1)[0]
+
+    def generate_batch(self, size):
+        '''
+        Generates a batch of random text
+
+        Parameters
+        ----------
+
+        size : int
+            the number of values to generate
+
+
+        Returns
+        -------
+
+        list
+            a list of random text
+        '''
+
+        text = get_text_buffer(self.source)
+
+        if self.distribution is None:
+            sizes = [random.randint(self.min_size, self.max_size)
+                     for i in range(size)]
+        else:
+            sizes = [
+                min(max(int(value), self.min_size), self.max_size)
+                for value in self.distribution.generate_batch(size)
+            ]
+
+        return [self._carve(text, length) for length in sizes]
+
+    def _carve(self, text, length):
+        if length <= len(text):
+            offset = random.randint(0, len(text) - length)
+            return text[offset:offset + length]
+
+        # Longer values repeat the whole buffer, joined once
+        repeats, rest = divmod(length, len(text))
+        return "".join([text] * repeats + [text[:rest]])
@@ -0,0 +1,159 @@
+'''
+Hooks observing a seeder
+
+A seeder calls the hooks it is given at every step of seeding, with the
+number of rows involved, an estimate of their size in bytes and the time the
+step took in nanoseconds (from time.perf_counter_ns, or time.perf_counter
+before Python 3.7). Hooks subclass SeedHooks and override the steps they are
+interested in.
+
+In pipelined mode on_batch_flushed is called from the writer thread, and
+plans seeded by several workers share their hooks between threads, so hooks
+that keep state must guard it with a lock.
+'''
+
+
+class SeedHooks:
+    '''
+    A base class for the hooks of a seeder, which ignores every step
+
+    Methods
+    -------
+
+    on_plan_compiled(seeder, rows, fields, elapsed_ns)
+        called once the field plan of a seeder is compiled
+
+    on_batch_generated(seeder, batch, rows, nbytes, elapsed_ns)
+        called once a batch is generated
+
+    on_batch_built(seeder, batch, rows, nbytes, elapsed_ns)
+        called once the model instances of a batch are built
+
+    on_batch_flushed(seeder, batch, rows, nbytes, elapsed_ns)
+        called once a batch is written and committed
+
+    on_error(seeder, error, rows, elapsed_ns)
+        called when seeding fails
+    '''
+
+    def on_plan_compiled(self, seeder, rows, fields, elapsed_ns):
+        '''
+        Called once the field plan of a seeder is compiled
+
+        Parameters
+        ----------
+
+        seeder : data_seeder.base.DataSeeder
+            the seeder
+
+        rows : int
+            the number of seeds the seeder generates
+
+        fields : int
+            the number of fields in the plan
+
+        elapsed_ns : int
+            the time taken to compile the plan
+        '''
+
+        pass
+
+    def on_batch_generated(self, seeder, batch, rows, nbytes, elapsed_ns):
+        '''
+        Called once a batch is generated, before it is written
+
+        Parameters
+        ----------
+
+        seeder : data_seeder.base.DataSeeder
+            the seeder
+
+        batch : data_seeder.batch.ColumnarBatch
+            the generated batch
+
+        rows : int
+            the number of rows in the batch
+
+        nbytes : int
+            the estimated size of the batch
+
+        elapsed_ns : int
+            the time taken to generate the batch
+        '''
+
+        pass
+
+    def on_batch_built(self, seeder, batch, rows, nbytes, elapsed_ns):
+        '''
+        Called once the model instances of a batch are built
+
+        Instances are built before the batch is written. Batches written
+        without instances (i.e. by the RawWriter) are never built.
+
+        Parameters
+        ----------
+
+        seeder : data_seeder.base.DataSeeder
+            the seeder
+
+        batch : data_seeder.batch.ColumnarBatch
+            the built batch
+
+        rows : int
+            the number of rows in the batch
+
+        nbytes : int
+            the estimated size of the batch
+
+        elapsed_ns : int
+            the time taken to build the instances
+        '''
+
+        pass
+
+    def on_batch_flushed(self, seeder, batch, rows, nbytes, elapsed_ns):
+        '''
+        Called once a batch is written and committed
+
+        Parameters
+        ----------
+
+        seeder : data_seeder.base.DataSeeder
+            the seeder
+
+        batch : data_seeder.batch.ColumnarBatch
+            the written batch
+
+        rows : int
+            the number of rows in the batch
+
+        nbytes : int
+            the estimated size of the batch
+
+        elapsed_ns : int
+            the time taken to write and commit the batch
+        '''
+
+        pass
+
+    def on_error(self, seeder, error, rows, elapsed_ns):
+        '''
+        Called when seeding fails, before the error is raised
+
+        Parameters
+        ----------
+
+        seeder : data_seeder.base.DataSeeder
+            the seeder
+
+        error : BaseException
+            the error
+
+        rows : int
+            the number of rows committed by the seeder before the error
+
+        elapsed_ns : int
+            the time spent seeding before the error
+        '''
+
+        pass
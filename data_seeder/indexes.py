@@ -0,0 +1,252 @@
+'''
+Deferred index maintenance for bulk loads
+
+Loading tens of millions of rows into a table with several secondary indexes
+is dominated by maintaining the indexes row by row. DeferredIndexes drops the
+secondary indexes and foreign key constraints of the seeded tables while they
+are loaded, then rebuilds them in bulk and refreshes the planner statistics
+of the tables with ANALYZE.
+
+The indexes dropped are those Django creates for the models: the indexes of
+their Meta.indexes, of their fields with db_index (including foreign keys)
+and their foreign key constraints. Primary keys and unique constraints are
+left in place, so that seeded rows are still checked against them. SQLite
+cannot drop foreign key constraints, so only indexes are deferred there.
+
+Everything dropped is rebuilt when the context manager exits, whether or not
+seeding failed. If seeding failed and rebuilding fails too, the error raised
+is chained to the seeding error.
+'''
+
+import time
+
+from django.db import connections, router
+
+# The statements refreshing the planner statistics of a table
+ANALYZE_SQL = {
+    "postgresql": "ANALYZE %s",
+    "sqlite": "ANALYZE %s",
+    "mysql": "ANALYZE TABLE %s"
+}
+
+
+class DeferredIndexError(Exception):
+    '''
+    Raised when deferred indexes or constraints cannot be rebuilt
+    '''
+
+    pass
+
+
+class DeferredIndexes:
+    '''
+    A context manager dropping the secondary indexes and foreign key
+    constraints of models while they are bulk loaded
+
+    Attributes
+    ----------
+
+    models : list
+        the subclasses of django.db.models.Model whose tables are loaded
+
+    analyze : bool
+        whether to run ANALYZE on the tables once their indexes are rebuilt
+
+    dropped : list
+        a list of (model, kind, index or field) tuples describing what was
+        dropped, where kind is index for Meta.indexes, field for the index
+        of a field with db_index and foreign_key for a foreign key constraint
+
+    elapsed : float
+        the number of seconds spent rebuilding and analyzing
+
+
+    Methods
+    -------
+
+    drop()
+        drops the secondary indexes and foreign key constraints
+
+    restore()
+        rebuilds everything dropped and analyzes the tables
+    '''
+
+    def __init__(self, models, analyze=True):
+        '''
+        Parameters
+        ----------
+
+        models : iterable
+            the subclasses of django.db.models.Model whose tables are loaded
+
+        analyze : bool, optional
+            whether to run ANALYZE on the tables once their indexes are
+            rebuilt (default is True)
+        '''
+
+        self.models = []
+        for model in models:
+            model = model._meta.concrete_model
+            if model._meta.managed and model not in self.models:
+                self.models.append(model)
+
+        self.analyze = analyze
+        self.dropped = []
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self.drop()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.restore()
+
+        except DeferredIndexError as e:
+            if exc_value is None:
+                raise
+
+            raise e from exc_value
+
+    def drop(self):
+        '''
+        Drops the secondary indexes and foreign key constraints
+
+        Every index and constraint is dropped in its own schema edit, so
+        that if one cannot be dropped, those already dropped are rebuilt
+        before the error is raised.
+        '''
+
+        try:
+            for model in self.models:
+                connection = connections[router.db_for_write(model)]
+
+                # Foreign keys go first, as MySQL needs their indexes
+                for kind, item, names in self._get_droppable(connection,
+                                                             model):
+                    with connection.schema_editor() as editor:
+                        if kind == "index":
+                            editor.remove_index(model, item)
+                        else:
+                            for statement in _get_schema_sql(
+                                    editor, model, kind, item, names):
+                                editor.execute(statement)
+
+                    self.dropped.append((model, kind, item))
+
+        except BaseException as e:
+            try:
+                self.restore()
+            except DeferredIndexError as error:
+                raise error from e
+
+            raise
+
+    def restore(self):
+        '''
+        Rebuilds everything dropped and analyzes the tables
+
+        Indexes are rebuilt before foreign key constraints. A failure to
+        rebuild one does not stop the others from being rebuilt.
+        '''
+
+        started = time.monotonic()
+        errors = []
+
+        order = {"index": 0, "field": 0, "foreign_key": 1}
+        for model, kind, item in sorted(self.dropped,
+                                        key=lambda entry: order[entry[1]]):
+            connection = connections[router.db_for_write(model)]
+
+            try:
+                with connection.schema_editor() as editor:
+                    if kind == "index":
+                        editor.add_index(model, item)
+                    else:
+                        for statement in _get_schema_sql(editor, model, kind,
+                                                         item):
+                            editor.execute(statement)
+
+            except Exception as e:
+                errors.append('%s of "%s": %s' % (
+                    getattr(item, "name", item), model._meta.label, e))
+
+        if self.analyze and self.dropped:
+            for model in self.models:
+                self._analyze(model)
+
+        self.elapsed = time.monotonic() - started
+        self.dropped = []
+
+        if errors:
+            raise DeferredIndexError("Could not rebuild %s" %
+                                     "; ".join(errors))
+
+    def _get_droppable(self, connection, model):
+        table = model._meta.db_table
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor,
+                                                                   table)
+
+        def names_of(field, **flags):
+            return [
+                name for name, details in constraints.items()
+                if details["columns"] == [field.column] and
+                not details["primary_key"] and not details["unique"] and
+                all(bool(details.get(flag)) == value
+                    for flag, value in flags.items())
+            ]
+
+        droppable = []
+        meta_indexes = {index.name for index in model._meta.indexes}
+
+        if connection.vendor != "sqlite" and \
+                connection.features.supports_foreign_keys:
+            for field in model._meta.local_concrete_fields:
+                if field.remote_field is not None and \
+                        getattr(field, "db_constraint", False):
+                    names = names_of(field, foreign_key=True)
+                    if names:
+                        droppable.append(("foreign_key", field, names))
+
+        for field in model._meta.local_concrete_fields:
+            if field.db_index and not field.unique:
+                names = [name for name in names_of(field, index=True,
+                                                   foreign_key=False)
+                         if name not in meta_indexes]
+                if names:
+                    droppable.append(("field", field, names))
+
+        for index in model._meta.indexes:
+            if index.name in constraints:
+                droppable.append(("index", index, None))
+
+        return droppable
+
+    def _analyze(self, model):
+        connection = connections[router.db_for_write(model)]
+        sql = ANALYZE_SQL.get(connection.vendor)
+
+        if sql is not None:
+            with connection.cursor() as cursor:
+                cursor.execute(sql % connection.ops.quote_name(
+                    model._meta.db_table))
+
+
+def _get_schema_sql(editor, model, kind, field, names=None):
+    # Django only builds the SQL of field indexes and foreign key constraints
+    # through private schema editor methods, which are only called here.
+    # Their signatures are the same from Django 2.2 to 5.2, and they are
+    # tested with Django 5.2
+    if names is not None:
+        template = editor.sql_delete_fk if kind == "foreign_key" \
+            else editor.sql_delete_index
+
+        return [editor._delete_constraint_sql(template, model, name)
+                for name in names]
+
+    if kind == "field":
+        return list(editor._field_indexes_sql(model, field))
+
+    return [editor._create_fk_sql(model, field,
+                                  "_fk_%(to_table)s_%(to_column)s")]
@@ -0,0 +1,187 @@
+'''
+The primary keys of existing rows
+
+Foreign keys of seeds point at existing rows of the related table, either
+in turn or at random. Loading every primary key of a table with millions of
+rows just to pick some of them costs as much memory as the column itself.
+ExistingKeys reads the keys of a table a chunk at a time when they are
+walked in order, and draws random keys between the lowest and the highest
+one, retrying on gaps, so that only the keys in use are ever held.
+'''
+
+import random
+
+from collections.abc import Sequence
+
+from django.db.models import Max, Min
+
+from .churn import select_pks
+
+# The number of keys sampled for the draws that need a list of keys
+POOL_SIZE = 100000
+
+# The fraction of the keys between the lowest and the highest that must
+# exist for random keys to be drawn between them
+MIN_DENSITY = 0.1
+
+# The number of keys looked up in a single query when drawing keys
+LOOKUP_SIZE = 900
+
+
+class ExistingKeys(Sequence):
+    '''
+    The primary keys of the rows of a queryset, in order, read lazily
+
+    The number of keys is counted once, so that rows inserted afterwards
+    (which have higher keys on an auto primary key) are left out.
+
+    Attributes
+    ----------
+
+    queryset : django.db.models.QuerySet
+        the rows whose keys are read
+
+    chunk_size : int
+        the number of keys read at a time
+
+
+    Methods
+    -------
+
+    sample(size) : list
+        draws random keys, with replacement
+
+    pool() : list
+        returns a random sample of at most POOL_SIZE keys, in order
+    '''
+
+    def __init__(self, queryset, chunk_size=10000):
+        '''
+        Parameters
+        ----------
+
+        queryset : django.db.models.QuerySet
+            the rows whose keys are read
+
+        chunk_size : int, optional
+            the number of keys read at a time (default is 10000)
+        '''
+
+        self.queryset = queryset
+        self.chunk_size = chunk_size
+
+        self._ordered = queryset.order_by("pk").values_list("pk", flat=True)
+        self._count = None
+        self._bounds = None
+        self._pool = None
+        self._chunk_start = 0
+        self._chunk = []
+
+    def __len__(self):
+        if self._count is None:
+            self._count = self.queryset.count()
+
+        return self._count
+
+    def __getitem__(self, index):
+        if not isinstance(index, int):
+            raise TypeError("Keys can only be read one index at a time")
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("Key index out of range")
+
+        offset = index - self._chunk_start
+        if not 0 <= offset < len(self._chunk):
+            self._read_chunk(index)
+            offset = 0
+
+        return self._chunk[offset]
+
+    def sample(self, size):
+        '''
+        Draws random keys, with replacement
+
+        Integer keys are drawn between the lowest and the highest key, and
+        the drawn keys that do not exist drawn again. Other keys, and keys
+        too sparse to be drawn between their bounds, are drawn from pool().
+
+        Parameters
+        ----------
+
+        size : int
+            the number of keys to draw
+
+
+        Returns
+        -------
+
+        list
+            the drawn keys
+        '''
+
+        low, high = self._get_bounds()
+        if not isinstance(low, int):
+            return random.choices(self.pool(), k=size)
+
+        span = high - low + 1
+        density = len(self) / span
+        if density >= 1:
+            return [random.randint(low, high) for i in range(size)]
+
+        if density < MIN_DENSITY:
+            return random.choices(self.pool(), k=size)
+
+        keys = []
+        while len(keys) < size:
+            missing = size - len(keys)
+            drawn = [random.randint(low, high)
+                     for i in range(int(missing / density) + 1)]
+
+            existing = set()
+            unique = list(set(drawn))
+            for start in range(0, len(unique), LOOKUP_SIZE):
+                existing.update(self.queryset.filter(
+                    pk__in=unique[start:start + LOOKUP_SIZE]
+                ).values_list("pk", flat=True))
+
+            keys.extend([key for key in drawn if key in existing][:missing])
+
+        return keys
+
+    def pool(self):
+        '''
+        Returns a random sample of at most POOL_SIZE keys, in order
+
+        Returns
+        -------
+
+        list
+            every key if there are at most POOL_SIZE, or a sample of them
+        '''
+
+        if self._pool is None:
+            self._pool = select_pks(self.queryset, POOL_SIZE,
+                                    chunk_size=self.chunk_size)
+
+        return self._pool
+
+    def _get_bounds(self):
+        if self._bounds is None:
+            bounds = self.queryset.aggregate(low=Min("pk"), high=Max("pk"))
+            self._bounds = (bounds["low"], bounds["high"])
+
+        return self._bounds
+
+    def _read_chunk(self, index):
+        # Walking the keys in order reads the next chunk from the last key
+        # read, and any other index from its offset
+        if index == self._chunk_start + len(self._chunk) and self._chunk:
+            chunk = self._ordered.filter(pk__gt=self._chunk[-1])
+        else:
+            chunk = self._ordered[index:]
+
+        self._chunk = list(chunk[:self.chunk_size])
+        self._chunk_start = index
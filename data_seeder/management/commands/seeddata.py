@@ -4,10 +4,22 @@ Adds the seeddata management command for Django manage.py
 
 import importlib
 
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
 from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
 from django.db.models import Model
 
+from ...checkpoint import Checkpoint, CheckpointError
+from ...churn import SELECTIONS
+from ...indexes import DeferredIndexError, DeferredIndexes
+from ...memory import MemoryReport
+from ...metrics import FORMATS, MetricsCollector
+from ...plan import PlanError, PlanStep, SeedPlan
+from ...registry import RegistryError, RunRegistry
+from ...snapshot import SnapshotCache, SnapshotError
 from ...base import DataSeeder
+from ...writers import WRITERS
 
 
 class Command(BaseCommand):
@@ -22,12 +34,26 @@ class Command(BaseCommand):
     ----------
     help : str
         the help text for this command
+
+    default_checkpoint : str
+        the checkpoint file used when --checkpoint or --resume are given
+        without a path
+
+    default_snapshot_cache : str
+        the snapshot directory used when --snapshot-cache is given without
+        a path
+
+    default_registry : str
+        the run registry used unless --registry is given
     '''
 
-    help = "Seeds random data into the supplied model(s)"
+    help = "Seeds random data into the supplied model(s) or app(s)"
+    default_checkpoint = "seeddata.checkpoint.json"
+    default_snapshot_cache = ".seeddata-snapshots"
+    default_registry = "seeddata.runs.json"
 
     def add_arguments(self, parser):
-        parser.add_argument('models', nargs='+', type=str)
+        parser.add_argument('models', nargs='*', type=str)
 
         # Optional arguments
         parser.add_argument(
@@ -35,31 +61,545 @@ class Command(BaseCommand):
             help='Specify the number of seeds to generate'
         )
 
+        parser.add_argument(
+            '--target-count',
+            type=int,
+            help='Only seed the rows missing to reach this number of rows'
+        )
+
+        parser.add_argument(
+            '--approximate-count',
+            action='store_true',
+            help='Allow --target-count to estimate the current number of rows'
+        )
+
         parser.add_argument(
             '--generate-related',
             action='store_true',
             help='Generate foreign key relations instead of using random model'
         )
 
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Specify the number of seeds committed per transaction'
+        )
+
+        parser.add_argument(
+            '--writer',
+            choices=sorted(WRITERS),
+            default='orm',
+            help='Write seeds through the ORM (default) or raw executemany'
+        )
+
+        parser.add_argument(
+            '--pipeline',
+            action='store_true',
+            help='Write batches from a separate thread while generating'
+        )
+
+        parser.add_argument(
+            '--preallocate-pks',
+            action='store_true',
+            help='Assign primary keys to seeds before writing them'
+        )
+
+        parser.add_argument(
+            '--compiled',
+            action='store_true',
+            help='Build model instances with a generated row factory'
+        )
+
+        parser.add_argument(
+            '--tune',
+            action='store_true',
+            help='Relax the durability settings of the database connection '
+                 'while seeding (i.e. synchronous=off on SQLite)'
+        )
+
+        parser.add_argument(
+            '--defer-indexes',
+            action='store_true',
+            help='Drop the secondary indexes and foreign key constraints of '
+                 'the seeded tables while seeding, then rebuild and analyze '
+                 'them'
+        )
+
+        parser.add_argument(
+            '--tree-field',
+            help='Seed a hierarchy through this foreign key to the model '
+                 'itself, with --seeds root nodes'
+        )
+
+        parser.add_argument(
+            '--depth',
+            type=int,
+            default=1,
+            help='Specify the number of levels of a hierarchy'
+        )
+
+        parser.add_argument(
+            '--branching',
+            type=int,
+            default=2,
+            help='Specify the number of children of every hierarchy node'
+        )
+
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Seed models with no relations between them concurrently, '
+                 'with up to this many workers'
+        )
+
+        parser.add_argument(
+            '--checkpoint',
+            nargs='?',
+            const=self.default_checkpoint,
+            help='Record progress to a checkpoint file after every batch'
+        )
+
+        parser.add_argument(
+            '--plan',
+            help='Seed the models described by a JSON or TOML plan file'
+        )
+
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Resume seeding from the last checkpoint'
+        )
+
+        parser.add_argument(
+            '--snapshot-cache',
+            nargs='?',
+            const=self.default_snapshot_cache,
+            help='Restore identical seeding runs from snapshots stored in '
+                 'this directory'
+        )
+
+        parser.add_argument(
+            '--snapshot-max-size',
+            type=int,
+            help='Specify the maximum size of the snapshot cache in MB'
+        )
+
+        parser.add_argument(
+            '--rate',
+            type=float,
+            help='Trickle seeds at this number of rows per second, for '
+                 '--duration seconds, instead of seeding --seeds at once'
+        )
+
+        parser.add_argument(
+            '--duration',
+            type=float,
+            help='Specify the number of seconds to trickle seeds for'
+        )
+
+        parser.add_argument(
+            '--update-fraction',
+            type=float,
+            help='Churn existing rows, regenerating the fields of this '
+                 'fraction of them instead of seeding new rows'
+        )
+
+        parser.add_argument(
+            '--delete-fraction',
+            type=float,
+            help='Churn existing rows, deleting this fraction of them '
+                 'instead of seeding new rows'
+        )
+
+        parser.add_argument(
+            '--churn-fields',
+            help='Specify a comma separated list of the fields to regenerate '
+                 'when churning (default is every field)'
+        )
+
+        parser.add_argument(
+            '--churn-selection',
+            choices=SELECTIONS,
+            default='sample',
+            help='Churn rows sampled from the whole table (default) or a '
+                 'contiguous range of primary keys'
+        )
+
+        parser.add_argument(
+            '--record',
+            action='store_true',
+            help='Record the primary keys seeded by this run to the run '
+                 'registry, so that they can be purged'
+        )
+
+        parser.add_argument(
+            '--registry',
+            default=self.default_registry,
+            help='The file runs are recorded to and purged from (default is '
+                 '%s)' % self.default_registry
+        )
+
+        parser.add_argument(
+            '--purge',
+            nargs='?',
+            const=True,
+            help='Delete the rows seeded by a recorded run, or by every '
+                 'recorded run if no run is given, instead of seeding'
+        )
+
+        parser.add_argument(
+            '--metrics',
+            help='Write seeding metrics to this file'
+        )
+
+        parser.add_argument(
+            '--metrics-format',
+            choices=FORMATS,
+            default='json',
+            help='Write metrics as JSON (default) or in the Prometheus text '
+                 'format'
+        )
+
+        parser.add_argument(
+            '--memory-report',
+            action='store_true',
+            help='Trace memory allocations while seeding (which slows it '
+                 'down) and report the peak memory of every phase'
+        )
+
     def handle(self, *args, **options):
+        if options["purge"] is not None:
+            return self._purge(options)
+
+        registry = self._get_registry(options)
+        metrics = MetricsCollector() if options["metrics"] else None
+        memory = MemoryReport() if options["memory_report"] else None
+        hooks = [hooks for hooks in (registry, metrics, memory)
+                 if hooks is not None]
+
+        if memory is not None:
+            memory.start()
+
+        try:
+            self._handle(options, hooks)
+
+        finally:
+            # Metrics of failed runs are written too, so they can be compared
+            if metrics is not None:
+                metrics.write(options["metrics"], options["metrics_format"])
+
+            if memory is not None:
+                memory.stop()
+                self.stdout.write('\nMemory report\n%s' % memory.report())
+
+            if registry is not None:
+                self._report_registry(registry)
+
+    def _handle(self, options, hooks):
+        checkpoint = self._get_checkpoint(options["checkpoint"],
+                                          options["resume"])
+        snapshots = self._get_snapshot_cache(options["snapshot_cache"],
+                                             options["snapshot_max_size"])
+
+        if options["plan"]:
+            if options["models"]:
+                raise CommandError("Models cannot be given with --plan")
+
+            return self._handle_plan(options["plan"], checkpoint,
+                                     options["workers"], snapshots,
+                                     options["compiled"], hooks,
+                                     options["defer_indexes"],
+                                     options["tune"])
+
+        if not options["models"]:
+            raise CommandError("At least one model or --plan is required")
+
         models = self._get_models(options["models"])
+
+        if options["rate"] is not None:
+            return self._trickle(models, options, checkpoint, hooks)
+
+        if options["update_fraction"] is not None or \
+                options["delete_fraction"] is not None:
+            return self._churn(models, options)
         seeds = int(options["seeds"]) if options["seeds"] else 1
         generate_related = options["generate_related"] \
             if options["generate_related"] else False
+        tree = {
+            "field": options["tree_field"],
+            "depth": options["depth"],
+            "branching": options["branching"]
+        } if options["tree_field"] else None
+
+        try:
+            plan = SeedPlan([
+                PlanStep(model, seeds=seeds,
+                         generate_related=generate_related, tree=tree,
+                         target_count=options["target_count"])
+                for model in models
+            ], batch_size=options["batch_size"], writer=options["writer"],
+                pipeline=options["pipeline"],
+                preallocate_pks=options["preallocate_pks"],
+                approximate_count=options["approximate_count"],
+                compiled=options["compiled"], hooks=hooks,
+                tuning=options["tune"])
+        except PlanError as e:
+            raise CommandError(str(e))
+
+        self._run_plan(plan, checkpoint, options["workers"], snapshots,
+                       options["defer_indexes"])
+
+    def _trickle(self, models, options, checkpoint, hooks):
+        if options["duration"] is None or options["rate"] <= 0:
+            raise CommandError("--rate must be positive and requires "
+                               "--duration")
+
+        if checkpoint is not None:
+            raise CommandError("--rate cannot be combined with a checkpoint")
+
+        for model in models:
+            self.stdout.write(self.style.WARNING(
+                '\nTrickling data for "%s" at %g rows/s for %gs...' %
+                (model.__name__, options["rate"], options["duration"])))
+
+            try:
+                seeder = DataSeeder(
+                    model,
+                    generate_related=options["generate_related"],
+                    writer=WRITERS.get(options["writer"]),
+                    preallocate_pks=options["preallocate_pks"],
+                    compiled=options["compiled"],
+                    hooks=hooks,
+                    tuning=options["tune"]
+                )
+                report = seeder.trickle(options["rate"], options["duration"],
+                                        batch_size=options["batch_size"])
+            except ValueError as e:
+                raise CommandError(str(e))
+            except DatabaseError as e:
+                raise CommandError('Seeding "%s" failed: %s' %
+                                   (model.__name__, e))
+
+            self.stdout.write(self.style.SUCCESS(report.summary()))
+
+    def _churn(self, models, options):
+        fields = options["churn_fields"].split(",") \
+            if options["churn_fields"] else None
 
         for model in models:
-            self.stdout.write(self.style.WARNING('\nSeeding data for "%s"...' %
-                                                 model.__name__))
+            self.stdout.write(self.style.WARNING(
+                '\nChurning data for "%s"...' % model.__name__))
+
+            try:
+                report = DataSeeder(
+                    model,
+                    batch_size=options["batch_size"],
+                    writer=WRITERS.get(options["writer"]),
+                    tuning=options["tune"]
+                ).churn(
+                    update=options["update_fraction"] or 0.0,
+                    delete=options["delete_fraction"] or 0.0,
+                    fields=fields,
+                    selection=options["churn_selection"]
+                )
+            except (ValueError, FieldDoesNotExist) as e:
+                raise CommandError(str(e))
+            except DatabaseError as e:
+                raise CommandError('Churning "%s" failed: %s' %
+                                   (model.__name__, e))
+
+            self.stdout.write(self.style.SUCCESS(report.summary()))
 
-            DataSeeder(model, seeds=seeds,
-                       generate_related=generate_related).seed()
+    def _purge(self, options):
+        run_id = None if options["purge"] is True else options["purge"]
 
-            self.stdout.write(self.style.SUCCESS('Seed(s) for "%s" complete' %
-                                                 model.__name__))
+        try:
+            registry = RunRegistry(options["registry"])
+            purged = registry.purge(run_id, batch_size=options["batch_size"]
+                                    or DataSeeder.batch_size)
+        except RegistryError as e:
+            raise CommandError(str(e))
+        except DatabaseError as e:
+            raise CommandError('Purging failed: %s' % e)
+
+        if not purged:
+            self.stdout.write(self.style.WARNING('\nNothing to purge'))
+
+        for label, rows, truncated in purged:
+            self.stdout.write(self.style.SUCCESS(
+                '%s "%s", %d row(s) deleted' %
+                ("Truncated" if truncated else "Purged", label, rows)))
+
+    def _report_registry(self, registry):
+        if registry.run_id in registry.runs:
+            self.stdout.write('\nRecorded run "%s" to %s' %
+                              (registry.run_id, registry.path))
+
+        for label, rows in registry.unrecorded.items():
+            self.stdout.write(self.style.WARNING(
+                '%d row(s) of "%s" could not be recorded, as their primary '
+                'keys are not known' % (rows, label)))
+
+    def _handle_plan(self, path, checkpoint, workers, snapshots=None,
+                     compiled=False, hooks=(), defer_indexes=False,
+                     tuning=False):
+        try:
+            plan = SeedPlan.load(path)
+        except PlanError as e:
+            raise CommandError(str(e))
+
+        plan.compiled = plan.compiled or compiled
+        plan.hooks = list(hooks)
+        plan.tuning = plan.tuning or tuning
+
+        self._run_plan(plan, checkpoint, workers, snapshots, defer_indexes)
+
+    def _run_plan(self, plan, checkpoint, workers, snapshots=None,
+                  defer_indexes=False):
+        if snapshots is not None and not snapshots.supports(plan):
+            self.stdout.write(self.style.WARNING(
+                '\nSnapshots are not supported on this database, '
+                'seeding without them'))
+            snapshots = None
+
+        if snapshots is not None and self._restore_snapshot(plan, snapshots):
+            return
+
+        # Snapshots copy whole tables, so rows that were there before
+        # seeding must not end up in one
+        if snapshots is not None and not snapshots.is_empty(plan):
+            self.stdout.write(self.style.WARNING(
+                '\nThe seeded tables already hold rows, seeding without '
+                'storing a snapshot'))
+            snapshots = None
+
+        if defer_indexes:
+            self._run_deferred(plan, checkpoint, workers)
+        else:
+            self._run_steps(plan, checkpoint, workers)
+
+        if snapshots is not None:
+            try:
+                snapshots.store(plan)
+            except SnapshotError as e:
+                raise CommandError(str(e))
+
+    def _run_steps(self, plan, checkpoint, workers):
+        try:
+            if workers > 1:
+                self._run_concurrently(plan, checkpoint, workers)
+            else:
+                for step in plan.steps:
+                    self._seed(step.model, lambda: plan.run_step(
+                        step, checkpoint=checkpoint))
+
+        except PlanError as e:
+            raise CommandError(str(e))
+
+    def _run_deferred(self, plan, checkpoint, workers):
+        indexes = DeferredIndexes(plan.models())
+
+        try:
+            with indexes:
+                self.stdout.write(self.style.WARNING(
+                    '\nDeferred %d index(es) and constraint(s) of %d '
+                    'table(s)' % (len(indexes.dropped), len(indexes.models))))
+
+                rebuilt = len(indexes.dropped)
+                self._run_steps(plan, checkpoint, workers)
+
+        except DeferredIndexError as e:
+            # Rebuilding failed after seeding did
+            if e.__cause__ is not None:
+                raise CommandError('%s, after seeding failed: %s' %
+                                   (e, e.__cause__))
+
+            raise CommandError(str(e))
+        except DatabaseError as e:
+            raise CommandError('Deferring indexes failed: %s' % e)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Rebuilt %d index(es) and constraint(s) in %.1fs' %
+            (rebuilt, indexes.elapsed)))
+
+    def _restore_snapshot(self, plan, snapshots):
+        try:
+            restored = snapshots.restore(plan)
+        except SnapshotError as e:
+            raise CommandError(str(e))
+
+        if restored:
+            self.stdout.write(self.style.SUCCESS(
+                '\nRestored seed(s) for %s from a snapshot' %
+                ", ".join(step.model.__name__ for step in plan.steps)))
+
+        return restored
+
+    def _run_concurrently(self, plan, checkpoint, workers):
+        self.stdout.write(self.style.WARNING(
+            '\nSeeding %d model(s) in %d independent group(s) with %d '
+            'worker(s)...' % (len(plan.steps), len(plan.components()),
+                              workers)))
+
+        try:
+            plan.run(checkpoint=checkpoint, workers=workers)
+        except DatabaseError as e:
+            raise CommandError('Seeding failed: %s' % e)
+
+        names = ", ".join(step.model.__name__ for step in plan.steps)
+        self.stdout.write(self.style.SUCCESS('Seed(s) for %s complete' %
+                                             names))
+
+    def _seed(self, model, seed):
+        self.stdout.write(self.style.WARNING('\nSeeding data for "%s"...' %
+                                             model.__name__))
+
+        try:
+            seed()
+        except DatabaseError as e:
+            raise CommandError('Seeding "%s" failed: %s' % (model.__name__, e))
+
+        self.stdout.write(self.style.SUCCESS('Seed(s) for "%s" complete' %
+                                             model.__name__))
+
+    def _get_checkpoint(self, path, resume):
+        if path is None and not resume:
+            return None
+
+        try:
+            return Checkpoint(path or self.default_checkpoint, resume=resume)
+
+        except CheckpointError as e:
+            raise CommandError(str(e))
+
+    def _get_registry(self, options):
+        if not options["record"]:
+            return None
+
+        try:
+            return RunRegistry(options["registry"])
+
+        except RegistryError as e:
+            raise CommandError(str(e))
+
+    def _get_snapshot_cache(self, directory, max_size):
+        if directory is None:
+            return None
+
+        if max_size is not None:
+            max_size *= 1024 ** 2
+
+        return SnapshotCache(directory, max_size=max_size)
 
     def _get_models(self, model_paths):
         models = []
         for module_name in model_paths:
+            # An app label (or app_label.*) seeds every model of the app
+            if "." not in module_name or module_name.endswith(".*"):
+                models.extend(self._get_app_models(module_name))
+                continue
+
             try:
                 # Get the model name from the module
                 module_parts = module_name.split(".")
@@ -81,3 +621,12 @@ class Command(BaseCommand):
                 raise CommandError('Class "%s" does not exist' % module_name)
 
         return models
+
+    def _get_app_models(self, app_label):
+        if app_label.endswith(".*"):
+            app_label = app_label[:-2]
+
+        try:
+            return list(apps.get_app_config(app_label).get_models())
+        except LookupError:
+            raise CommandError('App "%s" does not exist' % app_label)
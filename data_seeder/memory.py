@@ -0,0 +1,272 @@
+'''
+Memory accounting for seeding runs
+
+MemoryReport is a set of hooks tracing memory allocations with tracemalloc
+while seeding. The traced peak is reset at the end of every phase, so the
+peak recorded for a phase is the highest traced memory since the previous
+phase ended: generating a batch, building its model instances and writing
+it, in turn. Pipelined seeders generate and write at the same time, so their
+phases overlap.
+
+Along with the traced peaks, the peak resident set size of the process is
+read after every batch, and a tracemalloc snapshot is kept of the point at
+which the most memory was traced, from which the top allocation sites are
+reported.
+'''
+
+import linecache
+import sys
+import threading
+import tracemalloc
+
+from .hooks import SeedHooks
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Frames of these files are left out of the allocation sites
+IGNORED_FILES = ("<frozen importlib._bootstrap>",
+                 "<frozen importlib._bootstrap_external>",
+                 "<unknown>", tracemalloc.__file__, linecache.__file__)
+
+# A new snapshot is only taken once the traced memory grows this much past
+# the last one, so that steadily growing runs are not snapshot every batch
+SNAPSHOT_GROWTH = 1.1
+
+
+class MemoryReport(SeedHooks):
+    '''
+    Hooks tracing the memory used by every model and phase of seeding
+
+    Attributes
+    ----------
+
+    frames : int
+        the number of frames tracemalloc stores for every allocation
+
+    top : int
+        the number of allocation sites reported
+
+    batches : list
+        a list of dictionaries describing the memory of every batch: its
+        model, rows, the peak traced memory of its generate, build and write
+        phases in bytes and the peak resident set size once written
+
+
+    Methods
+    -------
+
+    start()
+        starts tracing allocations
+
+    stop()
+        stops tracing allocations
+
+    peak_rss() : int
+        returns the peak resident set size of the process in bytes
+
+    top_allocations() : list
+        returns the allocation sites holding the most memory at the peak
+
+    report() : str
+        returns a summary of the traced memory
+    '''
+
+    def __init__(self, frames=1, top=10):
+        '''
+        Parameters
+        ----------
+
+        frames : int, optional
+            the number of frames tracemalloc stores for every allocation
+            (default is 1)
+
+        top : int, optional
+            the number of allocation sites reported (default is 10)
+        '''
+
+        self.frames = frames
+        self.top = top
+        self.batches = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._pending = {}
+        self._peak = 0
+        self._snapshot = None
+
+    def start(self):
+        '''
+        Starts tracing allocations, unless they are already traced
+        '''
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started = True
+
+        _reset_peak()
+
+    def stop(self):
+        '''
+        Stops tracing allocations, if they were traced by start()
+        '''
+
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def peak_rss(self):
+        '''
+        Returns the peak resident set size of the process
+
+        Returns
+        -------
+
+        int
+            the peak resident set size in bytes, or None where it cannot be
+            read
+        '''
+
+        if resource is None:
+            return None
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # Linux reports kilobytes, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    def on_batch_generated(self, seeder, batch, rows, nbytes, elapsed_ns):
+        self._pending[id(batch)] = {
+            "model": seeder.model._meta.label,
+            "rows": rows,
+            "generate": self._phase_peak()
+        }
+
+    def on_batch_built(self, seeder, batch, rows, nbytes, elapsed_ns):
+        self._pending.get(id(batch), {})["build"] = self._phase_peak()
+
+    def on_batch_flushed(self, seeder, batch, rows, nbytes, elapsed_ns):
+        record = self._pending.pop(id(batch), None) or {
+            "model": seeder.model._meta.label,
+            "rows": rows
+        }
+        record.setdefault("generate", None)
+        record.setdefault("build", None)
+        record["write"] = self._phase_peak()
+        record["rss"] = self.peak_rss()
+
+        with self._lock:
+            self.batches.append(record)
+
+    def top_allocations(self):
+        '''
+        Returns the allocation sites holding the most memory at the peak
+
+        Returns
+        -------
+
+        list
+            a list of tracemalloc.Statistic objects, largest first, taken
+            from the point at which the most memory was traced
+        '''
+
+        if self._snapshot is None:
+            return []
+
+        snapshot = self._snapshot.filter_traces([
+            tracemalloc.Filter(False, filename)
+            for filename in IGNORED_FILES
+        ])
+
+        return snapshot.statistics("lineno")[:self.top]
+
+    def report(self):
+        '''
+        Returns a summary of the traced memory
+
+        Returns
+        -------
+
+        str
+            the peak resident set size, the peak traced memory of every
+            phase per model, and the top allocation sites
+        '''
+
+        lines = []
+        rss = self.peak_rss()
+        if rss is not None:
+            lines.append("Peak RSS: %s" % _format_size(rss))
+
+        with self._lock:
+            batches = list(self.batches)
+
+        models = []
+        for record in batches:
+            if record["model"] not in models:
+                models.append(record["model"])
+
+        for model in models:
+            records = [record for record in batches
+                       if record["model"] == model]
+            lines.append("%s: %d batch(es), %d row(s)" % (
+                model, len(records), sum(record["rows"] for record in records)
+            ))
+
+            for phase in ("generate", "build", "write"):
+                peaks = [record[phase] for record in records
+                         if record[phase] is not None]
+                if peaks:
+                    lines.append("  %-8s peak %s, mean %s" % (
+                        phase, _format_size(max(peaks)),
+                        _format_size(sum(peaks) // len(peaks))
+                    ))
+
+        statistics = self.top_allocations()
+        if statistics:
+            lines.append("Top allocation sites at peak (%s traced):" %
+                         _format_size(self._peak))
+
+            for statistic in statistics:
+                frame = statistic.traceback[0]
+                lines.append("  %s:%d: %s in %d block(s)" % (
+                    frame.filename, frame.lineno,
+                    _format_size(statistic.size), statistic.count
+                ))
+
+        return "\n".join(lines)
+
+    def _phase_peak(self):
+        # The peak since the last phase ended, after which the next phase
+        # starts from the current traced memory
+        if not tracemalloc.is_tracing():
+            return None
+
+        current, peak = tracemalloc.get_traced_memory()
+        _reset_peak()
+
+        # Allocation sites are snapshot when the most memory is held at the
+        # end of a phase, which is cheaper than a snapshot per phase
+        with self._lock:
+            if current > self._peak * SNAPSHOT_GROWTH:
+                self._peak = current
+                self._snapshot = tracemalloc.take_snapshot()
+
+        return peak
+
+
+def _reset_peak():
+    # Before Python 3.9 peaks cannot be reset, so they are the peak so far
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+
+
+def _format_size(size):
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return "%d%s" % (size, unit) if unit == "B" \
+                else "%.1f%s" % (size, unit)
+
+        size /= 1024
+
+    return "%.1fGiB" % size
@@ -0,0 +1,374 @@
+'''
+Seeding metrics
+
+MetricsCollector is a set of hooks aggregating the timings, row counts and
+byte estimates of every seeding phase (compiling the field plan, generating
+batches, building their instances and flushing them to the database) per
+model, into histograms that can be dumped as JSON or in the Prometheus text
+exposition format.
+'''
+
+import bisect
+import json
+import threading
+
+from .hooks import SeedHooks
+
+# The upper bounds of the duration histograms, in seconds
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0,
+                   5.0, 10.0, 30.0, 60.0)
+
+FORMATS = ("json", "prometheus")
+
+PHASES = ("compile", "generate", "build", "flush")
+
+
+class Histogram:
+    '''
+    The durations, rows and bytes of every occurrence of a seeding phase
+
+    Attributes
+    ----------
+
+    buckets : tuple
+        the upper bounds of the buckets, in nanoseconds
+
+    counts : list
+        the number of durations falling in every bucket, followed by the
+        number of longer durations
+
+    count : int
+        the number of occurrences
+
+    rows : int
+        the total number of rows
+
+    nbytes : int
+        the total estimated size of the rows
+
+    sum_ns : int
+        the total duration
+
+    min_ns : int
+        the shortest duration, or None
+
+    max_ns : int
+        the longest duration, or None
+
+
+    Methods
+    -------
+
+    observe(elapsed_ns, rows, nbytes)
+        records an occurrence of the phase
+
+    cumulative() : list
+        returns the number of durations up to every bucket
+    '''
+
+    def __init__(self, buckets):
+        '''
+        Parameters
+        ----------
+
+        buckets : tuple
+            the upper bounds of the buckets, in nanoseconds
+        '''
+
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.rows = 0
+        self.nbytes = 0
+        self.sum_ns = 0
+        self.min_ns = None
+        self.max_ns = None
+
+    def observe(self, elapsed_ns, rows, nbytes):
+        '''
+        Records an occurrence of the phase
+
+        Parameters
+        ----------
+
+        elapsed_ns : int
+            the duration of the occurrence
+
+        rows : int
+            the number of rows involved
+
+        nbytes : int
+            the estimated size of the rows
+        '''
+
+        self.counts[bisect.bisect_left(self.buckets, elapsed_ns)] += 1
+        self.count += 1
+        self.rows += rows
+        self.nbytes += nbytes
+        self.sum_ns += elapsed_ns
+
+        if self.min_ns is None or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+
+        if self.max_ns is None or elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def cumulative(self):
+        '''
+        Returns the number of durations up to every bucket
+
+        Returns
+        -------
+
+        list
+            the cumulative counts of every bucket, the last being the count
+            of every duration
+        '''
+
+        counts = []
+        total = 0
+        for count in self.counts:
+            total += count
+            counts.append(total)
+
+        return counts
+
+
+class MetricsCollector(SeedHooks):
+    '''
+    Hooks aggregating metrics for every model and phase of seeding
+
+    Collectors are thread safe, so a single collector can be shared by
+    pipelined seeders and by the workers of a plan.
+
+    Attributes
+    ----------
+
+    buckets : tuple
+        the upper bounds of the duration histograms, in seconds
+
+
+    Methods
+    -------
+
+    to_dict() : dict
+        returns the collected metrics as a JSON serializable dictionary
+
+    to_json() : str
+        returns the collected metrics as JSON
+
+    to_prometheus() : str
+        returns the collected metrics in the Prometheus text format
+
+    write(path, format)
+        writes the collected metrics to a file
+
+    reset()
+        discards the collected metrics
+    '''
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        '''
+        Parameters
+        ----------
+
+        buckets : tuple, optional
+            the increasing upper bounds of the duration histograms, in
+            seconds (default is DEFAULT_BUCKETS)
+        '''
+
+        self.buckets = tuple(buckets)
+        self._buckets_ns = tuple(int(bound * 1e9) for bound in self.buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def on_plan_compiled(self, seeder, rows, fields, elapsed_ns):
+        self._observe(seeder, "compile", elapsed_ns, 0, 0)
+
+    def on_batch_generated(self, seeder, batch, rows, nbytes, elapsed_ns):
+        self._observe(seeder, "generate", elapsed_ns, rows, nbytes)
+
+    def on_batch_built(self, seeder, batch, rows, nbytes, elapsed_ns):
+        self._observe(seeder, "build", elapsed_ns, rows, nbytes)
+
+    def on_batch_flushed(self, seeder, batch, rows, nbytes, elapsed_ns):
+        self._observe(seeder, "flush", elapsed_ns, rows, nbytes)
+
+    def on_error(self, seeder, error, rows, elapsed_ns):
+        label = seeder.model._meta.label
+        with self._lock:
+            self._errors[label] = self._errors.get(label, 0) + 1
+
+    def reset(self):
+        '''
+        Discards the collected metrics
+        '''
+
+        with self._lock:
+            self._histograms = {}
+            self._errors = {}
+
+    def to_dict(self):
+        '''
+        Returns the collected metrics
+
+        Returns
+        -------
+
+        dict
+            a dictionary mapping model labels to their number of errors and
+            the histogram of every phase, with durations in nanoseconds and
+            the throughput of the phase in rows per second
+        '''
+
+        with self._lock:
+            metrics = {}
+            for label in sorted(set(self._errors) | {
+                label for label, phase in self._histograms
+            }):
+                metrics[label] = {
+                    "errors": self._errors.get(label, 0),
+                    "phases": {}
+                }
+
+            for (label, phase), histogram in self._histograms.items():
+                bounds = list(self.buckets) + ["+Inf"]
+                metrics[label]["phases"][phase] = {
+                    "count": histogram.count,
+                    "rows": histogram.rows,
+                    "bytes": histogram.nbytes,
+                    "sum_ns": histogram.sum_ns,
+                    "min_ns": histogram.min_ns,
+                    "max_ns": histogram.max_ns,
+                    "rows_per_second": histogram.rows * 1e9 /
+                    histogram.sum_ns if histogram.sum_ns else None,
+                    "buckets": [
+                        [bound, count] for bound, count in
+                        zip(bounds, histogram.cumulative())
+                    ]
+                }
+
+            return {"models": metrics}
+
+    def to_json(self, indent=None):
+        '''
+        Returns the collected metrics as JSON
+
+        Parameters
+        ----------
+
+        indent : int, optional
+            the indentation of the JSON document (default is None)
+
+
+        Returns
+        -------
+
+        str
+            the JSON document of to_dict()
+        '''
+
+        return json.dumps(self.to_dict(), indent=indent, sort_keys=True)
+
+    def to_prometheus(self):
+        '''
+        Returns the collected metrics in the Prometheus text format
+
+        Returns
+        -------
+
+        str
+            a data_seeder_phase_duration_seconds histogram, and
+            data_seeder_rows_total, data_seeder_bytes_total and
+            data_seeder_errors_total counters, labelled by model and phase
+        '''
+
+        with self._lock:
+            histograms = sorted(self._histograms.items(),
+                                key=lambda item: (item[0][0],
+                                                  PHASES.index(item[0][1])))
+            errors = sorted(self._errors.items())
+
+            lines = [
+                "# HELP data_seeder_phase_duration_seconds The duration of "
+                "every seeding phase",
+                "# TYPE data_seeder_phase_duration_seconds histogram"
+            ]
+            for (label, phase), histogram in histograms:
+                labels = _labels(model=label, phase=phase)
+                bounds = ["%g" % bound for bound in self.buckets] + ["+Inf"]
+                for bound, count in zip(bounds, histogram.cumulative()):
+                    lines.append(
+                        "data_seeder_phase_duration_seconds_bucket{%s,"
+                        "le=\"%s\"} %d" % (labels, bound, count)
+                    )
+
+                lines.append("data_seeder_phase_duration_seconds_sum{%s} %r"
+                             % (labels, histogram.sum_ns / 1e9))
+                lines.append("data_seeder_phase_duration_seconds_count{%s} %d"
+                             % (labels, histogram.count))
+
+            for name, attribute, description in [
+                ("rows", "rows", "The number of rows in every seeding phase"),
+                ("bytes", "nbytes",
+                 "The estimated size of the rows in every seeding phase")
+            ]:
+                lines.append("# HELP data_seeder_%s_total %s" %
+                             (name, description))
+                lines.append("# TYPE data_seeder_%s_total counter" % name)
+                for (label, phase), histogram in histograms:
+                    if phase != "compile":
+                        lines.append("data_seeder_%s_total{%s} %d" % (
+                            name, _labels(model=label, phase=phase),
+                            getattr(histogram, attribute)
+                        ))
+
+            lines.append("# HELP data_seeder_errors_total The number of "
+                         "failed seeders")
+            lines.append("# TYPE data_seeder_errors_total counter")
+            for label, count in errors:
+                lines.append("data_seeder_errors_total{%s} %d" %
+                             (_labels(model=label), count))
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path, format="json"):
+        '''
+        Writes the collected metrics to a file
+
+        Parameters
+        ----------
+
+        path : str
+            the path of the file to write
+
+        format : str, optional
+            json or prometheus (default is json)
+        '''
+
+        if format not in FORMATS:
+            raise ValueError('Unknown metrics format "%s"' % format)
+
+        content = self.to_prometheus() if format == "prometheus" \
+            else self.to_json(indent=2)
+
+        with open(path, "w") as metrics_file:
+            metrics_file.write(content)
+
+    def _observe(self, seeder, phase, elapsed_ns, rows, nbytes):
+        key = (seeder.model._meta.label, phase)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = \
+                    Histogram(self._buckets_ns)
+
+            histogram.observe(elapsed_ns, rows, nbytes)
+
+
+def _labels(**labels):
+    return ",".join(
+        '%s="%s"' % (name, value.replace("\\", "\\\\").replace('"', '\\"')
+                     .replace("\n", "\\n"))
+        for name, value in sorted(labels.items())
+    )
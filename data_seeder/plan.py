@@ -0,0 +1,833 @@
+'''
+Declarative seeding plans
+
+A plan describes, in a single JSON (or TOML) file, every model to seed
+along with per model seed counts, static field values and relation ratios.
+The plan is compiled once and then run in dependency order, so that the
+primary keys seeded for a parent model can be handed straight to the models
+that reference it. Models referencing each other are ordered by leaving the
+nullable foreign keys of one of them empty while it is seeded, and filling
+them once the model they reference has been seeded.
+
+An example plan::
+
+    {
+        "random_seed": 42,
+        "batch_size": 5000,
+        "models": [
+            {"model": "shop.Customer", "seeds": 1000},
+            {"model": "shop.Order", "relations": {"customer": 10},
+             "field_options": {"total": {"distribution": "lognormal"}}},
+            {"model": "shop.Coupon", "seeds": 50, "values": {"active": true},
+             "generators": {"code": "shop.seeding.coupon_codes",
+                            "title": {"class": "SentenceGenerator",
+                                      "max_words": 4}}},
+            {"model": "shop.Category", "seeds": 10,
+             "tree": {"field": "parent", "depth": 3, "branching": 5}}
+        ]
+    }
+'''
+
+import contextlib
+import json
+import random
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, router, transaction
+from django.utils.module_loading import import_string
+
+from .base import DataSeeder
+from .batch import ColumnarBatch
+from .generators import AbstractGenerator
+from .keys import ExistingKeys
+from .tuning import tuned_database
+from .writers import WRITERS
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+
+class PlanError(Exception):
+    '''
+    Raised when a plan cannot be loaded or compiled
+    '''
+
+    pass
+
+
+class PlanStep:
+    '''
+    A single model to seed as part of a plan
+
+    Attributes
+    ----------
+
+    model : type
+        a subclass of django.db.models.Model to seed
+
+    seeds : int
+        the number of seeds to generate, or None to derive the number from
+        the relation ratios
+
+    values : dict
+        a dictionary of static values to use instead of random generators
+
+    relations : dict
+        a dictionary mapping foreign key field names to the number of seeds
+        to generate for every row of the related model. Ratios may be
+        fractional, the total number of seeds being rounded to the nearest
+        integer
+
+    generate_related : bool
+        whether or not to follow and generate foreign relations recursively
+
+    batch_size : int
+        the number of seeds committed together in a single transaction
+
+    writer : str
+        the name of the writer used to write the seeds (i.e. orm or raw)
+
+    tree : dict
+        the field, depth and branching of a hierarchy to seed, if any
+
+    target_count : int
+        the number of rows the model's table should hold once seeded, if
+        only the missing rows should be seeded
+
+    field_options : dict
+        a dictionary mapping field names to the distribution their values
+        are drawn from
+
+    generators : dict
+        a dictionary mapping field names to the generator or callable that
+        generates their values, by name (a class of data_seeder.generators
+        or a dotted path), optionally with the keyword arguments of a
+        generator class (i.e. {"class": "SentenceGenerator",
+        "max_words": 6})
+
+    deferred : set
+        the names of the nullable foreign keys left empty while the step is
+        seeded, to break a dependency cycle, and filled once the models
+        they reference are seeded
+    '''
+
+    def __init__(self, model, seeds=None, values=None, relations=None,
+                 generate_related=False, batch_size=None, writer=None,
+                 tree=None, target_count=None, field_options=None,
+                 generators=None):
+        if writer is not None and writer not in WRITERS:
+            raise PlanError('Unknown writer "%s"' % writer)
+
+        label = model._meta.label
+        _check_number(seeds, 'The seeds of "%s"' % label)
+        _check_number(target_count, 'The target_count of "%s"' % label)
+        _check_number(batch_size, 'The batch_size of "%s"' % label)
+        for field_name, ratio in (relations or {}).items():
+            _check_number(ratio, 'The ratio of "%s.%s"' % (label, field_name),
+                          integer=False)
+
+        self.model = model
+        self.seeds = seeds
+        self.values = values or {}
+        self.relations = relations or {}
+        self.generate_related = generate_related
+        self.batch_size = batch_size
+        self.writer = writer
+        self.tree = tree or {}
+        self.target_count = target_count
+        self.field_options = field_options or {}
+        self.generators = generators or {}
+        self.generator_values = {
+            field_name: self._load_generator(field_name, spec)
+            for field_name, spec in self.generators.items()
+        }
+        self.deferred = set()
+
+    def dependencies(self, include_deferred=False):
+        '''
+        Returns the models this step's model references through foreign keys
+
+        Parameters
+        ----------
+
+        include_deferred : bool, optional
+            whether to include the models referenced through deferred
+            foreign keys (default is False)
+
+
+        Returns
+        -------
+
+        set
+            a set of model types
+        '''
+
+        return {
+            field.related_model for field in self.model._meta.fields
+            if field.many_to_one and field.related_model != self.model and
+            (include_deferred or field.name not in self.deferred)
+        }
+
+    def deferrable(self, models):
+        '''
+        Returns the foreign keys that could be deferred to break a cycle
+
+        Parameters
+        ----------
+
+        models : set
+            the models not seeded yet
+
+
+        Returns
+        -------
+
+        list
+            the names of the foreign keys to the given models, or None if
+            one of them is not nullable or is given a relation or a value
+        '''
+
+        names = []
+        for field in self.model._meta.fields:
+            if not field.many_to_one or field.related_model == self.model or \
+                    field.related_model not in models or \
+                    field.name in self.deferred:
+                continue
+
+            if not field.null or field.name in self.relations or \
+                    field.name in self.values or \
+                    field.name in self.generators:
+                return None
+
+            names.append(field.name)
+
+        return names
+
+    def _load_generator(self, field_name, spec):
+        options = dict(spec) if isinstance(spec, dict) else {"class": spec}
+        path = options.pop("class", None)
+        if not isinstance(path, str):
+            raise PlanError('The generator of "%s" must name a class or '
+                            'callable' % field_name)
+
+        # Bare names refer to the bundled generators
+        if "." not in path:
+            path = "data_seeder.generators.%s" % path
+
+        try:
+            target = import_string(path)
+        except ImportError as e:
+            raise PlanError(str(e))
+
+        if isinstance(target, type) and issubclass(target, AbstractGenerator):
+            try:
+                return target(**options)
+            except (TypeError, ValueError) as e:
+                raise PlanError('Invalid generator for "%s": %s' %
+                                (field_name, e))
+
+        if options or not callable(target):
+            raise PlanError('"%s" is not a generator class' % path)
+
+        return target
+
+
+class SeedPlan:
+    '''
+    A compiled seeding plan
+
+    Attributes
+    ----------
+
+    steps : list
+        a list of PlanStep objects in dependency order
+
+    random_seed : object
+        a value to seed the random number generator with before running, or
+        None to leave the random number generator untouched
+
+    batch_size : int
+        the default number of seeds committed in a single transaction
+
+    writer : str
+        the name of the default writer used to write seeds
+
+    pipeline : bool
+        whether every step writes batches from a separate writer thread
+
+    preallocate_pks : bool
+        whether every step assigns primary keys before writing its seeds
+
+    approximate_count : bool
+        whether steps with a target_count may estimate the current number of
+        rows
+
+    compiled : bool
+        whether every step builds instances with a compiled row factory
+
+    hooks : list
+        the data_seeder.hooks.SeedHooks objects observing every step
+
+    tuning : bool
+        whether every step relaxes the session settings of its connection
+        while seeding
+
+
+    Methods
+    -------
+
+    load(path) : SeedPlan
+        loads and compiles a plan from a JSON or TOML file
+
+    from_dict(spec) : SeedPlan
+        compiles a plan from a dictionary
+
+    components() : list
+        splits the plan into plans with no foreign keys between them
+
+    models() : list
+        returns every model the plan writes to, in dependency order
+
+    describe() : dict
+        returns a JSON serializable description of the plan
+
+    run(checkpoint, workers)
+        seeds every step of the plan
+
+    run_step(step, checkpoint) : list
+        seeds a single step of the plan and returns the primary keys of its
+        seeds
+    '''
+
+    def __init__(self, steps, random_seed=None, batch_size=None,
+                 writer=None, pipeline=False, preallocate_pks=False,
+                 approximate_count=False, compiled=False, hooks=(),
+                 tuning=False):
+        '''
+        Parameters
+        ----------
+
+        steps : list
+            a list of PlanStep objects, in any order
+
+        random_seed : object, optional
+            a value to seed the random number generator with before running
+            (default is None)
+
+        batch_size : int, optional
+            the default number of seeds committed in a single transaction
+            (default is DataSeeder.batch_size)
+
+        writer : str, optional
+            the name of the default writer used to write seeds, orm or raw
+            (default is orm)
+
+        pipeline : bool, optional
+            whether every step writes batches from a separate writer thread
+            while the next batch is generated (default is False)
+
+        preallocate_pks : bool, optional
+            whether every step assigns primary keys before writing its seeds,
+            so that the keys are known even with the raw writer
+            (default is False)
+
+        approximate_count : bool, optional
+            whether steps with a target_count may estimate the current
+            number of rows on Postgres (default is False)
+
+        compiled : bool, optional
+            whether every step builds model instances with a compiled row
+            factory rather than through Model.__init__ (default is False)
+
+        hooks : iterable, optional
+            data_seeder.hooks.SeedHooks objects observing the seeder of
+            every step (default is ())
+
+        tuning : bool, optional
+            whether every step relaxes the session settings of its
+            connection with the tuning profile of its database vendor while
+            seeding (default is False)
+        '''
+
+        if writer is not None and writer not in WRITERS:
+            raise PlanError('Unknown writer "%s"' % writer)
+
+        self.steps = self._order(steps)
+        self.random_seed = random_seed
+        self.batch_size = batch_size
+        self.writer = writer
+        self.pipeline = pipeline
+        self.preallocate_pks = preallocate_pks
+        self.approximate_count = approximate_count
+        self.compiled = compiled
+        self.hooks = list(hooks)
+        self.tuning = tuning
+        self._pks = {}
+        self._started = False
+
+    @classmethod
+    def load(cls, path):
+        '''
+        Loads and compiles a plan from a file
+
+        Files ending in .toml are read as TOML, everything else as JSON.
+
+        Parameters
+        ----------
+
+        path : str
+            the path of the plan file
+
+
+        Returns
+        -------
+
+        SeedPlan
+            the compiled plan
+        '''
+
+        try:
+            if path.endswith(".toml"):
+                if tomllib is None:
+                    raise PlanError("TOML plans require Python 3.11+")
+
+                with open(path, "rb") as plan_file:
+                    spec = tomllib.load(plan_file)
+
+            else:
+                with open(path) as plan_file:
+                    spec = json.load(plan_file)
+
+        except FileNotFoundError:
+            raise PlanError('Plan "%s" does not exist' % path)
+
+        except ValueError as e:
+            raise PlanError('Plan "%s" is not valid: %s' % (path, e))
+
+        return cls.from_dict(spec)
+
+    @classmethod
+    def from_dict(cls, spec):
+        '''
+        Compiles a plan from a dictionary
+
+        Parameters
+        ----------
+
+        spec : dict
+            the plan specification
+
+
+        Returns
+        -------
+
+        SeedPlan
+            the compiled plan
+        '''
+
+        steps = []
+        for step_spec in spec.get("models", []):
+            step_spec = dict(step_spec)
+
+            try:
+                model = apps.get_model(step_spec.pop("model"))
+            except KeyError:
+                raise PlanError("Every plan step must name a model")
+            except (LookupError, ValueError) as e:
+                raise PlanError(str(e))
+
+            try:
+                steps.append(PlanStep(model, **step_spec))
+            except TypeError as e:
+                raise PlanError('Invalid step for "%s": %s' %
+                                (model._meta.label, e))
+
+        return cls(steps, random_seed=spec.get("random_seed"),
+                   batch_size=spec.get("batch_size"),
+                   writer=spec.get("writer"),
+                   pipeline=spec.get("pipeline", False),
+                   preallocate_pks=spec.get("preallocate_pks", False),
+                   approximate_count=spec.get("approximate_count", False),
+                   compiled=spec.get("compiled", False),
+                   tuning=spec.get("tuning", False))
+
+    def components(self):
+        '''
+        Splits the plan into independent plans
+
+        Two steps belong to the same component when one of their models
+        references the other, directly or through other steps of the plan.
+        Components share no foreign keys, so they can be seeded in any order
+        or at the same time. They do not seed the random number generator
+        themselves.
+
+        Returns
+        -------
+
+        list
+            a list of SeedPlan objects, one per component
+        '''
+
+        roots = {step.model: step.model for step in self.steps}
+
+        def find(model):
+            while roots[model] != model:
+                model = roots[model]
+
+            return model
+
+        for step in self.steps:
+            for dependency in step.dependencies(include_deferred=True):
+                if dependency in roots:
+                    roots[find(dependency)] = find(step.model)
+
+        groups = {}
+        for step in self.steps:
+            groups.setdefault(find(step.model), []).append(step)
+
+        return [
+            SeedPlan(steps, batch_size=self.batch_size, writer=self.writer,
+                     pipeline=self.pipeline,
+                     preallocate_pks=self.preallocate_pks,
+                     approximate_count=self.approximate_count,
+                     compiled=self.compiled, hooks=self.hooks,
+                     tuning=self.tuning)
+            for steps in groups.values()
+        ]
+
+    def models(self):
+        '''
+        Returns every model the plan writes to
+
+        Steps that generate their related seeds also write to the models
+        they reference, recursively.
+
+        Returns
+        -------
+
+        list
+            a list of model types, every model after the models it references
+        '''
+
+        models = []
+
+        def add(model, follow):
+            if model in models:
+                return
+
+            if follow:
+                for field in model._meta.fields:
+                    if field.many_to_one and field.related_model != model:
+                        add(field.related_model, follow)
+
+            models.append(model)
+
+        for step in self.steps:
+            add(step.model, step.generate_related)
+
+        return models
+
+    def describe(self):
+        '''
+        Returns a description of the plan
+
+        Two plans with the same description seed the same rows into the same
+        empty tables.
+
+        Returns
+        -------
+
+        dict
+            a JSON serializable dictionary of the plan's options and steps
+        '''
+
+        return {
+            "random_seed": self.random_seed,
+            "batch_size": self.batch_size,
+            "writer": self.writer,
+            "preallocate_pks": self.preallocate_pks,
+            "models": [
+                {
+                    "model": step.model._meta.label,
+                    "seeds": step.seeds,
+                    "values": {
+                        name: self._describe_value(value)
+                        for name, value in step.values.items()
+                    },
+                    "generators": step.generators,
+                    "relations": step.relations,
+                    "generate_related": step.generate_related,
+                    "batch_size": step.batch_size,
+                    "writer": step.writer,
+                    "tree": step.tree,
+                    "target_count": step.target_count,
+                    "field_options": step.field_options
+                }
+                for step in self.steps
+            ]
+        }
+
+    def _describe_value(self, value):
+        # Describe generators and callables by what they are rather than by
+        # their address, which changes from one run to the next
+        if isinstance(value, AbstractGenerator):
+            return {
+                "generator": type(value).__qualname__,
+                "options": {
+                    name: option for name, option in vars(value).items()
+                    if not name.startswith("_")
+                }
+            }
+
+        if callable(value) and not isinstance(value, type):
+            return "%s.%s" % (value.__module__, value.__qualname__)
+
+        return getattr(value, "pk", value)
+
+    def run(self, checkpoint=None, workers=1):
+        '''
+        Seeds every step of the plan in dependency order
+
+        With more than one worker, every independent component of the plan
+        is seeded by its own worker thread over its own database connection.
+        Seeding with a random_seed is only reproducible with a single worker.
+
+        Parameters
+        ----------
+
+        checkpoint : data_seeder.checkpoint.Checkpoint, optional
+            a checkpoint to record progress to (default is None)
+
+        workers : int, optional
+            the maximum number of components seeded at the same time
+            (default is 1)
+        '''
+
+        if workers <= 1:
+            for step in self.steps:
+                self.run_step(step, checkpoint=checkpoint)
+
+            return
+
+        if self.random_seed is not None:
+            random.seed(self.random_seed)
+
+        # Database settings are applied before any worker opens its
+        # connection, and reverted once they have all been closed
+        with contextlib.ExitStack() as stack:
+            for using in sorted({router.db_for_write(model)
+                                 for model in self.models()}):
+                stack.enter_context(tuned_database(using, self.tuning))
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(self._run_component, component,
+                                    checkpoint)
+                    for component in self.components()
+                ]
+
+                # Raise the first error, once every worker has finished
+                for future in futures:
+                    future.result()
+
+    def run_step(self, step, checkpoint=None):
+        '''
+        Seeds a single step of the plan
+
+        The random number generator is seeded before the first step runs.
+
+        Parameters
+        ----------
+
+        step : PlanStep
+            the step to seed
+
+        checkpoint : data_seeder.checkpoint.Checkpoint, optional
+            a checkpoint to record progress to (default is None)
+
+
+        Returns
+        -------
+
+        list
+            the primary keys of the seeds generated for the step
+        '''
+
+        if not self._started and self.random_seed is not None:
+            random.seed(self.random_seed)
+
+        self._started = True
+
+        related_pks = {}
+        seeds = step.seeds
+
+        for field_name, ratio in step.relations.items():
+            pks = self._get_related_pks(step.model, field_name)
+            related_pks[field_name] = pks
+
+            if step.seeds is None:
+                seeds = max(seeds or 0, int(round(len(pks) * ratio)))
+
+        try:
+            seeder = self._get_seeder(step, seeds, related_pks, checkpoint)
+            pks = seeder.seed()
+        except ValueError as e:
+            raise PlanError(str(e))
+
+        # A resumed step only returns the seeds generated since the last
+        # checkpoint, and raw writes may not know their keys. In either case
+        # dependent steps fall back to existing rows, and deferred foreign
+        # keys are left empty
+        if None not in pks and (step.tree or len(pks) == seeder.seeds):
+            self._pks[step.model] = pks
+
+        self._fill_deferred(step.model)
+
+        return pks
+
+    def _get_seeder(self, step, seeds, related_pks, checkpoint):
+        return DataSeeder(
+            step.model,
+            seeds=1 if seeds is None else seeds,
+            generate_related=step.generate_related,
+            values=dict(step.values, **step.generator_values,
+                        **{name: None for name in step.deferred}),
+            batch_size=step.batch_size or self.batch_size,
+            checkpoint=checkpoint,
+            related_pks=related_pks,
+            return_seeds=False,
+            writer=WRITERS.get(step.writer or self.writer),
+            pipeline=self.pipeline,
+            preallocate_pks=self.preallocate_pks,
+            tree_field=step.tree.get("field"),
+            depth=step.tree.get("depth", 1),
+            branching=step.tree.get("branching", 2),
+            target_count=step.target_count,
+            approximate_count=self.approximate_count,
+            field_options=step.field_options,
+            compiled=self.compiled,
+            hooks=self.hooks,
+            tuning=self.tuning
+        )
+
+    def _fill_deferred(self, model):
+        # Fill the deferred foreign keys to a model that has just been
+        # seeded, in the rows seeded by earlier steps
+        for step in self.steps:
+            pks = self._pks.get(step.model)
+            if not pks:
+                continue
+
+            fields = [step.model._meta.get_field(name)
+                      for name in sorted(step.deferred)]
+            fields = [field for field in fields
+                      if field.related_model == model]
+            if not fields:
+                continue
+
+            related = self._pks.get(model)
+            if related is None:
+                related = ExistingKeys(model._default_manager.all())
+
+            if not related:
+                continue
+
+            writer_class = WRITERS.get(step.writer or self.writer) or \
+                DataSeeder.writer_class
+            using = router.db_for_write(step.model)
+            writer = writer_class(step.model, using)
+            batch_size = step.batch_size or self.batch_size or \
+                DataSeeder.batch_size
+
+            for start in range(0, len(pks), batch_size):
+                chunk = pks[start:start + batch_size]
+
+                batch = ColumnarBatch(step.model, len(chunk))
+                batch[step.model._meta.pk.attname] = chunk
+                for field in fields:
+                    batch[field.attname] = related.sample(len(chunk)) \
+                        if isinstance(related, ExistingKeys) else \
+                        random.choices(related, k=len(chunk))
+
+                with transaction.atomic(using=using):
+                    writer.update(batch, fields)
+
+    def _run_component(self, component, checkpoint):
+        try:
+            component.run(checkpoint=checkpoint)
+        finally:
+            # Worker threads own their connections
+            connections.close_all()
+
+    def _get_related_pks(self, model, field_name):
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            field = None
+
+        if field is None or not field.many_to_one:
+            raise PlanError('"%s" is not a foreign key of "%s"' %
+                            (field_name, model._meta.label))
+
+        # Prefer the rows seeded for the related model by this plan,
+        # otherwise fall back to every existing row, read as needed
+        pks = self._pks.get(field.related_model)
+        if pks is None:
+            pks = ExistingKeys(field.related_model._default_manager.all())
+
+        if not pks:
+            raise PlanError('There are no "%s" rows to relate to' %
+                            field.related_model._meta.label)
+
+        return pks
+
+    def _order(self, steps):
+        # Order steps so that every model is seeded after the models it
+        # references, keeping the file order wherever possible
+        ordered = []
+        remaining = list(steps)
+
+        while remaining:
+            pending = {step.model for step in remaining}
+            ready = [
+                step for step in remaining
+                if not step.dependencies() & (pending - {step.model})
+            ]
+
+            if not ready:
+                # Break the cycle at the first step whose foreign keys to
+                # the remaining models can be left empty for now
+                for step in remaining:
+                    names = step.deferrable(pending - {step.model})
+                    if names:
+                        step.deferred.update(names)
+                        break
+                else:
+                    raise PlanError("The plan contains a dependency cycle "
+                                    "through foreign keys that are not "
+                                    "nullable: %s" % ", ".join(
+                                        step.model._meta.label
+                                        for step in remaining))
+
+                continue
+
+            ordered.append(ready[0])
+            remaining.remove(ready[0])
+
+        return ordered
+
+
+def _check_number(value, description, integer=True):
+    # Plan files are parsed as is, so that a count given as a string or a
+    # float would only fail once seeding has begun
+    valid_types = (int,) if integer else (int, float)
+    if value is not None and (isinstance(value, bool) or
+                              not isinstance(value, valid_types) or
+                              value < 0):
+        raise PlanError('%s must be a non-negative %s' % (
+            description, "integer" if integer else "number"))
@@ -0,0 +1,291 @@
+'''
+A registry of seeding runs, for purging seeded data
+
+Deleting seeded rows through Model.objects.all().delete() collects every row
+and its cascades in Python, which takes forever on millions of rows.
+RunRegistry is a set of hooks recording, for every run, the primary keys a
+seeder inserted as compact ranges in a JSON file. A run is purged later with
+batched range deletes, or by truncating tables that hold nothing but the
+run's rows and that no table holding rows references.
+
+Only integer primary keys are recorded. Rows whose keys are not known once
+written (i.e. with the ORM writer on MySQL) cannot be recorded, unless their
+keys are preallocated.
+'''
+
+import datetime
+import json
+import os
+import threading
+
+import django
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import connections, router, transaction
+
+from .hooks import SeedHooks
+
+
+class RegistryError(Exception):
+    '''
+    Raised when a run registry cannot be read or a run does not exist
+    '''
+
+    pass
+
+
+def compact(pks, ranges=()):
+    '''
+    Compacts primary keys into ranges
+
+    Parameters
+    ----------
+
+    pks : iterable
+        integer primary keys, in any order
+
+    ranges : iterable, optional
+        [first, last] ranges to merge the keys into (default is ())
+
+
+    Returns
+    -------
+
+    list
+        a sorted list of disjoint [first, last] ranges, with adjacent ranges
+        merged
+    '''
+
+    merged = []
+    for first, last in sorted([[pk, pk] for pk in pks] +
+                              [list(bounds) for bounds in ranges]):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+
+    return merged
+
+
+class RunRegistry(SeedHooks):
+    '''
+    Hooks recording the primary keys inserted by every seeding run
+
+    The registry file is written after every committed batch, so that the
+    rows of a run that dies part way through can still be purged.
+
+    Attributes
+    ----------
+
+    path : str
+        the path of the registry file
+
+    run_id : str
+        the identifier of the run recorded by these hooks
+
+    runs : dict
+        a dictionary mapping run identifiers to the time they were created
+        and the primary key ranges of every model they seeded, in the order
+        the models were seeded
+
+    unrecorded : dict
+        a dictionary mapping model labels to the number of rows of this run
+        that could not be recorded
+
+
+    Methods
+    -------
+
+    purge(run_id, batch_size) : list
+        deletes the rows of a run, or of every run, and forgets them
+    '''
+
+    def __init__(self, path, run_id=None):
+        '''
+        Parameters
+        ----------
+
+        path : str
+            the path of the registry file, which is loaded if it exists
+
+        run_id : str, optional
+            the identifier of the run to record (default is the current
+            time followed by a random suffix)
+        '''
+
+        self.path = path
+        self.run_id = run_id or "%s-%s" % (
+            datetime.datetime.now().strftime("%Y%m%d-%H%M%S"),
+            os.urandom(2).hex()
+        )
+        self.runs = {}
+        self.unrecorded = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            self._load()
+
+    def on_batch_flushed(self, seeder, batch, rows, nbytes, elapsed_ns):
+        label = seeder.model._meta.label
+        pks = batch.pks or ()
+        recorded = [pk for pk in pks if isinstance(pk, int)]
+
+        with self._lock:
+            if len(recorded) < rows:
+                self.unrecorded[label] = self.unrecorded.get(label, 0) + \
+                    rows - len(recorded)
+
+            if not recorded:
+                return
+
+            run = self.runs.setdefault(self.run_id, {
+                "created": datetime.datetime.now().isoformat(),
+                "models": {}
+            })
+            run["models"][label] = compact(recorded,
+                                           run["models"].get(label, ()))
+
+            self._write()
+
+    def purge(self, run_id=None, batch_size=1000):
+        '''
+        Deletes the rows of a run, or of every run, and forgets them
+
+        Models are purged in the reverse order they were seeded in, so that
+        rows are deleted before the rows they reference. A table holding
+        nothing but the purged rows is truncated, unless a table
+        referencing it still holds rows. The rows of other tables are
+        deleted one range of batch_size keys at a time, along with the rows
+        of other models deleted in cascade, which are reported too.
+
+        Parameters
+        ----------
+
+        run_id : str, optional
+            the identifier of the run to purge (default is every run, the
+            most recent first)
+
+        batch_size : int, optional
+            the number of keys deleted in a single transaction
+            (default is 1000)
+
+
+        Returns
+        -------
+
+        list
+            a list of (model label, deleted rows, truncated) tuples, for
+            the purged models and the models whose rows were deleted in
+            cascade
+        '''
+
+        if run_id is not None and run_id not in self.runs:
+            raise RegistryError('Run "%s" does not exist' % run_id)
+
+        run_ids = [run_id] if run_id is not None else \
+            list(reversed(list(self.runs)))
+
+        ranges = {}
+        for purged_id in run_ids:
+            for label, bounds in reversed(list(
+                    self.runs[purged_id]["models"].items())):
+                ranges[label] = compact((), ranges.get(label, []) + bounds)
+
+        purged = {}
+        for label, bounds in ranges.items():
+            try:
+                model = apps.get_model(label)
+            except LookupError:
+                raise RegistryError('Model "%s" does not exist' % label)
+
+            deleted, truncated = _purge_model(model, bounds, batch_size)
+            for deleted_label, rows in deleted.items():
+                previous = purged.get(deleted_label, (0, False))
+                purged[deleted_label] = (previous[0] + rows,
+                                         previous[1] or truncated)
+
+        with self._lock:
+            for purged_id in run_ids:
+                del self.runs[purged_id]
+
+            self._write()
+
+        return [(label,) + counts for label, counts in purged.items()]
+
+    def _load(self):
+        try:
+            with open(self.path) as registry_file:
+                self.runs = json.load(registry_file)["runs"]
+
+        except (ValueError, KeyError):
+            raise RegistryError('Run registry "%s" is not valid' % self.path)
+
+    def _write(self):
+        # As with checkpoints, a crash while writing must never leave a
+        # truncated registry behind
+        tmp_path = "%s.tmp" % self.path
+        with open(tmp_path, "w") as registry_file:
+            json.dump({"runs": self.runs}, registry_file)
+
+        os.replace(tmp_path, self.path)
+
+
+def _purge_model(model, ranges, batch_size):
+    using = router.db_for_write(model)
+    manager = model._default_manager.using(using)
+
+    total = manager.count()
+    if total and total <= sum(last - first + 1 for first, last in ranges) \
+            and total == sum(manager.filter(pk__gte=first, pk__lte=last)
+                             .count() for first, last in ranges) \
+            and not _is_referenced(model, using):
+        _truncate(model, using)
+        return {model._meta.label: total}, True
+
+    deleted = {model._meta.label: 0}
+    for first, last in ranges:
+        for start in range(first, last + 1, batch_size):
+            with transaction.atomic(using=using):
+                counts = manager.filter(
+                    pk__gte=start, pk__lte=min(last, start + batch_size - 1)
+                ).delete()[1]
+
+            for label, rows in counts.items():
+                deleted[label] = deleted.get(label, 0) + rows
+
+    return deleted, False
+
+
+def _is_referenced(model, using):
+    # Whether another table referencing the model's table holds rows, which
+    # truncating would wipe. Hidden relations include the foreign keys of
+    # many to many tables and those with a related_name ending with +
+    for relation in model._meta.get_fields(include_hidden=True):
+        if relation.auto_created and not relation.concrete and \
+                (relation.one_to_many or relation.one_to_one):
+            related = relation.related_model._meta.concrete_model
+            if related is not model._meta.concrete_model and \
+                    related._base_manager.using(using).exists():
+                return True
+
+    return False
+
+
+def _truncate(model, using):
+    # Tables referencing the table are empty, but Postgres still cannot
+    # truncate it unless they are truncated along with it
+    connection = connections[using]
+    tables = [model._meta.db_table]
+
+    if django.VERSION >= (3, 1):
+        statements = connection.ops.sql_flush(no_style(), tables,
+                                              allow_cascade=True)
+    else:
+        statements = connection.ops.sql_flush(no_style(), tables, (),
+                                              allow_cascade=True)
+
+    with transaction.atomic(using=using):
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
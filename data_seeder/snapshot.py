@@ -0,0 +1,379 @@
+'''
+Snapshot cache of seeded datasets
+
+Seeding the same plan against the same schema always produces the same
+dataset, so there is no need to generate it on every run. A SnapshotCache
+stores the seeded tables of a plan under a key hashed from the schema of
+its models, the plan itself and its random seed, and restores them in bulk
+the next time the same plan is seeded into empty tables.
+
+Seeded rows may reference existing rows of tables the plan does not write
+to, which are not part of the snapshot. The number of rows and highest
+primary key of those tables are hashed into the key too, so that a snapshot
+is only restored where the rows it references are likely the same.
+
+Snapshots are stored as an SQLite database file on SQLite, and as one COPY
+file per table on Postgres. Other databases are not supported.
+'''
+
+import hashlib
+import json
+import os
+import shutil
+
+from django.core.management.color import no_style
+from django.db import connections, router, transaction
+from django.db.models import Count, Max
+
+
+class SnapshotError(Exception):
+    '''
+    Raised when a snapshot cannot be stored or restored
+    '''
+
+    pass
+
+
+class SnapshotCache:
+    '''
+    A directory of dataset snapshots, evicted least recently used first
+
+    Attributes
+    ----------
+
+    directory : str
+        the directory snapshots are stored in
+
+    max_size : int
+        the maximum total size of the snapshots in bytes
+
+
+    Methods
+    -------
+
+    supports(plan) : bool
+        returns whether the database of a plan is supported
+
+    key(plan) : str
+        returns the cache key of a plan
+
+    is_empty(plan) : bool
+        returns whether every table a plan writes to is empty
+
+    restore(plan) : bool
+        restores the snapshot of a plan, if there is one
+
+    store(plan)
+        stores a snapshot of the tables seeded by a plan
+    '''
+
+    max_size = 1024 ** 3
+    vendors = ("sqlite", "postgresql")
+
+    def __init__(self, directory, max_size=None):
+        '''
+        Parameters
+        ----------
+
+        directory : str
+            the directory snapshots are stored in
+
+        max_size : int, optional
+            the maximum total size of the snapshots in bytes
+            (default is 1GB)
+        '''
+
+        self.directory = directory
+
+        if max_size is not None:
+            self.max_size = max_size
+
+    def supports(self, plan):
+        '''
+        Returns whether the database of a plan can be snapshotted
+
+        Parameters
+        ----------
+
+        plan : data_seeder.plan.SeedPlan
+            the plan to snapshot
+
+
+        Returns
+        -------
+
+        bool
+            True if the plan writes to a single SQLite or Postgres database
+        '''
+
+        try:
+            return self._get_connection(plan).vendor in self.vendors
+        except SnapshotError:
+            return False
+
+    def key(self, plan):
+        '''
+        Returns the cache key of a plan
+
+        The key is a hash of the schema of every model the plan writes to,
+        as described by their _meta, along with the plan's steps, options
+        and random seed, and the number of rows and highest primary key of
+        every table referenced by the plan's models that it does not write
+        to.
+
+        Parameters
+        ----------
+
+        plan : data_seeder.plan.SeedPlan
+            the plan to hash
+
+
+        Returns
+        -------
+
+        str
+            a hex digest
+        '''
+
+        connection = self._get_connection(plan)
+        schema = [
+            [model._meta.db_table] + [
+                [field.column, field.db_type(connection), field.null]
+                for field in model._meta.concrete_fields
+            ]
+            for model in plan.models()
+        ]
+
+        referenced = []
+        for model in self._get_referenced(plan):
+            state = model._default_manager.using(connection.alias).aggregate(
+                rows=Count("pk"), max_pk=Max("pk"))
+            referenced.append([model._meta.db_table, state["rows"],
+                               state["max_pk"]])
+
+        description = json.dumps({
+            "vendor": connection.vendor,
+            "schema": schema,
+            "referenced": referenced,
+            "plan": plan.describe()
+        }, sort_keys=True, default=str)
+
+        return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+    def restore(self, plan):
+        '''
+        Restores the snapshot of a plan, if there is one
+
+        Snapshots are only restored into empty tables, since the rows they
+        hold were seeded into empty tables.
+
+        Parameters
+        ----------
+
+        plan : data_seeder.plan.SeedPlan
+            the plan to restore
+
+
+        Returns
+        -------
+
+        bool
+            True if a snapshot was restored, False if the plan still needs
+            to be seeded
+        '''
+
+        entry = os.path.join(self.directory, self.key(plan))
+        if not os.path.isdir(entry) or not self.is_empty(plan):
+            return False
+
+        connection = self._get_connection(plan)
+
+        if connection.vendor == "sqlite":
+            self._restore_sqlite(connection, entry, plan.models())
+        else:
+            self._restore_postgresql(connection, entry, plan.models())
+
+        # Touch the entry so that it is evicted last
+        os.utime(entry)
+
+        return True
+
+    def store(self, plan):
+        '''
+        Stores a snapshot of the tables seeded by a plan
+
+        Parameters
+        ----------
+
+        plan : data_seeder.plan.SeedPlan
+            the plan that was seeded
+        '''
+
+        connection = self._get_connection(plan)
+        if connection.vendor not in self.vendors:
+            raise SnapshotError('Snapshots are not supported on "%s"' %
+                                connection.vendor)
+
+        key = self.key(plan)
+        entry = os.path.join(self.directory, key)
+        tmp_entry = "%s.tmp-%d" % (entry, os.getpid())
+
+        os.makedirs(tmp_entry, exist_ok=True)
+
+        try:
+            if connection.vendor == "sqlite":
+                self._store_sqlite(connection, tmp_entry, plan.models())
+            else:
+                self._store_postgresql(connection, tmp_entry, plan.models())
+
+            shutil.rmtree(entry, ignore_errors=True)
+            os.replace(tmp_entry, entry)
+
+        finally:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+        self._evict(keep=key)
+
+    def _get_connection(self, plan):
+        aliases = {router.db_for_write(model) for model in plan.models()}
+        if len(aliases) != 1:
+            raise SnapshotError("A snapshot must cover a single database")
+
+        return connections[aliases.pop()]
+
+    def _get_referenced(self, plan):
+        models = plan.models()
+        referenced = []
+
+        for model in models:
+            for field in model._meta.concrete_fields:
+                related = field.related_model
+                if field.many_to_one and related not in models and \
+                        related not in referenced:
+                    referenced.append(related)
+
+        return referenced
+
+    def is_empty(self, plan):
+        '''
+        Returns whether every table a plan writes to is empty
+
+        Snapshots copy whole tables, so a snapshot must only be stored for
+        a plan that was seeded into empty tables.
+
+        Parameters
+        ----------
+
+        plan : data_seeder.plan.SeedPlan
+            the plan to check
+
+
+        Returns
+        -------
+
+        bool
+            True if none of the plan's tables holds any row
+        '''
+
+        return not any(
+            model._default_manager.using(router.db_for_write(model)).exists()
+            for model in plan.models()
+        )
+
+    def _store_sqlite(self, connection, entry, models):
+        qn = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            cursor.execute("ATTACH DATABASE %s AS snapshot",
+                           [os.path.join(entry, "snapshot.sqlite3")])
+
+            try:
+                for model in models:
+                    table = model._meta.db_table
+                    cursor.execute(
+                        "CREATE TABLE snapshot.%s AS SELECT * FROM main.%s" %
+                        (qn(table), qn(table))
+                    )
+            finally:
+                cursor.execute("DETACH DATABASE snapshot")
+
+    def _restore_sqlite(self, connection, entry, models):
+        qn = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            cursor.execute("ATTACH DATABASE %s AS snapshot",
+                           [os.path.join(entry, "snapshot.sqlite3")])
+
+            # SQLite cannot attach databases inside a transaction
+            try:
+                with transaction.atomic(using=connection.alias):
+                    for model in models:
+                        table = model._meta.db_table
+                        cursor.execute(
+                            "INSERT INTO main.%s SELECT * FROM snapshot.%s" %
+                            (qn(table), qn(table))
+                        )
+            finally:
+                cursor.execute("DETACH DATABASE snapshot")
+
+    def _store_postgresql(self, connection, entry, models):
+        qn = connection.ops.quote_name
+
+        with connection.cursor() as cursor:
+            for i, model in enumerate(models):
+                sql = "COPY %s TO STDOUT" % qn(model._meta.db_table)
+
+                with open(os.path.join(entry, "%d.copy" % i), "wb") as f:
+                    raw = cursor.cursor
+                    if hasattr(raw, "copy_expert"):  # psycopg2
+                        raw.copy_expert(sql, f)
+                    else:  # psycopg 3
+                        with raw.copy(sql) as copy:
+                            for data in copy:
+                                f.write(data)
+
+    def _restore_postgresql(self, connection, entry, models):
+        qn = connection.ops.quote_name
+
+        with transaction.atomic(using=connection.alias), \
+                connection.cursor() as cursor:
+            for i, model in enumerate(models):
+                sql = "COPY %s FROM STDIN" % qn(model._meta.db_table)
+
+                with open(os.path.join(entry, "%d.copy" % i), "rb") as f:
+                    raw = cursor.cursor
+                    if hasattr(raw, "copy_expert"):  # psycopg2
+                        raw.copy_expert(sql, f)
+                    else:  # psycopg 3
+                        with raw.copy(sql) as copy:
+                            for data in iter(lambda: f.read(1 << 20), b""):
+                                copy.write(data)
+
+            # Move sequences past the restored keys
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+
+    def _evict(self, keep):
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if not os.path.isdir(path) or ".tmp-" in name:
+                continue
+
+            size = sum(
+                os.path.getsize(os.path.join(root, file_name))
+                for root, dirs, files in os.walk(path)
+                for file_name in files
+            )
+            entries.append((os.path.getmtime(path), name, path, size))
+
+        total = sum(entry[3] for entry in entries)
+
+        # Evict the least recently used entries first
+        for mtime, name, path, size in sorted(entries):
+            if total <= self.max_size:
+                break
+
+            if name != keep:
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
@@ -0,0 +1,155 @@
+'''
+Test cases seeded once per class
+
+Seeding inside every test regenerates the same data over and over. A
+SeededTestCase declares the models to seed as a class attribute and seeds
+them once per class in setUpTestData, so that every test of the class runs
+against the same rows, rolled back after each test.
+
+Every test class runs inside its own transaction, which is rolled back once
+the class is done, so seeded rows cannot outlive their class. Instead, the
+rows seeded for a plan are kept in memory, and any other class declaring an
+identical plan bulk inserts them again, primary keys included, rather than
+generating them from scratch.
+'''
+
+import hashlib
+import json
+
+from django.core.management.color import no_style
+from django.db import connections, router
+from django.test import TestCase
+
+from .plan import SeedPlan
+
+
+class SeededTestCase(TestCase):
+    '''
+    A TestCase that seeds its data once per class
+
+    Attributes
+    ----------
+
+    seed_plan : list
+        a list of plan steps to seed, in the format of the "models" of a
+        seeding plan (model classes may be given instead of labels)
+
+    random_seed : object
+        a value to seed the random number generator with before seeding, or
+        None to leave the random number generator untouched
+
+    seeded_pks : dict
+        a dictionary mapping every seeded model to the primary keys of its
+        seeds, set once the class is seeded
+    '''
+
+    seed_plan = []
+    random_seed = None
+
+    # Rows seeded per plan, shared by every SeededTestCase
+    _seeded_rows = {}
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        plan = cls.get_seed_plan()
+        key = cls._get_key(plan)
+
+        rows = cls._seeded_rows.get(key)
+        if rows is None:
+            rows = cls._seed(plan)
+            cls._seeded_rows[key] = rows
+        else:
+            cls._replay(plan, rows)
+
+        cls.seeded_pks = {
+            model: [row[cls._get_pk_index(model)] for row in model_rows]
+            for model, model_rows in rows.items()
+        }
+
+    @classmethod
+    def get_seed_plan(cls):
+        '''
+        Returns the plan seeded for the class
+
+        Returns
+        -------
+
+        data_seeder.plan.SeedPlan
+            the compiled plan
+        '''
+
+        steps = []
+        for step_spec in cls.seed_plan:
+            step_spec = dict(step_spec)
+
+            model = step_spec.get("model")
+            if not isinstance(model, str) and model is not None:
+                step_spec["model"] = model._meta.label
+
+            steps.append(step_spec)
+
+        return SeedPlan.from_dict({
+            "models": steps,
+            "random_seed": cls.random_seed
+        })
+
+    @classmethod
+    def _get_key(cls, plan):
+        aliases = sorted({router.db_for_write(model)
+                          for model in plan.models()})
+        description = json.dumps([aliases, plan.describe()], sort_keys=True,
+                                 default=str)
+
+        return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def _get_pk_index(cls, model):
+        return model._meta.concrete_fields.index(model._meta.pk)
+
+    @classmethod
+    def _seed(cls, plan):
+        # Only the rows added by the plan are kept, not rows that already
+        # existed (e.g. created by data migrations)
+        existing = {
+            model: set(model._default_manager.values_list("pk", flat=True))
+            for model in plan.models()
+        }
+
+        plan.run()
+
+        rows = {}
+        for model in plan.models():
+            attnames = [field.attname
+                        for field in model._meta.concrete_fields]
+            pk_index = cls._get_pk_index(model)
+
+            rows[model] = [
+                row for row in model._default_manager.order_by("pk")
+                .values_list(*attnames)
+                if row[pk_index] not in existing[model]
+            ]
+
+        return rows
+
+    @classmethod
+    def _replay(cls, plan, rows):
+        for model in plan.models():
+            using = router.db_for_write(model)
+            instances = [model(*row) for row in rows[model]]
+
+            # Django cannot bulk create multi-table inherited models
+            if model._meta.parents:
+                for instance in instances:
+                    instance.save(using=using, force_insert=True)
+            else:
+                model._default_manager.using(using).bulk_create(instances)
+
+            # Move sequences past the replayed keys
+            connection = connections[using]
+            sql_list = connection.ops.sequence_reset_sql(no_style(), [model])
+            if sql_list:
+                with connection.cursor() as cursor:
+                    for sql in sql_list:
+                        cursor.execute(sql)
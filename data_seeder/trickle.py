@@ -0,0 +1,322 @@
+'''
+Rate-controlled seeding
+
+Rather than seeding as fast as possible, a trickle writes micro-batches at a
+target rate for a given duration, to simulate the continuous write load of a
+production database (i.e. to test replication lag, autovacuum or caches).
+The rate is held by a token bucket, which lets a micro-batch through once
+enough rows have accrued at the target rate.
+
+DateTimeFields of trickled rows hold monotonically increasing timestamps,
+spread over the time the rows were written, as they would be in production.
+'''
+
+import datetime
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+
+class TokenBucket:
+    '''
+    A token bucket holding a rate
+
+    Tokens accrue at rate tokens per second, up to capacity. The bucket
+    starts empty, so that no burst is let through when it is created.
+
+    Attributes
+    ----------
+
+    rate : float
+        the number of tokens accrued per second
+
+    capacity : float
+        the maximum number of tokens held
+
+
+    Methods
+    -------
+
+    acquire(tokens, deadline) : bool
+        waits until tokens are available and takes them
+    '''
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic,
+                 sleep=time.sleep):
+        '''
+        Parameters
+        ----------
+
+        rate : float
+            the number of tokens accrued per second
+
+        capacity : float, optional
+            the maximum number of tokens held (default is rate)
+
+        clock : callable, optional
+            a function returning the current time in seconds
+            (default is time.monotonic)
+
+        sleep : callable, optional
+            a function sleeping for a number of seconds
+            (default is time.sleep)
+        '''
+
+        if rate <= 0:
+            raise ValueError("The rate must be positive")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = 0.0
+        self._updated = clock()
+
+    def acquire(self, tokens, deadline=None):
+        '''
+        Waits until tokens are available and takes them
+
+        Parameters
+        ----------
+
+        tokens : float
+            the number of tokens to take, at most capacity
+
+        deadline : float, optional
+            the time, on the bucket's clock, after which to give up rather
+            than wait (default is None)
+
+
+        Returns
+        -------
+
+        bool
+            whether the tokens were taken, which is False when they would
+            not be available before the deadline
+        '''
+
+        if tokens > self.capacity:
+            raise ValueError("Cannot take more tokens than the capacity")
+
+        self._refill()
+        wait = (tokens - self._tokens) / self.rate
+
+        if wait > 0:
+            if deadline is not None and self._clock() + wait > deadline:
+                return False
+
+            self._sleep(wait)
+            self._refill()
+
+        self._tokens -= tokens
+        return True
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class MonotonicTimestamps:
+    '''
+    Monotonically increasing timestamps for trickled rows
+
+    The rows of a batch are spaced by the time between two rows at the
+    target rate, starting from the current time or right after the last
+    timestamp, whichever is later.
+
+    Attributes
+    ----------
+
+    step : datetime.timedelta
+        the time between two rows, of at least a microsecond
+
+
+    Methods
+    -------
+
+    next(size) : list
+        returns the timestamps of the next rows
+    '''
+
+    def __init__(self, rate):
+        '''
+        Parameters
+        ----------
+
+        rate : float
+            the target number of rows per second
+        '''
+
+        self.step = max(datetime.timedelta(seconds=1 / rate),
+                        datetime.timedelta(microseconds=1))
+        self._last = None
+
+    def next(self, size):
+        '''
+        Returns the timestamps of the next rows
+
+        Parameters
+        ----------
+
+        size : int
+            the number of rows
+
+
+        Returns
+        -------
+
+        list
+            a list of increasing datetimes, aware if USE_TZ is set
+        '''
+
+        start = timezone.now() if settings.USE_TZ else \
+            datetime.datetime.now()
+        if self._last is not None:
+            start = max(start, self._last + self.step)
+
+        timestamps = [start + self.step * i for i in range(size)]
+        self._last = timestamps[-1]
+
+        return timestamps
+
+
+class TrickleReport:
+    '''
+    The outcome of a trickle
+
+    Attributes
+    ----------
+
+    target_rate : float
+        the target number of rows per second
+
+    rows : int
+        the number of rows written
+
+    batches : int
+        the number of micro-batches written
+
+    elapsed : float
+        the duration of the trickle in seconds
+
+    latencies : list
+        the time taken to write every micro-batch, in nanoseconds
+
+
+    Methods
+    -------
+
+    record(rows, latency_ns)
+        records a written micro-batch
+
+    achieved_rate() : float
+        returns the number of rows written per second
+
+    percentile(percent) : int
+        returns a percentile of the batch latencies
+
+    summary() : str
+        returns a summary of the trickle
+    '''
+
+    def __init__(self, target_rate):
+        '''
+        Parameters
+        ----------
+
+        target_rate : float
+            the target number of rows per second
+        '''
+
+        self.target_rate = target_rate
+        self.rows = 0
+        self.batches = 0
+        self.elapsed = 0.0
+        self.latencies = []
+
+    def record(self, rows, latency_ns):
+        '''
+        Records a written micro-batch
+
+        Parameters
+        ----------
+
+        rows : int
+            the number of rows in the batch
+
+        latency_ns : int
+            the time taken to write the batch
+        '''
+
+        self.rows += rows
+        self.batches += 1
+        self.latencies.append(latency_ns)
+
+    def achieved_rate(self):
+        '''
+        Returns the number of rows written per second
+
+        Returns
+        -------
+
+        float
+            the achieved rate, or 0 if nothing was written
+        '''
+
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, percent):
+        '''
+        Returns a percentile of the batch latencies
+
+        Parameters
+        ----------
+
+        percent : float
+            the percentile, between 0 and 100
+
+
+        Returns
+        -------
+
+        int
+            the nearest-rank percentile in nanoseconds, or None if nothing
+            was written
+        '''
+
+        if not self.latencies:
+            return None
+
+        latencies = sorted(self.latencies)
+        rank = max(1, -(-len(latencies) * percent // 100))
+
+        return latencies[int(rank) - 1]
+
+    def summary(self):
+        '''
+        Returns a summary of the trickle
+
+        Returns
+        -------
+
+        str
+            the achieved and target rates and the latency percentiles
+        '''
+
+        lines = ["Wrote %d row(s) in %d batch(es) over %.1fs: %.1f rows/s "
+                 "of a target of %.1f rows/s (%.0f%%)" % (
+                     self.rows, self.batches, self.elapsed,
+                     self.achieved_rate(), self.target_rate,
+                     100 * self.achieved_rate() / self.target_rate)]
+
+        if self.latencies:
+            lines.append("Batch latency: %s" % ", ".join(
+                "%s %.1fms" % (label, self.percentile(percent) / 1e6)
+                for label, percent in (("p50", 50), ("p90", 90),
+                                       ("p99", 99), ("max", 100))
+            ))
+
+        return "\n".join(lines)
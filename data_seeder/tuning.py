@@ -0,0 +1,388 @@
+'''
+Session tuning profiles for seeding
+
+Databases default to settings that keep every committed row safe, which
+seeding throwaway development data rarely needs. A tuning profile relaxes
+the settings of the connection a seeder writes over for the duration of a
+run, then reverts them to the values they had before.
+
+Some settings, like the journal mode of SQLite, apply to the whole database
+rather than to a connection. Changing them while another connection is open
+fails, so they are applied once by tuned_database(), over the connection of
+the thread that starts seeding, before any writer or worker thread opens its
+own connection, and reverted after those have all been closed.
+
+Profiles are looked up by the vendor of the connection in PROFILES. Other
+vendors can be supported, or the default settings of a vendor replaced, by
+registering a TuningProfile subclass there.
+'''
+
+import contextlib
+import threading
+
+from abc import ABC, abstractmethod
+
+from django.db import connections
+
+# The number of KiB of pages SQLite caches, given as a negative cache_size
+SQLITE_CACHE_KIB = 65536
+
+# The aliases of the databases whose database settings are applied
+_tuned_databases = set()
+_lock = threading.Lock()
+
+
+class TuningProfile(ABC):
+    '''
+    A base class for the session settings relaxed while seeding
+
+    Attributes
+    ----------
+
+    settings : dict
+        a dictionary mapping setting names to the value used while seeding,
+        applied in order
+
+    outside_transaction : tuple
+        the names of settings that cannot be changed inside a transaction,
+        which are left untouched when a seeder runs in one
+
+    database_settings : tuple
+        the names of settings that apply to the whole database rather than
+        to a connection, which are only applied by apply_database()
+
+
+    Methods
+    -------
+
+    apply(connection) : dict
+        applies the connection settings and returns the values they
+        replaced
+
+    apply_database(connection) : dict
+        applies the database settings and returns the values they replaced
+
+    revert(connection, previous)
+        reverts the settings to the values they replaced
+    '''
+
+    settings = {}
+    outside_transaction = ()
+    database_settings = ()
+
+    def __init__(self, **settings):
+        '''
+        Parameters
+        ----------
+
+        **settings
+            values overriding or adding to the default settings of the
+            profile
+        '''
+
+        self.settings = dict(self.settings, **settings)
+
+    def apply(self, connection):
+        '''
+        Applies the connection settings to a connection
+
+        If a setting cannot be applied, the settings already applied are
+        reverted before the error is raised.
+
+        Parameters
+        ----------
+
+        connection : django.db.backends.base.base.BaseDatabaseWrapper
+            the connection to tune
+
+
+        Returns
+        -------
+
+        dict
+            a dictionary mapping the names of the applied settings to the
+            values they replaced
+        '''
+
+        return self._apply(connection, [
+            name for name in self.settings
+            if name not in self.database_settings
+        ])
+
+    def apply_database(self, connection):
+        '''
+        Applies the database settings over a connection
+
+        No other connection to the database should be open. If a setting
+        cannot be applied, the settings already applied are reverted before
+        the error is raised.
+
+        Parameters
+        ----------
+
+        connection : django.db.backends.base.base.BaseDatabaseWrapper
+            the connection to tune
+
+
+        Returns
+        -------
+
+        dict
+            a dictionary mapping the names of the applied settings to the
+            values they replaced
+        '''
+
+        return self._apply(connection, [
+            name for name in self.settings if name in self.database_settings
+        ])
+
+    def revert(self, connection, previous):
+        '''
+        Reverts settings to the values they replaced
+
+        Parameters
+        ----------
+
+        connection : django.db.backends.base.base.BaseDatabaseWrapper
+            the tuned connection
+
+        previous : dict
+            the replaced values, as returned by apply() or apply_database()
+        '''
+
+        with connection.cursor() as cursor:
+            for name, value in reversed(list(previous.items())):
+                if connection.in_atomic_block and \
+                        name in self.outside_transaction:
+                    continue
+
+                self.set(cursor, name, value)
+
+    @abstractmethod
+    def get(self, cursor, name):
+        '''
+        Returns the current value of a setting
+
+        Parameters
+        ----------
+
+        cursor : django.db.backends.utils.CursorWrapper
+            a cursor of the tuned connection
+
+        name : str
+            the name of the setting
+
+
+        Returns
+        -------
+
+        object
+            the value of the setting
+        '''
+
+        pass
+
+    @abstractmethod
+    def set(self, cursor, name, value):
+        '''
+        Changes the value of a setting
+
+        Parameters
+        ----------
+
+        cursor : django.db.backends.utils.CursorWrapper
+            a cursor of the tuned connection
+
+        name : str
+            the name of the setting
+
+        value : object
+            the new value of the setting
+        '''
+
+        pass
+
+    def _apply(self, connection, names):
+        previous = {}
+
+        try:
+            with connection.cursor() as cursor:
+                for name in names:
+                    if connection.in_atomic_block and \
+                            name in self.outside_transaction:
+                        continue
+
+                    current = self.get(cursor, name)
+                    self.set(cursor, name, self.settings[name])
+                    previous[name] = current
+
+        except BaseException as e:
+            try:
+                self.revert(connection, previous)
+            except Exception as error:
+                raise error from e
+
+            raise
+
+        return previous
+
+
+class SqliteProfile(TuningProfile):
+    '''
+    Write ahead logging without syncing to disk, and a larger page cache
+
+    A crash while seeding may lose the last committed batches, but does not
+    corrupt the database. The journal mode is a setting of the database
+    file, while syncing and the page cache are set per connection.
+    '''
+
+    settings = {
+        "journal_mode": "wal",
+        "synchronous": "off",
+        "cache_size": -SQLITE_CACHE_KIB
+    }
+    outside_transaction = ("journal_mode", "synchronous")
+    database_settings = ("journal_mode",)
+
+    def get(self, cursor, name):
+        cursor.execute("PRAGMA %s" % name)
+        return cursor.fetchone()[0]
+
+    def set(self, cursor, name, value):
+        # PRAGMA values cannot be given as query parameters
+        cursor.execute("PRAGMA %s = %s" % (name, value))
+
+        # journal_mode returns the resulting mode
+        if name == "journal_mode":
+            cursor.fetchall()
+
+
+class PostgresProfile(TuningProfile):
+    '''
+    Commits that do not wait for the WAL to be flushed, and more memory for
+    sorts and hashes
+
+    A crash while seeding may lose the last committed batches, but does not
+    corrupt the database.
+    '''
+
+    settings = {
+        "synchronous_commit": "off",
+        "work_mem": "256MB"
+    }
+
+    def get(self, cursor, name):
+        cursor.execute("SELECT current_setting(%s)", [name])
+        return cursor.fetchone()[0]
+
+    def set(self, cursor, name, value):
+        cursor.execute("SELECT set_config(%s, %s, false)", [name, str(value)])
+
+
+class MysqlProfile(TuningProfile):
+    '''
+    Unique and foreign key checks skipped while seeding
+
+    InnoDB does not check unique secondary indexes against rows that are
+    not in its buffer pool while unique_checks is off, so seeded values of
+    unique fields must be unique.
+    '''
+
+    settings = {
+        "unique_checks": 0,
+        "foreign_key_checks": 0
+    }
+
+    def get(self, cursor, name):
+        cursor.execute("SELECT @@SESSION.%s" % name)
+        return cursor.fetchone()[0]
+
+    def set(self, cursor, name, value):
+        cursor.execute("SET SESSION %s = %%s" % name, [value])
+
+
+PROFILES = {
+    "sqlite": SqliteProfile,
+    "postgresql": PostgresProfile,
+    "mysql": MysqlProfile
+}
+
+
+def get_profile(using, tuning):
+    '''
+    Returns the tuning profile of a database
+
+    Parameters
+    ----------
+
+    using : str
+        the alias of the database
+
+    tuning : bool or TuningProfile
+        True for the profile registered for the vendor of the database, a
+        profile to use instead, or False for none
+
+
+    Returns
+    -------
+
+    TuningProfile
+        the profile, or None if the database is not tuned
+    '''
+
+    if isinstance(tuning, TuningProfile):
+        return tuning
+
+    if not tuning:
+        return None
+
+    profile_cls = PROFILES.get(connections[using].vendor)
+    return profile_cls() if profile_cls is not None else None
+
+
+@contextlib.contextmanager
+def tuned_database(using, tuning):
+    '''
+    Applies the database settings of a tuning profile for the duration of a
+    run
+
+    The settings are applied over the connection of the current thread,
+    which must be the only open connection to the database. Writer and
+    worker threads must open their own connections inside the context and
+    close them before it exits, so that the settings can be reverted. Nested
+    uses for a database that is already tuned do nothing.
+
+    Parameters
+    ----------
+
+    using : str
+        the alias of the database
+
+    tuning : bool or TuningProfile
+        True for the profile registered for the vendor of the database, a
+        profile to use instead, or False for none
+    '''
+
+    profile = get_profile(using, tuning)
+
+    with _lock:
+        owner = profile is not None and using not in _tuned_databases
+        if owner:
+            _tuned_databases.add(using)
+
+    if not owner:
+        yield
+        return
+
+    try:
+        connection = connections[using]
+        previous = profile.apply_database(connection)
+
+        try:
+            yield
+        finally:
+            profile.revert(connection, previous)
+
+    finally:
+        with _lock:
+            _tuned_databases.discard(using)
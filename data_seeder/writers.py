@@ -0,0 +1,327 @@
+'''
+Writer classes
+
+Writers take a ColumnarBatch of generated seeds and write it to the
+database. They are always called inside the transaction of the batch.
+
+WRITERS maps the writer names accepted by seeddata and seeding plans to
+their writer classes.
+'''
+
+from array import array
+
+from django.db import connections
+from django.utils import timezone
+
+from .batch import Constant
+
+
+class OrmWriter:
+    '''
+    A writer that saves batches through the Django ORM
+
+    Batches are written with a single bulk_create when the database can
+    return the primary keys of bulk inserted rows (or when the keys were
+    assigned up front), and with a save per row otherwise, so that the keys
+    of the written seeds are always known. Multi-table inherited models are
+    always saved per row.
+
+    Attributes
+    ----------
+
+    model : type
+        the subclass of django.db.models.Model to write
+
+    using : str
+        the alias of the database to write to
+
+    builds_instances : bool
+        whether the writer writes the model instances of batches
+
+    returns_pks : bool
+        whether the primary keys of written rows are known when they were
+        not assigned up front
+
+
+    Methods
+    -------
+
+    write(batch)
+        writes a batch of seeds
+
+    update(batch, fields)
+        updates existing rows from a batch
+    '''
+
+    builds_instances = True
+    returns_pks = True
+
+    def __init__(self, model, using):
+        '''
+        Parameters
+        ----------
+
+        model : type
+            the subclass of django.db.models.Model to write
+
+        using : str
+            the alias of the database to write to
+        '''
+
+        self.model = model
+        self.using = using
+
+    def write(self, batch):
+        '''
+        Writes a batch of seeds and records their primary keys on the batch
+
+        Parameters
+        ----------
+
+        batch : data_seeder.batch.ColumnarBatch
+            the batch to write
+        '''
+
+        instances = batch.instances()
+
+        if self._can_bulk_create(batch):
+            self.model._default_manager.using(self.using) \
+                .bulk_create(instances)
+        else:
+            for instance in instances:
+                instance.save(using=self.using, force_insert=True)
+
+        batch.pks = [instance.pk for instance in instances]
+
+    def update(self, batch, fields):
+        '''
+        Updates existing rows with bulk_update
+
+        Parameters
+        ----------
+
+        batch : data_seeder.batch.ColumnarBatch
+            the batch holding the primary keys of the rows and the new values
+            of their fields
+
+        fields : list
+            the fields to update
+        '''
+
+        self.model._default_manager.using(self.using).bulk_update(
+            batch.instances(), [field.name for field in fields]
+        )
+
+    def _can_bulk_create(self, batch):
+        # Django cannot bulk create multi-table inherited models
+        if self.model._meta.parents:
+            return False
+
+        # The keys were assigned up front
+        if self.model._meta.pk.attname in batch.columns:
+            return True
+
+        features = connections[self.using].features
+
+        # Django 2.2 names this feature can_return_ids_from_bulk_insert
+        return getattr(features, "can_return_rows_from_bulk_insert",
+                       getattr(features, "can_return_ids_from_bulk_insert",
+                               False))
+
+
+class RawWriter:
+    '''
+    A writer that inserts batches with cursor.executemany
+
+    The parameterized INSERT statement for the model's concrete columns is
+    built once per model and cached. Every column of a batch is converted
+    with its field's get_db_prep_value in one pass (columns held in typed
+    arrays are already plain ints or floats and are passed through as is)
+    and rows are then pushed through executemany in chunks, bypassing model
+    instances and the ORM's SQL compiler entirely.
+
+    Primary keys are not returned by executemany, so they are only known
+    when they were assigned up front. Multi-table inherited models and
+    models without any columns besides their primary key are written with
+    the OrmWriter instead.
+
+    Attributes
+    ----------
+
+    model : type
+        the subclass of django.db.models.Model to write
+
+    using : str
+        the alias of the database to write to
+
+    chunk_size : int
+        the maximum number of rows passed to a single executemany call
+
+    builds_instances : bool
+        whether the writer writes the model instances of batches
+
+    returns_pks : bool
+        whether the primary keys of written rows are known when they were
+        not assigned up front
+
+
+    Methods
+    -------
+
+    write(batch)
+        writes a batch of seeds
+
+    update(batch, fields)
+        updates existing rows from a batch
+    '''
+
+    builds_instances = False
+    returns_pks = False
+    chunk_size = 10000
+    _sql_cache = {}
+
+    def __init__(self, model, using, chunk_size=None):
+        '''
+        Parameters
+        ----------
+
+        model : type
+            the subclass of django.db.models.Model to write
+
+        using : str
+            the alias of the database to write to
+
+        chunk_size : int, optional
+            the maximum number of rows passed to a single executemany call
+            (default is 10000)
+        '''
+
+        self.model = model
+        self.using = using
+
+        if chunk_size is not None:
+            self.chunk_size = chunk_size
+
+    def write(self, batch):
+        '''
+        Writes a batch of seeds and records their primary keys on the batch,
+        if they are known
+
+        Parameters
+        ----------
+
+        batch : data_seeder.batch.ColumnarBatch
+            the batch to write
+        '''
+
+        connection = connections[self.using]
+        fields = self._get_fields(batch)
+
+        if self.model._meta.parents or not fields:
+            return OrmWriter(self.model, self.using).write(batch)
+
+        sql = self._get_sql(connection, fields)
+
+        columns = [self._prep_column(connection, field, batch)
+                   for field in fields]
+        rows = list(zip(*columns))
+
+        with connection.cursor() as cursor:
+            for i in range(0, len(rows), self.chunk_size):
+                cursor.executemany(sql, rows[i:i + self.chunk_size])
+
+        batch.pks = list(batch.column(self.model._meta.pk.attname))
+
+    def update(self, batch, fields):
+        '''
+        Updates existing rows with a cached UPDATE statement
+
+        Parameters
+        ----------
+
+        batch : data_seeder.batch.ColumnarBatch
+            the batch holding the primary keys of the rows and the new values
+            of their fields
+
+        fields : list
+            the fields to update
+        '''
+
+        if self.model._meta.parents:
+            return OrmWriter(self.model, self.using).update(batch, fields)
+
+        connection = connections[self.using]
+        pk = self.model._meta.pk
+        sql = self._get_update_sql(connection, fields)
+
+        columns = [self._prep_column(connection, field, batch, add=False)
+                   for field in fields + [pk]]
+        rows = list(zip(*columns))
+
+        with connection.cursor() as cursor:
+            for i in range(0, len(rows), self.chunk_size):
+                cursor.executemany(sql, rows[i:i + self.chunk_size])
+
+    def _get_fields(self, batch):
+        pk = self.model._meta.pk
+
+        # Leave the primary key to the database unless it was assigned
+        return [
+            field for field in self.model._meta.concrete_fields
+            if field is not pk or field.attname in batch.columns
+        ]
+
+    def _get_sql(self, connection, fields):
+        key = (connection.alias, self.model,
+               tuple(field.column for field in fields))
+
+        if key not in self._sql_cache:
+            qn = connection.ops.quote_name
+            self._sql_cache[key] = "INSERT INTO %s (%s) VALUES (%s)" % (
+                qn(self.model._meta.db_table),
+                ", ".join(qn(field.column) for field in fields),
+                ", ".join(["%s"] * len(fields))
+            )
+
+        return self._sql_cache[key]
+
+    def _get_update_sql(self, connection, fields):
+        key = (connection.alias, self.model, "update",
+               tuple(field.column for field in fields))
+
+        if key not in self._sql_cache:
+            qn = connection.ops.quote_name
+            self._sql_cache[key] = "UPDATE %s SET %s WHERE %s = %%s" % (
+                qn(self.model._meta.db_table),
+                ", ".join("%s = %%s" % qn(field.column) for field in fields),
+                qn(self.model._meta.pk.column)
+            )
+
+        return self._sql_cache[key]
+
+    def _prep_column(self, connection, field, batch, add=True):
+        # As with pre_save, auto_now_add only applies to inserted rows
+        if getattr(field, "auto_now", False) or \
+                (add and getattr(field, "auto_now_add", False)):
+            values = Constant(timezone.now())
+        elif field.attname in batch.columns:
+            values = batch.columns[field.attname]
+        else:
+            values = Constant(batch.constants.get(field.attname))
+
+        if isinstance(values, Constant):
+            value = field.get_db_prep_value(values.value, connection,
+                                            prepared=False)
+            return [value] * len(batch)
+
+        if isinstance(values, array):
+            return values
+
+        prep = field.get_db_prep_value
+        return [prep(value, connection, prepared=False) for value in values]
+
+
+WRITERS = {
+    "orm": OrmWriter,
+    "raw": RawWriter
+}
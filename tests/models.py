@@ -18,3 +18,60 @@ class ComplexModel(models.Model):
 
 class RelationModel(models.Model):
     other = models.ForeignKey(SimpleCharModel, on_delete=models.CASCADE)
+
+
+class TreeModel(models.Model):
+    name = models.CharField(max_length=50)
+    parent = models.ForeignKey("self", null=True, on_delete=models.CASCADE)
+
+
+class ChoiceModel(models.Model):
+    status = models.CharField(max_length=10, choices=[
+        ("draft", "Draft"),
+        ("published", "Published"),
+        ("archived", "Archived")
+    ])
+
+
+class PayloadModel(models.Model):
+    data = models.BinaryField()
+    attachment = models.FileField(upload_to="payloads/%Y")
+    metadata = models.JSONField()
+    duration = models.DurationField()
+    slug = models.SlugField(max_length=20)
+
+
+def upload_to_label(instance, filename):
+    return "uploads/%s" % filename
+
+
+class UploadModel(models.Model):
+    attachment = models.FileField(upload_to=upload_to_label)
+
+
+class IndexedModel(models.Model):
+    name = models.CharField(max_length=50, db_index=True)
+    code = models.CharField(max_length=20, unique=True)
+    value = models.IntegerField()
+    other = models.ForeignKey(SimpleCharModel, on_delete=models.CASCADE)
+
+    class Meta:
+        indexes = [models.Index(fields=["value"], name="indexed_value_idx")]
+
+
+class TimestampedModel(models.Model):
+    name = models.CharField(max_length=50)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+
+class AuthorModel(models.Model):
+    name = models.CharField(max_length=50)
+    featured = models.ForeignKey("BookModel", null=True, related_name="+",
+                                 on_delete=models.SET_NULL)
+
+
+class BookModel(models.Model):
+    title = models.CharField(max_length=50)
+    author = models.ForeignKey(AuthorModel, null=True,
+                               on_delete=models.CASCADE)
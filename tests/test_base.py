@@ -1,8 +1,10 @@
 import datetime
 import random
+import tempfile
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
+from data_seeder import generators
 from data_seeder.base import DataSeeder
 
 from . import models
@@ -135,3 +137,176 @@ class TestComplexModelValueSeed(TestCase):
             self.assertEqual(complex_model.value, self.values["value"])
             self.assertEqual(complex_model.is_true, self.values["is_true"])
             self.assertEqual(complex_model.created, self.values["created"])
+
+
+class TestRelationModelExistingSeed(TestCase):
+
+    def test_uses_existing(self):
+        others = DataSeeder(models.SimpleCharModel, seeds=3).seed()
+        DataSeeder(models.RelationModel, seeds=5).seed()
+
+        pks = {other.pk for other in others}
+        for relation_model in models.RelationModel.objects.all():
+            self.assertIn(relation_model.other_id, pks)
+
+    def test_related_pks(self):
+        others = DataSeeder(models.SimpleCharModel, seeds=2).seed()
+        pks = [other.pk for other in others]
+        DataSeeder(models.RelationModel, seeds=6,
+                   related_pks={"other": pks}).seed()
+
+        for pk in pks:
+            self.assertEqual(
+                models.RelationModel.objects.filter(other_id=pk).count(), 3
+            )
+
+
+class TestTargetCountSeed(TestCase):
+
+    def test_top_up(self):
+        DataSeeder(models.SimpleIntModel, seeds=3).seed()
+        seeds = DataSeeder(models.SimpleIntModel, target_count=10).seed()
+
+        self.assertEqual(len(seeds), 7)
+        self.assertEqual(models.SimpleIntModel.objects.count(), 10)
+
+    def test_reached(self):
+        DataSeeder(models.SimpleIntModel, target_count=5).seed()
+        seeds = DataSeeder(models.SimpleIntModel, target_count=5).seed()
+
+        self.assertEqual(seeds, [])
+        self.assertEqual(models.SimpleIntModel.objects.count(), 5)
+
+    def test_approximate(self):
+        # Backends without an estimate count exactly
+        DataSeeder(models.SimpleIntModel, target_count=4,
+                   approximate_count=True).seed()
+        self.assertEqual(models.SimpleIntModel.objects.count(), 4)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            DataSeeder(models.TreeModel, target_count=4, tree_field="parent")
+
+
+class TestFieldOptionsSeed(TestCase):
+
+    def test_distribution(self):
+        seeds = DataSeeder(models.SimpleIntModel, seeds=50, field_options={
+            "value": {"distribution": "normal", "mean": 100, "stddev": 5,
+                      "range_min": 90, "range_max": 110}
+        }).seed()
+
+        for seed in seeds:
+            self.assertEqual(type(seed.value), int)
+            self.assertTrue(90 <= seed.value <= 110)
+
+    def test_fan_out(self):
+        others = DataSeeder(models.SimpleCharModel, seeds=20).seed()
+        pks = [other.pk for other in others]
+        DataSeeder(models.RelationModel, seeds=200,
+                   related_pks={"other": pks}, field_options={
+                       "other": {"distribution": "zipf", "s": 2}
+                   }).seed()
+
+        hot = models.RelationModel.objects.filter(other_id=pks[0]).count()
+        cold = models.RelationModel.objects.filter(other_id=pks[-1]).count()
+        self.assertTrue(hot > 50)
+        self.assertTrue(hot > cold)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            DataSeeder(models.SimpleIntModel, field_options={
+                "value": {"distribution": "unknown"}
+            })
+
+
+class TestChoiceModelSeed(TestCase):
+
+    def test_choices(self):
+        seeds = DataSeeder(models.ChoiceModel, seeds=30).seed()
+
+        for seed in seeds:
+            self.assertIn(seed.status, {"draft", "published", "archived"})
+
+    def test_weights(self):
+        seeds = DataSeeder(models.ChoiceModel, seeds=30, field_options={
+            "status": {"distribution": "weighted",
+                       "weights": {"draft": 1, "archived": 3}}
+        }).seed()
+
+        statuses = {seed.status for seed in seeds}
+        self.assertTrue(statuses <= {"draft", "archived"})
+
+
+class TestPayloadModelSeed(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        media = override_settings(MEDIA_ROOT=directory.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def test_create(self):
+        DataSeeder(models.PayloadModel, seeds=20).seed()
+
+        for seed in models.PayloadModel.objects.all():
+            self.assertTrue(16 <= len(seed.data) <= 256)
+            self.assertTrue(seed.attachment.name.startswith(
+                "payloads/%d/" % datetime.date.today().year))
+            self.assertTrue(seed.attachment.storage.exists(
+                seed.attachment.name))
+            self.assertIsInstance(seed.metadata, dict)
+            self.assertIsInstance(seed.duration, datetime.timedelta)
+            self.assertTrue(0 < len(seed.slug) <= 20)
+
+        names = models.PayloadModel.objects.values_list("attachment",
+                                                        flat=True)
+        self.assertLessEqual(len(set(names)), 16)
+
+    def test_upload_to_callable(self):
+        DataSeeder(models.UploadModel, seeds=5).seed()
+
+        for seed in models.UploadModel.objects.all():
+            self.assertTrue(seed.attachment.name.startswith("uploads/"))
+            self.assertTrue(seed.attachment.storage.exists(
+                seed.attachment.name))
+
+
+class TestGeneratedValuesSeed(TestCase):
+
+    def test_generator(self):
+        seeds = DataSeeder(models.SimpleIntModel, seeds=10, values={
+            "value": generators.IntegerGenerator(range_min=1, range_max=3)
+        }).seed()
+
+        for seed in seeds:
+            self.assertIn(seed.value, {1, 2, 3})
+
+    def test_callable(self):
+        counter = iter(range(100))
+        seeds = DataSeeder(models.SimpleIntModel, seeds=5, values={
+            "value": lambda: next(counter)
+        }).seed()
+
+        self.assertEqual([seed.value for seed in seeds], [0, 1, 2, 3, 4])
+
+    def test_batch_callable(self):
+        @generators.batch_values
+        def squares(size, rng):
+            return [i * i for i in range(size)]
+
+        seeds = DataSeeder(models.SimpleIntModel, seeds=4, batch_size=2,
+                           values={"value": squares}).seed()
+
+        self.assertEqual([seed.value for seed in seeds], [0, 1, 0, 1])
+
+    def test_batch_callable_size(self):
+        @generators.batch_values
+        def too_few(size, rng):
+            return [1]
+
+        with self.assertRaises(ValueError):
+            DataSeeder(models.SimpleIntModel, seeds=4,
+                       values={"value": too_few}).seed()
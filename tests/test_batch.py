@@ -0,0 +1,69 @@
+from array import array
+
+from django.test import TestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.batch import ColumnarBatch, Constant
+
+from . import models
+
+
+class TestColumnarBatch(TestCase):
+
+    def setUp(self):
+        self.batch = ColumnarBatch(models.ComplexModel, 3)
+        self.batch["name"] = ["a", "b", "c"]
+        self.batch["value"] = array("q", [1, 2, 3])
+        self.batch["is_true"] = Constant(True)
+
+    def test_len(self):
+        self.assertEqual(len(self.batch), 3)
+
+    def test_contains(self):
+        self.assertIn("name", self.batch)
+        self.assertIn("is_true", self.batch)
+        self.assertNotIn("created", self.batch)
+
+    def test_rows(self):
+        rows = list(self.batch.rows(["name", "value", "is_true", "created"]))
+        self.assertEqual(rows, [
+            ("a", 1, True, None),
+            ("b", 2, True, None),
+            ("c", 3, True, None)
+        ])
+
+    def test_instances(self):
+        instances = self.batch.instances()
+
+        self.assertEqual(len(instances), 3)
+        self.assertIs(instances, self.batch.instances())
+        self.assertEqual(instances[1].name, "b")
+        self.assertEqual(instances[1].value, 2)
+        self.assertTrue(instances[1].is_true)
+        self.assertIsNone(instances[1].pk)
+
+
+class TestDataSeederBatch(TestCase):
+
+    def test_generate_batch(self):
+        batch = DataSeeder(models.ComplexModel).generate_batch(0, 5)
+
+        self.assertEqual(len(batch), 5)
+        self.assertIsInstance(batch.columns["value"], array)
+        self.assertEqual(len(batch.columns["name"]), 5)
+        self.assertEqual(models.ComplexModel.objects.count(), 0)
+
+    def test_static_values_are_constant(self):
+        batch = DataSeeder(models.SimpleIntModel, values={"value": 3}) \
+            .generate_batch(0, 5)
+
+        self.assertEqual(batch.constants["value"], 3)
+
+    def test_return_pks(self):
+        pks = DataSeeder(models.SimpleIntModel, seeds=4,
+                         return_seeds=False).seed()
+
+        self.assertEqual(
+            sorted(pks),
+            sorted(models.SimpleIntModel.objects.values_list("pk", flat=True))
+        )
@@ -0,0 +1,81 @@
+import json
+import os
+import random
+import tempfile
+
+from django.test import TestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.checkpoint import Checkpoint, CheckpointError
+
+from . import models
+
+
+class TestCheckpoint(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "checkpoint.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_tree(self):
+        with self.assertRaises(ValueError):
+            DataSeeder(models.TreeModel, tree_field="parent", depth=2,
+                       checkpoint=Checkpoint(self.path))
+
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_records_progress(self):
+        DataSeeder(models.SimpleCharModel, seeds=7, batch_size=3,
+                   checkpoint=Checkpoint(self.path)).seed()
+
+        with open(self.path) as checkpoint_file:
+            entry = json.load(checkpoint_file)["models"]
+
+        entry = entry["tests.SimpleCharModel"]
+
+        self.assertEqual(entry["seeds"], 7)
+        self.assertEqual(entry["committed"], 7)
+
+    def test_resume_completed(self):
+        DataSeeder(models.SimpleCharModel, seeds=5,
+                   checkpoint=Checkpoint(self.path)).seed()
+        DataSeeder(models.SimpleCharModel, seeds=5,
+                   checkpoint=Checkpoint(self.path, resume=True)).seed()
+
+        self.assertEqual(models.SimpleCharModel.objects.count(), 5)
+
+    def test_resume_matches_uninterrupted_run(self):
+        random.seed(1)
+        DataSeeder(models.SimpleCharModel, seeds=10, batch_size=5).seed()
+        expected = list(models.SimpleCharModel.objects.order_by("pk")
+                        .values_list("name", flat=True))
+        models.SimpleCharModel.objects.all().delete()
+
+        # Interrupt the run after the first batch has been committed
+        random.seed(1)
+        DataSeeder(models.SimpleCharModel, seeds=5, batch_size=5,
+                   checkpoint=Checkpoint(self.path)).seed()
+
+        random.seed(2)
+        DataSeeder(models.SimpleCharModel, seeds=10, batch_size=5,
+                   checkpoint=Checkpoint(self.path, resume=True)).seed()
+
+        names = list(models.SimpleCharModel.objects.order_by("pk")
+                     .values_list("name", flat=True))
+        self.assertEqual(names, expected)
+
+    def test_resume_related(self):
+        DataSeeder(models.RelationModel, seeds=2, generate_related=True,
+                   checkpoint=Checkpoint(self.path)).seed()
+        DataSeeder(models.RelationModel, seeds=4, generate_related=True,
+                   checkpoint=Checkpoint(self.path, resume=True)).seed()
+
+        self.assertEqual(models.RelationModel.objects.count(), 4)
+        self.assertEqual(models.SimpleCharModel.objects.count(), 1)
+
+    def test_resume_missing(self):
+        with self.assertRaises(CheckpointError):
+            Checkpoint(self.path, resume=True)
@@ -0,0 +1,84 @@
+from django.test import TestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.churn import select_pks
+from data_seeder.writers import RawWriter
+
+from . import models
+
+
+class TestSelectPks(TestCase):
+
+    def setUp(self):
+        DataSeeder(models.SimpleIntModel, seeds=100).seed()
+        self.queryset = models.SimpleIntModel.objects.all()
+
+    def test_sample(self):
+        pks = select_pks(self.queryset, 10, chunk_size=7)
+
+        self.assertEqual(len(set(pks)), 10)
+        self.assertEqual(pks, sorted(pks))
+        self.assertEqual(self.queryset.filter(pk__in=pks).count(), 10)
+
+    def test_range(self):
+        for i in range(20):
+            pks = select_pks(self.queryset, 10, selection="range")
+
+            self.assertEqual(pks, list(range(pks[0], pks[0] + 10)))
+
+    def test_more_than_rows(self):
+        self.assertEqual(len(select_pks(self.queryset, 500)), 100)
+        self.assertEqual(len(select_pks(self.queryset, 500,
+                                        selection="range")), 100)
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            select_pks(self.queryset, 1, selection="other")
+
+
+class TestChurnSeed(TestCase):
+
+    def setUp(self):
+        DataSeeder(models.SimpleIntModel, seeds=20,
+                   values={"value": -1}).seed()
+
+    def test_update(self):
+        report = DataSeeder(models.SimpleIntModel, batch_size=3,
+                            values={"value": 7}).churn(update=0.25)
+
+        self.assertEqual(report.updated, 5)
+        self.assertEqual(models.SimpleIntModel.objects.filter(value=7)
+                         .count(), 5)
+        self.assertEqual(models.SimpleIntModel.objects.count(), 20)
+
+    def test_delete(self):
+        report = DataSeeder(models.SimpleIntModel, batch_size=3) \
+            .churn(delete=0.5, selection="range")
+
+        self.assertEqual(report.deleted, 10)
+        self.assertEqual(models.SimpleIntModel.objects.count(), 10)
+        self.assertIn("deleted 10 row(s)", report.summary())
+
+    def test_update_and_delete(self):
+        DataSeeder(models.SimpleIntModel, values={"value": 7},
+                   writer=RawWriter).churn(update=0.5, delete=0.5)
+
+        # Updated rows are never deleted
+        self.assertEqual(models.SimpleIntModel.objects.count(), 10)
+        self.assertEqual(models.SimpleIntModel.objects.filter(value=7)
+                         .count(), 10)
+
+    def test_fields(self):
+        DataSeeder(models.ComplexModel, seeds=5,
+                   values={"name": "old", "value": 1}).seed()
+        DataSeeder(models.ComplexModel, values={"name": "new", "value": 2}) \
+            .churn(update=1, fields=["name"])
+
+        self.assertEqual(
+            set(models.ComplexModel.objects.values_list("name", "value")),
+            {("new", 1)}
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            DataSeeder(models.SimpleIntModel).churn(update=0.8, delete=0.4)
@@ -0,0 +1,63 @@
+import os
+import random
+import tempfile
+
+from unittest import TestCase
+
+from build_corpora import SOURCES_DIR, read_source
+from data_seeder.corpus import Corpus, CorpusError, get_corpus, write_corpus
+
+
+class TestCorpus(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "test.bin")
+        write_corpus(self.path, ["alpha", "béta", "", "gamma"])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_getitem(self):
+        corpus = Corpus(self.path)
+        self.assertEqual(len(corpus), 4)
+        self.assertEqual([corpus[i] for i in range(4)],
+                         ["alpha", "béta", "", "gamma"])
+
+        with self.assertRaises(IndexError):
+            corpus[4]
+
+    def test_sample(self):
+        corpus = Corpus(self.path)
+
+        random.seed(1)
+        values = corpus.sample(10)
+        random.seed(1)
+
+        self.assertEqual(corpus.sample(10), values)
+        self.assertTrue(set(values) <= {"alpha", "béta", "", "gamma"})
+
+    def test_invalid(self):
+        with open(self.path, "wb") as corpus_file:
+            corpus_file.write(b"not a corpus")
+
+        with self.assertRaises(CorpusError):
+            len(Corpus(self.path))
+
+    def test_missing(self):
+        with self.assertRaises(CorpusError):
+            len(Corpus(os.path.join(self.directory.name, "missing.bin")))
+
+    def test_bundled(self):
+        self.assertIs(get_corpus("words"), get_corpus("words"))
+        self.assertTrue(len(get_corpus("first_names")) > 1000)
+
+    def test_sources(self):
+        # The bundled corpora are up to date with their source lists
+        for name in ["cities", "first_names", "last_names", "street_names",
+                     "street_suffixes", "words"]:
+            values = read_source(os.path.join(SOURCES_DIR, "%s.txt" % name))
+            corpus = get_corpus(name)
+
+            self.assertEqual(len(corpus), len(values))
+            self.assertEqual([corpus[i] for i in range(len(corpus))], values)
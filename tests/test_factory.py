@@ -0,0 +1,86 @@
+from array import array
+
+from django.db.models.signals import post_init
+from django.test import TestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.batch import ColumnarBatch, Constant
+from data_seeder.factory import get_factory
+
+from . import models
+
+
+class TestRowFactory(TestCase):
+
+    def setUp(self):
+        self.batch = ColumnarBatch(models.ComplexModel, 3)
+        self.batch["name"] = ["a", "b", "c"]
+        self.batch["value"] = array("q", [1, 2, 3])
+        self.batch["is_true"] = Constant(True)
+
+    def test_matches_model_init(self):
+        factory = get_factory(self.batch)
+        instances = factory(self.batch)
+        expected = ColumnarBatch(models.ComplexModel, 3)
+        expected.columns = self.batch.columns
+        expected.constants = self.batch.constants
+
+        for instance, other in zip(instances, expected.instances()):
+            self.assertIsInstance(instance, models.ComplexModel)
+            self.assertEqual(
+                [getattr(instance, f.attname)
+                 for f in models.ComplexModel._meta.concrete_fields],
+                [getattr(other, f.attname)
+                 for f in models.ComplexModel._meta.concrete_fields]
+            )
+            self.assertTrue(instance._state.adding)
+            self.assertIsNone(instance._state.db)
+
+        self.assertIsNot(instances[0]._state, instances[1]._state)
+
+    def test_cached_per_shape(self):
+        other = ColumnarBatch(models.ComplexModel, 1)
+        other["name"] = ["d"]
+        other["value"] = array("q", [4])
+        other["is_true"] = Constant(False)
+
+        self.assertIs(get_factory(self.batch), get_factory(other))
+
+        other["is_true"] = [False]
+        self.assertIsNot(get_factory(self.batch), get_factory(other))
+
+    def test_init_signals(self):
+        def receiver(**kwargs):
+            pass
+
+        post_init.connect(receiver, sender=models.ComplexModel)
+        try:
+            self.assertIsNone(get_factory(self.batch))
+        finally:
+            post_init.disconnect(receiver, sender=models.ComplexModel)
+
+
+class TestCompiledSeed(TestCase):
+
+    def test_seed(self):
+        DataSeeder(models.ComplexModel, seeds=5, compiled=True).seed()
+
+        self.assertEqual(models.ComplexModel.objects.count(), 5)
+
+    def test_related(self):
+        DataSeeder(models.RelationModel, seeds=3, generate_related=True,
+                   compiled=True).seed()
+
+        other = models.SimpleCharModel.objects.get()
+        self.assertEqual(
+            list(models.RelationModel.objects.values_list("other", flat=True)),
+            [other.pk] * 3
+        )
+
+    def test_batch_factory(self):
+        batch = DataSeeder(models.SimpleIntModel, compiled=True) \
+            .generate_batch(0, 2)
+
+        self.assertIsNotNone(batch.factory)
+        self.assertEqual([instance.value for instance in batch.instances()],
+                         list(batch.columns["value"]))
@@ -1,9 +1,15 @@
 import datetime
+import hashlib
+import json
+import tempfile
 import uuid
 
-from unittest import TestCase
+from array import array
+from unittest import TestCase, skipIf
 from decimal import Decimal
 
+from django.core.files.storage import FileSystemStorage
+
 from data_seeder import generators
 
 
@@ -242,3 +248,332 @@ class TestUuidGenerator(TestCase):
         value = self.generator.generate()
         self.assertIsNotNone(value)
         self.assertEquals(type(value), uuid.UUID)
+
+
+class TestWordGenerator(TestCase):
+
+    def setUp(self):
+        self.generator = generators.WordGenerator(max_length=3)
+
+    def test_generate(self):
+        value = self.generator.generate()
+        self.assertEquals(type(value), str)
+        self.assertTrue(0 < len(value) <= 3)
+
+
+class TestNameGenerator(TestCase):
+
+    def setUp(self):
+        self.generator = generators.NameGenerator()
+
+    def test_generate(self):
+        value = self.generator.generate()
+        self.assertEquals(type(value), str)
+        self.assertEquals(len(value.split(" ")), 2)
+
+
+class TestSentenceGenerator(TestCase):
+
+    def setUp(self):
+        self.generator = generators.SentenceGenerator(min_words=3,
+                                                      max_words=5)
+
+    def test_generate_batch(self):
+        for value in self.generator.generate_batch(20):
+            self.assertTrue(value[0].isupper())
+            self.assertTrue(value.endswith("."))
+            self.assertTrue(3 <= len(value.split(" ")) <= 5)
+
+
+class TestAddressGenerator(TestCase):
+
+    def setUp(self):
+        self.generator = generators.AddressGenerator()
+
+    def test_generate(self):
+        value = self.generator.generate()
+        self.assertEquals(type(value), str)
+        self.assertTrue(value.split(" ")[0].isdigit())
+        self.assertIn(", ", value)
+
+
+class TestDistributionGenerators(TestCase):
+
+    def test_generate_batch(self):
+        for generator in (generators.NormalGenerator(mean=10, stddev=2),
+                          generators.LogNormalGenerator(),
+                          generators.ExponentialGenerator(rate=2),
+                          generators.HistogramGenerator(
+                              bins=[(0, 10, 1), (100, 110, 3)])):
+            values = generator.generate_batch(20)
+            self.assertEqual(type(values), array)
+            self.assertEqual(values.typecode, "d")
+            self.assertEqual(len(values), 20)
+
+    def test_integer(self):
+        values = generators.NormalGenerator(
+            mean=0, stddev=100, integer=True, range_min=-10, range_max=10
+        ).generate_batch(50)
+
+        self.assertEqual(values.typecode, "q")
+        self.assertTrue(all(-10 <= value <= 10 for value in values))
+
+    def test_histogram(self):
+        values = generators.HistogramGenerator(
+            bins=[(0, 1, 1), (5, 6, 0)]
+        ).generate_batch(50)
+        self.assertTrue(all(0 <= value <= 1 for value in values))
+
+    def test_zipf(self):
+        values = generators.ZipfGenerator(n=10, s=2).generate_batch(500)
+
+        self.assertTrue(all(1 <= value <= 10 for value in values))
+        self.assertTrue(values.count(1) > values.count(10))
+
+
+@skipIf(generators.numpy is None, "numpy is not installed")
+class TestDistributionGeneratorsNumpy(TestCase):
+
+    def test_generate_batch(self):
+        for generator in (generators.NormalGenerator(mean=10, stddev=2),
+                          generators.LogNormalGenerator(),
+                          generators.ExponentialGenerator(rate=2)):
+            rng = generators.numpy.random.default_rng(0)
+            self.assertIsNotNone(generator._sample_numpy(rng, 20))
+
+            values = generator.generate_batch(20)
+            self.assertEqual(type(values), array)
+            self.assertEqual(values.typecode, "d")
+            self.assertEqual(len(values), 20)
+
+    def test_integer(self):
+        values = generators.NormalGenerator(
+            mean=0, stddev=100, integer=True, range_min=-10, range_max=10
+        ).generate_batch(500)
+
+        self.assertEqual(values.typecode, "q")
+        self.assertTrue(all(type(value) is int for value in values))
+        self.assertTrue(all(-10 <= value <= 10 for value in values))
+
+    def test_weighted_choice(self):
+        values = generators.WeightedChoiceGenerator(
+            choices=["a", "b", "c"], weights=[1, 0, 9]
+        ).generate_batch(500)
+
+        self.assertEqual(len(values), 500)
+        self.assertNotIn("b", values)
+        self.assertTrue(values.count("c") > values.count("a"))
+
+
+class TestWeightedChoiceGenerator(TestCase):
+
+    def test_generate_batch(self):
+        generator = generators.WeightedChoiceGenerator(
+            choices=["a", "b", "c"], weights=[1, 0, 9]
+        )
+        values = generator.generate_batch(500)
+
+        self.assertEqual(len(values), 500)
+        self.assertNotIn("b", values)
+        self.assertTrue(values.count("c") > values.count("a"))
+
+    def test_alias_table(self):
+        generator = generators.WeightedChoiceGenerator(
+            choices=["a", "b", "c", "d"], weights=[1, 2, 3, 4]
+        )
+
+        # Every column of the table holds its share of the total weight
+        shares = [0.0] * 4
+        for column in range(4):
+            probability = generator._probabilities[column]
+            shares[column] += probability / 4
+            shares[generator._aliases[column]] += (1 - probability) / 4
+
+        for share, weight in zip(shares, [1, 2, 3, 4]):
+            self.assertAlmostEqual(share, weight / 10)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            generators.WeightedChoiceGenerator(choices=["a"], weights=[1, 2])
+
+
+class TestBinaryGenerator(TestCase):
+
+    def test_generate_batch(self):
+        values = generators.BinaryGenerator(min_length=4, max_length=8) \
+            .generate_batch(20)
+        buffer = generators.get_random_buffer()
+
+        for value in values:
+            self.assertIsInstance(value, memoryview)
+            self.assertIs(value.obj, buffer)
+            self.assertTrue(4 <= len(value) <= 8)
+
+    def test_large(self):
+        size = generators.BUFFER_SIZE * 2
+        value = generators.BinaryGenerator(min_length=size, max_length=size) \
+            .generate()
+
+        self.assertEqual(len(value), size)
+
+
+class TestFileGenerator(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.storage = FileSystemStorage(location=directory.name)
+
+    def test_generate_batch(self):
+        generator = generators.FileGenerator(storage=self.storage, blobs=3,
+                                             min_size=10, max_size=20)
+        names = generator.generate_batch(100)
+
+        self.assertEqual(len(set(names)), 3)
+        self.assertEqual(len(self.storage.listdir("seeds")[1]), 3)
+
+        for name in set(names):
+            with self.storage.open(name) as blob:
+                content = blob.read()
+
+            self.assertTrue(10 <= len(content) <= 20)
+            self.assertEqual(name, "seeds/%s.bin" %
+                             hashlib.sha256(content).hexdigest())
+
+    def test_reused(self):
+        first = generators.FileGenerator(storage=self.storage, blobs=2)
+        second = generators.FileGenerator(storage=self.storage, blobs=2)
+
+        self.assertEqual(sorted(set(first.generate_batch(50))),
+                         sorted(set(second.generate_batch(50))))
+        self.assertEqual(len(self.storage.listdir("seeds")[1]), 2)
+
+    def test_upload_to(self):
+        generator = generators.FileGenerator(
+            storage=self.storage, blobs=2,
+            upload_to=lambda instance, filename: "custom/" + filename
+        )
+
+        for name in generator.generate_batch(10):
+            self.assertTrue(name.startswith("custom/"))
+            self.assertTrue(self.storage.exists(name))
+
+    def test_image(self):
+        generator = generators.ImageGenerator(storage=self.storage, blobs=1)
+
+        with self.storage.open(generator.generate()) as image:
+            content = image.read()
+
+        self.assertTrue(content.startswith(b"\x89PNG\r\n\x1a\n"))
+        self.assertEqual(content[16:24], b"\0\0\0\x10\0\0\0\x10")
+
+
+class TestJsonGenerator(TestCase):
+
+    def test_generate_batch(self):
+        values = generators.JsonGenerator(max_keys=3).generate_batch(20)
+
+        for value in values:
+            self.assertIsInstance(value, dict)
+            self.assertTrue(1 <= len(value) <= 3)
+            self.assertEqual(json.loads(json.dumps(value)), value)
+
+
+class TestDurationGenerator(TestCase):
+
+    def test_generate(self):
+        value = generators.DurationGenerator(
+            min_duration=datetime.timedelta(hours=1),
+            max_duration=datetime.timedelta(hours=2)
+        ).generate()
+
+        self.assertIsInstance(value, datetime.timedelta)
+        self.assertTrue(datetime.timedelta(hours=1) <= value <=
+                        datetime.timedelta(hours=2))
+
+
+class TestSlugGenerator(TestCase):
+
+    def test_generate_batch(self):
+        values = generators.SlugGenerator(max_length=20).generate_batch(50)
+
+        self.assertEqual(len(set(values)), 50)
+        for value in values:
+            self.assertRegex(value, r"^[a-z0-9]+(-[a-z0-9]+)*$")
+            self.assertLessEqual(len(value), 20)
+
+
+class TestArrayGenerator(TestCase):
+
+    def test_generate_batch(self):
+        values = generators.ArrayGenerator(
+            generators.BooleanGenerator(), min_length=1, max_length=3
+        ).generate_batch(20)
+
+        for value in values:
+            self.assertIsInstance(value, list)
+            self.assertTrue(1 <= len(value) <= 3)
+            self.assertTrue(all(isinstance(item, bool) for item in value))
+
+
+class TestBulkTextGenerator(TestCase):
+
+    def test_generate_batch(self):
+        values = generators.BulkTextGenerator(min_size=100, max_size=200) \
+            .generate_batch(20)
+        text = generators.get_text_buffer()
+
+        for value in values:
+            self.assertTrue(100 <= len(value) <= 200)
+            self.assertIn(value, text)
+
+    def test_larger_than_buffer(self):
+        size = generators.TEXT_BUFFER_SIZE * 2 + 10
+        value = generators.BulkTextGenerator(
+            min_size=size, max_size=size, source="random"
+        ).generate()
+
+        self.assertEqual(len(value), size)
+        self.assertTrue(value.startswith(generators.get_text_buffer("random")))
+
+    def test_distribution(self):
+        generator = generators.BulkTextGenerator(
+            min_size=10, max_size=1000,
+            distribution={"distribution": "weighted", "choices": [10, 500],
+                          "weights": [1, 1]}
+        )
+
+        values = generator.generate_batch(50)
+        self.assertEqual({len(value) for value in values}, {10, 500})
+
+        generator = generators.BulkTextGenerator(
+            min_size=10, max_size=1000,
+            distribution={"distribution": "lognormal", "mu": 5, "sigma": 2}
+        )
+
+        for value in generator.generate_batch(50):
+            self.assertTrue(10 <= len(value) <= 1000)
+
+    def test_unknown_source(self):
+        with self.assertRaises(ValueError):
+            generators.BulkTextGenerator(source="other")
+
+
+class TestGenerateBatch(TestCase):
+
+    def test_typed(self):
+        values = generators.IntegerGenerator().generate_batch(10)
+        self.assertEqual(type(values), array)
+        self.assertEqual(len(values), 10)
+
+    def test_untyped(self):
+        values = generators.StringGenerator().generate_batch(10)
+        self.assertEqual(type(values), list)
+        self.assertEqual(len(values), 10)
+
+    def test_overflow(self):
+        values = generators.IntegerGenerator(
+            range_min=2 ** 70,
+            range_max=2 ** 71
+        ).generate_batch(10)
+        self.assertEqual(type(values), list)
@@ -0,0 +1,67 @@
+from django.db import connection
+from django.test import TransactionTestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.indexes import DeferredIndexError, DeferredIndexes
+
+from . import models
+
+
+class BrokenIndexes(DeferredIndexes):
+
+    def restore(self):
+        super().restore()
+        raise DeferredIndexError("Could not rebuild")
+
+
+class TestDeferredIndexes(TransactionTestCase):
+
+    def get_indexes(self, model):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(
+                cursor, model._meta.db_table)
+
+        return {
+            tuple(details["columns"]) for details in constraints.values()
+            if details["index"] and not details["unique"]
+        }
+
+    def test_defers_indexes(self):
+        DataSeeder(models.SimpleCharModel, seeds=3).seed()
+        before = self.get_indexes(models.IndexedModel)
+
+        with DeferredIndexes([models.IndexedModel]) as indexes:
+            self.assertEqual(
+                {(kind, getattr(item, "name")) for model, kind, item
+                 in indexes.dropped},
+                {("field", "name"), ("field", "other"),
+                 ("index", "indexed_value_idx")}
+            )
+            self.assertEqual(self.get_indexes(models.IndexedModel), set())
+
+            DataSeeder(models.IndexedModel, seeds=20).seed()
+
+        self.assertEqual(self.get_indexes(models.IndexedModel), before)
+        self.assertEqual(models.IndexedModel.objects.count(), 20)
+        self.assertEqual(indexes.dropped, [])
+
+    def test_restores_on_failure(self):
+        before = self.get_indexes(models.IndexedModel)
+        self.assertEqual(len(before), 3)
+
+        with self.assertRaises(ZeroDivisionError):
+            with DeferredIndexes([models.IndexedModel]):
+                1 // 0
+
+        self.assertEqual(self.get_indexes(models.IndexedModel), before)
+
+    def test_chains_failure(self):
+        with self.assertRaises(DeferredIndexError) as raised:
+            with BrokenIndexes([models.IndexedModel]):
+                1 // 0
+
+        self.assertIsInstance(raised.exception.__cause__, ZeroDivisionError)
+
+    def test_no_indexes(self):
+        with DeferredIndexes([models.SimpleIntModel]) as indexes:
+            self.assertEqual(indexes.dropped, [])
@@ -0,0 +1,62 @@
+from django.test import TestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.keys import ExistingKeys
+
+from . import models
+
+
+class TestExistingKeys(TestCase):
+
+    def setUp(self):
+        DataSeeder(models.SimpleCharModel, seeds=50).seed()
+        self.queryset = models.SimpleCharModel.objects.all()
+        self.pks = list(self.queryset.order_by("pk")
+                        .values_list("pk", flat=True))
+
+    def test_in_order(self):
+        keys = ExistingKeys(self.queryset, chunk_size=7)
+
+        # The count, then one query per chunk
+        with self.assertNumQueries(1 + 8):
+            self.assertEqual(list(keys), self.pks)
+
+        self.assertEqual(len(keys), 50)
+        self.assertEqual(keys[-1], self.pks[-1])
+        self.assertEqual(keys[23], self.pks[23])
+
+        with self.assertRaises(IndexError):
+            keys[50]
+
+    def test_sample(self):
+        keys = ExistingKeys(self.queryset).sample(200)
+
+        self.assertEqual(len(keys), 200)
+        self.assertTrue(set(keys) <= set(self.pks))
+
+    def test_sample_gaps(self):
+        self.queryset.filter(pk__in=self.pks[1::3]).delete()
+        remaining = set(self.queryset.values_list("pk", flat=True))
+
+        keys = ExistingKeys(self.queryset).sample(200)
+
+        self.assertEqual(len(keys), 200)
+        self.assertTrue(set(keys) <= remaining)
+
+    def test_sample_sparse(self):
+        self.queryset.exclude(pk__in=[self.pks[0], self.pks[-1]]).delete()
+
+        keys = ExistingKeys(self.queryset).sample(20)
+
+        self.assertEqual(set(keys), {self.pks[0], self.pks[-1]})
+
+    def test_pool(self):
+        self.assertEqual(ExistingKeys(self.queryset).pool(), self.pks)
+
+    def test_seed(self):
+        self.queryset.filter(pk__in=self.pks[::2]).delete()
+
+        DataSeeder(models.RelationModel, seeds=100).seed()
+
+        self.assertFalse(models.RelationModel.objects.exclude(
+            other__in=self.queryset).exists())
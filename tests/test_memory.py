@@ -0,0 +1,44 @@
+from django.test import TestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.memory import MemoryReport
+from data_seeder.writers import RawWriter
+
+from . import models
+
+
+class TestMemoryReport(TestCase):
+
+    def setUp(self):
+        self.memory = MemoryReport(top=3)
+        self.memory.start()
+        self.addCleanup(self.memory.stop)
+
+    def test_batches(self):
+        DataSeeder(models.ComplexModel, seeds=5, batch_size=2,
+                   hooks=[self.memory]).seed()
+
+        self.assertEqual([record["rows"] for record in self.memory.batches],
+                         [2, 2, 1])
+
+        for record in self.memory.batches:
+            self.assertEqual(record["model"], "tests.ComplexModel")
+            self.assertGreater(record["generate"], 0)
+            self.assertGreater(record["build"], 0)
+            self.assertGreater(record["write"], 0)
+
+    def test_raw_writer(self):
+        DataSeeder(models.SimpleIntModel, seeds=2, writer=RawWriter,
+                   hooks=[self.memory]).seed()
+
+        self.assertIsNone(self.memory.batches[0]["build"])
+
+    def test_report(self):
+        DataSeeder(models.SimpleCharModel, seeds=10,
+                   hooks=[self.memory]).seed()
+        report = self.memory.report().splitlines()
+
+        self.assertIn("tests.SimpleCharModel: 1 batch(es), 10 row(s)", report)
+        self.assertTrue(any(line.startswith("  write    peak")
+                            for line in report))
+        self.assertLessEqual(len(self.memory.top_allocations()), 3)
@@ -0,0 +1,129 @@
+import json
+
+from django.test import TestCase, TransactionTestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.hooks import SeedHooks
+from data_seeder.metrics import MetricsCollector
+from data_seeder.plan import SeedPlan
+
+from . import models
+
+
+class RecordingHooks(SeedHooks):
+
+    def __init__(self):
+        self.calls = []
+
+    def on_plan_compiled(self, seeder, rows, fields, elapsed_ns):
+        self.calls.append(("compiled", rows, fields))
+
+    def on_batch_generated(self, seeder, batch, rows, nbytes, elapsed_ns):
+        self.calls.append(("generated", rows, nbytes > 0, elapsed_ns > 0))
+
+    def on_batch_flushed(self, seeder, batch, rows, nbytes, elapsed_ns):
+        self.calls.append(("flushed", rows, nbytes > 0, elapsed_ns > 0))
+
+    def on_error(self, seeder, error, rows, elapsed_ns):
+        self.calls.append(("error", type(error), rows))
+
+
+class TestSeedHooks(TestCase):
+
+    def test_hooks(self):
+        hooks = RecordingHooks()
+        DataSeeder(models.ComplexModel, seeds=5, batch_size=3,
+                   hooks=[hooks]).seed()
+
+        self.assertEqual(hooks.calls, [
+            ("compiled", 5, 5),
+            ("generated", 3, True, True),
+            ("flushed", 3, True, True),
+            ("generated", 2, True, True),
+            ("flushed", 2, True, True)
+        ])
+
+    def test_error(self):
+        hooks = RecordingHooks()
+        seeder = DataSeeder(models.SimpleIntModel, seeds=4, batch_size=2,
+                            values={"value": lambda: 1 // 0},
+                            hooks=[hooks])
+
+        with self.assertRaises(ZeroDivisionError):
+            seeder.seed()
+
+        self.assertEqual(hooks.calls[-1], ("error", ZeroDivisionError, 0))
+
+
+class TestPipelinedSeedHooks(TransactionTestCase):
+
+    def test_pipelined(self):
+        hooks = RecordingHooks()
+        DataSeeder(models.SimpleIntModel, seeds=4, batch_size=2,
+                   pipeline=True, hooks=[hooks]).seed()
+
+        self.assertEqual(
+            [call for call in hooks.calls if call[0] == "flushed"],
+            [("flushed", 2, True, True)] * 2
+        )
+
+
+class TestMetricsCollector(TestCase):
+
+    def setUp(self):
+        self.metrics = MetricsCollector()
+
+    def seed(self):
+        plan = SeedPlan.from_dict({"models": [
+            {"model": "tests.SimpleCharModel", "seeds": 3},
+            {"model": "tests.RelationModel", "relations": {"other": 2}}
+        ], "batch_size": 4})
+        plan.hooks = [self.metrics]
+        plan.run()
+
+    def test_to_dict(self):
+        self.seed()
+        metrics = self.metrics.to_dict()["models"]
+
+        self.assertEqual(set(metrics), {"tests.SimpleCharModel",
+                                        "tests.RelationModel"})
+
+        phases = metrics["tests.RelationModel"]["phases"]
+        self.assertEqual(phases["compile"]["count"], 1)
+        self.assertEqual(phases["generate"]["count"], 2)
+        self.assertEqual(phases["generate"]["rows"], 6)
+        self.assertEqual(phases["flush"]["rows"], 6)
+        self.assertGreater(phases["flush"]["bytes"], 0)
+        self.assertEqual(phases["flush"]["buckets"][-1], ["+Inf", 2])
+        self.assertEqual(metrics["tests.RelationModel"]["errors"], 0)
+
+        json.loads(self.metrics.to_json())
+
+    def test_to_prometheus(self):
+        self.seed()
+        lines = self.metrics.to_prometheus().splitlines()
+
+        self.assertIn("# TYPE data_seeder_phase_duration_seconds histogram",
+                      lines)
+        self.assertIn('data_seeder_phase_duration_seconds_count{'
+                      'model="tests.SimpleCharModel",phase="flush"} 1', lines)
+        self.assertIn('data_seeder_rows_total{model="tests.RelationModel",'
+                      'phase="flush"} 6', lines)
+        self.assertIn('data_seeder_phase_duration_seconds_bucket{'
+                      'model="tests.RelationModel",phase="generate",'
+                      'le="+Inf"} 2', lines)
+
+    def test_errors(self):
+        with self.assertRaises(ZeroDivisionError):
+            DataSeeder(models.SimpleIntModel,
+                       values={"value": lambda: 1 // 0},
+                       hooks=[self.metrics]).seed()
+
+        self.assertIn('data_seeder_errors_total{model="tests.SimpleIntModel"}'
+                      ' 1', self.metrics.to_prometheus().splitlines())
+
+    def test_reset(self):
+        self.seed()
+        self.metrics.reset()
+
+        self.assertEqual(self.metrics.to_dict(), {"models": {}})
@@ -0,0 +1,61 @@
+import os
+import random
+import tempfile
+
+from django.db import IntegrityError
+from django.test import TransactionTestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.checkpoint import Checkpoint
+from data_seeder.writers import OrmWriter
+
+from . import models
+
+
+class FailingWriter(OrmWriter):
+
+    def write(self, batch):
+        if models.SimpleIntModel.objects.exists():
+            raise IntegrityError("Second batch failed")
+
+        super().write(batch)
+
+
+class TestPipelinedSeed(TransactionTestCase):
+
+    def test_create_many(self):
+        pks = DataSeeder(models.SimpleIntModel, seeds=25, batch_size=4,
+                         pipeline=True, return_seeds=False).seed()
+
+        self.assertEqual(len(pks), 25)
+        self.assertEqual(models.SimpleIntModel.objects.count(), 25)
+
+    def test_error(self):
+        seeder = DataSeeder(models.SimpleIntModel, seeds=50, batch_size=5,
+                            pipeline=True, writer=FailingWriter)
+
+        with self.assertRaises(IntegrityError):
+            seeder.seed()
+
+        self.assertEqual(models.SimpleIntModel.objects.count(), 5)
+
+    def test_checkpoint(self):
+        random.seed(1)
+        DataSeeder(models.SimpleCharModel, seeds=10, batch_size=5).seed()
+        expected = list(models.SimpleCharModel.objects.order_by("pk")
+                        .values_list("name", flat=True))
+        models.SimpleCharModel.objects.all().delete()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "checkpoint.json")
+
+            random.seed(1)
+            DataSeeder(models.SimpleCharModel, seeds=5, batch_size=5,
+                       pipeline=True, checkpoint=Checkpoint(path)).seed()
+            DataSeeder(models.SimpleCharModel, seeds=10, batch_size=5,
+                       pipeline=True,
+                       checkpoint=Checkpoint(path, resume=True)).seed()
+
+        names = list(models.SimpleCharModel.objects.order_by("pk")
+                     .values_list("name", flat=True))
+        self.assertEqual(names, expected)
@@ -0,0 +1,199 @@
+import json
+import os
+import tempfile
+
+from django.test import TestCase, TransactionTestCase
+
+from data_seeder.plan import PlanError, PlanStep, SeedPlan
+
+from . import models
+
+
+def seventeen():
+    return 17
+
+
+class TestSeedPlan(TestCase):
+
+    def test_dependency_order(self):
+        plan = SeedPlan([
+            PlanStep(models.RelationModel, relations={"other": 2}),
+            PlanStep(models.SimpleCharModel, seeds=3)
+        ])
+
+        self.assertEqual([step.model for step in plan.steps],
+                         [models.SimpleCharModel, models.RelationModel])
+
+    def test_nullable_cycle(self):
+        plan = SeedPlan([PlanStep(models.BookModel, seeds=4),
+                         PlanStep(models.AuthorModel, seeds=2)])
+
+        self.assertEqual([step.model for step in plan.steps],
+                         [models.BookModel, models.AuthorModel])
+        self.assertEqual(plan.steps[0].deferred, {"author"})
+
+        plan.run()
+
+        self.assertEqual(models.BookModel.objects.count(), 4)
+        self.assertFalse(models.BookModel.objects.filter(
+            author__isnull=True).exists())
+        self.assertFalse(models.AuthorModel.objects.filter(
+            featured__isnull=True).exists())
+
+    def test_cycle(self):
+        # Foreign keys given relations cannot be left empty
+        with self.assertRaises(PlanError):
+            SeedPlan([PlanStep(models.BookModel, relations={"author": 2}),
+                      PlanStep(models.AuthorModel,
+                               relations={"featured": 1})])
+
+    def test_run(self):
+        SeedPlan.from_dict({
+            "models": [
+                {"model": "tests.RelationModel", "relations": {"other": 4}},
+                {"model": "tests.SimpleCharModel", "seeds": 3},
+                {"model": "tests.SimpleIntModel", "seeds": 2,
+                 "values": {"value": 7}}
+            ]
+        }).run()
+
+        self.assertEqual(models.SimpleCharModel.objects.count(), 3)
+        self.assertEqual(models.RelationModel.objects.count(), 12)
+        self.assertEqual(
+            models.SimpleIntModel.objects.filter(value=7).count(), 2
+        )
+
+        for other in models.SimpleCharModel.objects.all():
+            self.assertEqual(other.relationmodel_set.count(), 4)
+
+    def test_random_seed(self):
+        spec = {
+            "random_seed": 3,
+            "models": [{"model": "tests.SimpleCharModel", "seeds": 5}]
+        }
+
+        SeedPlan.from_dict(spec).run()
+        first = list(models.SimpleCharModel.objects.order_by("pk")
+                     .values_list("name", flat=True))
+        models.SimpleCharModel.objects.all().delete()
+
+        SeedPlan.from_dict(spec).run()
+        second = list(models.SimpleCharModel.objects.order_by("pk")
+                      .values_list("name", flat=True))
+
+        self.assertEqual(first, second)
+
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "plan.json")
+            with open(path, "w") as plan_file:
+                json.dump({"models": [{"model": "tests.SimpleIntModel",
+                                       "seeds": 4}]}, plan_file)
+
+            SeedPlan.load(path).run()
+
+        self.assertEqual(models.SimpleIntModel.objects.count(), 4)
+
+    def test_unknown_model(self):
+        with self.assertRaises(PlanError):
+            SeedPlan.from_dict({"models": [{"model": "tests.Unknown"}]})
+
+    def test_generators(self):
+        SeedPlan.from_dict({
+            "models": [
+                {"model": "tests.SimpleCharModel", "seeds": 3,
+                 "generators": {"name": {"class": "WordGenerator",
+                                         "max_length": 4}}},
+                {"model": "tests.SimpleIntModel", "seeds": 2,
+                 "generators": {"value": "tests.test_plan.seventeen"}}
+            ]
+        }).run()
+
+        for name in models.SimpleCharModel.objects.values_list("name",
+                                                               flat=True):
+            self.assertTrue(0 < len(name) <= 4)
+
+        self.assertEqual(
+            models.SimpleIntModel.objects.filter(value=17).count(), 2
+        )
+
+    def test_unknown_generator(self):
+        with self.assertRaises(PlanError):
+            SeedPlan.from_dict({
+                "models": [{"model": "tests.SimpleCharModel",
+                            "generators": {"name": "UnknownGenerator"}}]
+            })
+
+    def test_invalid_numbers(self):
+        for spec in ({"seeds": "3"}, {"seeds": -1}, {"target_count": 1.5},
+                     {"batch_size": True}, {"relations": {"name": "2"}}):
+            with self.assertRaises(PlanError):
+                SeedPlan.from_dict({
+                    "models": [dict(spec, model="tests.SimpleCharModel")]
+                })
+
+    def test_fractional_ratio(self):
+        SeedPlan.from_dict({
+            "models": [
+                {"model": "tests.SimpleCharModel", "seeds": 3},
+                {"model": "tests.RelationModel", "relations": {"other": 1.5}}
+            ]
+        }).run()
+
+        self.assertEqual(models.RelationModel.objects.count(), 4)
+
+    def test_unknown_relation(self):
+        plan = SeedPlan.from_dict({
+            "models": [{"model": "tests.SimpleCharModel",
+                        "relations": {"name": 1}}]
+        })
+
+        with self.assertRaises(PlanError):
+            plan.run()
+
+
+class TestSeedPlanComponents(TestCase):
+
+    def test_components(self):
+        plan = SeedPlan([
+            PlanStep(models.SimpleIntModel, seeds=1),
+            PlanStep(models.RelationModel, relations={"other": 2}),
+            PlanStep(models.TreeModel, seeds=1),
+            PlanStep(models.SimpleCharModel, seeds=3)
+        ])
+
+        components = [[step.model for step in component.steps]
+                      for component in plan.components()]
+
+        self.assertEqual(components, [
+            [models.SimpleIntModel],
+            [models.TreeModel],
+            [models.SimpleCharModel, models.RelationModel]
+        ])
+
+
+class TestSeedPlanConcurrentRun(TransactionTestCase):
+
+    def test_run(self):
+        SeedPlan([
+            PlanStep(models.SimpleIntModel, seeds=20),
+            PlanStep(models.RelationModel, relations={"other": 2}),
+            PlanStep(models.SimpleCharModel, seeds=5)
+        ], batch_size=5).run(workers=2)
+
+        self.assertEqual(models.SimpleIntModel.objects.count(), 20)
+        self.assertEqual(models.SimpleCharModel.objects.count(), 5)
+        self.assertEqual(models.RelationModel.objects.count(), 10)
+
+    def test_nullable_cycle(self):
+        plan = SeedPlan([PlanStep(models.BookModel, seeds=4),
+                         PlanStep(models.AuthorModel, seeds=2),
+                         PlanStep(models.SimpleIntModel, seeds=3)])
+
+        # Both models of the cycle are seeded by the same worker
+        self.assertEqual(len(plan.components()), 2)
+
+        plan.run(workers=2)
+
+        self.assertFalse(models.BookModel.objects.filter(
+            author__isnull=True).exists())
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+
+from django.test import TestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.registry import RegistryError, RunRegistry, compact
+
+from . import models
+
+
+class TestCompact(TestCase):
+
+    def test_compact(self):
+        self.assertEqual(compact([5, 1, 2, 3, 7, 8]), [[1, 3], [5, 5], [7, 8]])
+
+    def test_merge(self):
+        self.assertEqual(compact([4, 10], [[1, 3], [6, 9]]), [[1, 4], [6, 10]])
+
+
+class TestRunRegistry(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "runs.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def seed(self, model, seeds, run_id, **kwargs):
+        registry = RunRegistry(self.path, run_id=run_id)
+        DataSeeder(model, seeds=seeds, batch_size=3, hooks=[registry],
+                   **kwargs).seed()
+
+        return registry
+
+    def test_records_ranges(self):
+        self.seed(models.SimpleIntModel, 7, "first")
+
+        with open(self.path) as registry_file:
+            runs = json.load(registry_file)["runs"]
+
+        pks = list(models.SimpleIntModel.objects.values_list("pk", flat=True))
+        self.assertEqual(runs["first"]["models"], {
+            "tests.SimpleIntModel": [[min(pks), max(pks)]]
+        })
+
+    def test_purge_truncates(self):
+        self.seed(models.SimpleIntModel, 7, "first")
+
+        purged = RunRegistry(self.path).purge("first")
+
+        self.assertEqual(purged, [("tests.SimpleIntModel", 7, True)])
+        self.assertEqual(models.SimpleIntModel.objects.count(), 0)
+        self.assertEqual(RunRegistry(self.path).runs, {})
+
+    def test_purge_ranges(self):
+        DataSeeder(models.SimpleIntModel, seeds=4).seed()
+        self.seed(models.SimpleIntModel, 7, "first")
+
+        purged = RunRegistry(self.path).purge(batch_size=2)
+
+        self.assertEqual(purged, [("tests.SimpleIntModel", 7, False)])
+        self.assertEqual(models.SimpleIntModel.objects.count(), 4)
+
+    def test_purge_referenced(self):
+        self.seed(models.SimpleCharModel, 3, "first")
+        other = models.SimpleCharModel.objects.first()
+        models.RelationModel.objects.create(other=other)
+
+        purged = RunRegistry(self.path).purge("first")
+
+        self.assertEqual(purged, [("tests.SimpleCharModel", 3, False),
+                                  ("tests.RelationModel", 1, False)])
+        self.assertEqual(models.SimpleCharModel.objects.count(), 0)
+        self.assertEqual(models.RelationModel.objects.count(), 0)
+
+    def test_purge_referencing_first(self):
+        self.seed(models.SimpleCharModel, 3, "first")
+        self.seed(models.RelationModel, 4, "first")
+
+        purged = RunRegistry(self.path).purge("first")
+
+        # The referencing table is purged first, so both are truncated
+        self.assertEqual(purged, [("tests.RelationModel", 4, True),
+                                  ("tests.SimpleCharModel", 3, True)])
+
+    def test_purge_run(self):
+        self.seed(models.SimpleIntModel, 5, "first")
+        self.seed(models.SimpleIntModel, 3, "second", preallocate_pks=True)
+
+        RunRegistry(self.path).purge("second")
+
+        self.assertEqual(models.SimpleIntModel.objects.count(), 5)
+        self.assertEqual(list(RunRegistry(self.path).runs), ["first"])
+
+    def test_purge_order(self):
+        self.seed(models.TreeModel, 2, "first", tree_field="parent", depth=2,
+                  branching=2)
+
+        purged = RunRegistry(self.path).purge()
+
+        self.assertEqual(sum(rows for label, rows, truncated in purged), 6)
+        self.assertEqual(models.TreeModel.objects.count(), 0)
+
+    def test_unknown_run(self):
+        with self.assertRaises(RegistryError):
+            RunRegistry(self.path).purge("missing")
+
+    def test_invalid(self):
+        with open(self.path, "w") as registry_file:
+            registry_file.write("{")
+
+        with self.assertRaises(RegistryError):
+            RunRegistry(self.path)
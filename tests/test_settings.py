@@ -13,5 +13,10 @@ DATABASES = {
     'default': {
         'NAME': os.path.join(PROJECT_ROOT, 'db.sqlite'),
         'ENGINE': 'django.db.backends.sqlite3',
+        # Concurrent seeding tests need a file so that SQLite waits on
+        # locks instead of failing, as shared in-memory databases do
+        'TEST': {
+            'NAME': os.path.join(PROJECT_ROOT, 'test_db.sqlite'),
+        },
     }
 }
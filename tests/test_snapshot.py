@@ -0,0 +1,87 @@
+import os
+import tempfile
+
+from django.test import TransactionTestCase
+
+from data_seeder.plan import PlanStep, SeedPlan
+from data_seeder.snapshot import SnapshotCache
+
+from . import models
+
+
+class TestSnapshotCache(TransactionTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = SnapshotCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def get_plan(self, seeds=5, random_seed=1):
+        return SeedPlan([
+            PlanStep(models.RelationModel, seeds=seeds,
+                     generate_related=True)
+        ], random_seed=random_seed)
+
+    def test_models(self):
+        self.assertEqual(self.get_plan().models(),
+                         [models.SimpleCharModel, models.RelationModel])
+
+    def test_key(self):
+        self.assertEqual(self.cache.key(self.get_plan()),
+                         self.cache.key(self.get_plan()))
+        self.assertNotEqual(self.cache.key(self.get_plan()),
+                            self.cache.key(self.get_plan(seeds=6)))
+        self.assertNotEqual(self.cache.key(self.get_plan()),
+                            self.cache.key(self.get_plan(random_seed=2)))
+
+    def test_key_referenced(self):
+        plan = SeedPlan([PlanStep(models.RelationModel, seeds=2)])
+        key = self.cache.key(plan)
+
+        # Seeded rows would reference other rows
+        models.SimpleCharModel.objects.create(name="other")
+        self.assertNotEqual(self.cache.key(plan), key)
+
+    def test_restore(self):
+        plan = self.get_plan()
+        self.assertFalse(self.cache.restore(plan))
+
+        plan.run()
+        self.cache.store(plan)
+        expected = list(models.RelationModel.objects.order_by("pk")
+                        .values_list("pk", "other_id", "other__name"))
+
+        models.RelationModel.objects.all().delete()
+        models.SimpleCharModel.objects.all().delete()
+
+        self.assertTrue(self.cache.restore(self.get_plan()))
+        self.assertEqual(list(models.RelationModel.objects.order_by("pk")
+                              .values_list("pk", "other_id", "other__name")),
+                         expected)
+
+    def test_restore_not_empty(self):
+        plan = self.get_plan()
+        plan.run()
+        self.cache.store(plan)
+
+        self.assertFalse(self.cache.restore(self.get_plan()))
+        self.assertEqual(models.RelationModel.objects.count(), 5)
+
+    def test_is_empty(self):
+        plan = self.get_plan()
+        self.assertTrue(self.cache.is_empty(plan))
+
+        models.SimpleCharModel.objects.create(name="existing")
+        self.assertFalse(self.cache.is_empty(plan))
+
+    def test_evict(self):
+        self.cache.max_size = 0
+        for seeds in (1, 2):
+            plan = self.get_plan(seeds=seeds)
+            plan.run()
+            self.cache.store(plan)
+
+        self.assertEqual(os.listdir(self.directory.name),
+                         [self.cache.key(self.get_plan(seeds=2))])
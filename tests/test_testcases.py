@@ -0,0 +1,50 @@
+from data_seeder.testcases import SeededTestCase
+
+from . import models
+
+
+class TestSeededTestCase(SeededTestCase):
+    seed_plan = [
+        {"model": models.SimpleCharModel, "seeds": 3},
+        {"model": "tests.RelationModel", "relations": {"other": 2}}
+    ]
+    random_seed = 1
+
+    def test_seeded(self):
+        self.assertEqual(models.SimpleCharModel.objects.count(), 3)
+        self.assertEqual(models.RelationModel.objects.count(), 6)
+        self.assertEqual(
+            sorted(self.seeded_pks[models.RelationModel]),
+            list(models.RelationModel.objects.order_by("pk")
+                 .values_list("pk", flat=True))
+        )
+
+    def test_rolled_back(self):
+        models.RelationModel.objects.all().delete()
+        self.assertEqual(models.RelationModel.objects.count(), 0)
+
+    def test_created_after(self):
+        # Sequences continue after the seeded rows
+        models.SimpleCharModel.objects.create(name="new")
+        self.assertEqual(models.SimpleCharModel.objects.count(), 4)
+
+
+class TestSharedSeededTestCase(TestSeededTestCase):
+
+    def test_shared(self):
+        plan = self.get_seed_plan()
+        rows = self._seeded_rows[self._get_key(plan)]
+
+        self.assertEqual(
+            list(models.RelationModel.objects.order_by("pk")
+                 .values_list("pk", "other_id")),
+            [(row[0], row[1]) for row in rows[models.RelationModel]]
+        )
+
+
+class TestOtherSeededTestCase(SeededTestCase):
+    seed_plan = [{"model": models.SimpleIntModel, "seeds": 2}]
+
+    def test_seeded(self):
+        self.assertEqual(models.SimpleIntModel.objects.count(), 2)
+        self.assertEqual(models.SimpleCharModel.objects.count(), 0)
@@ -0,0 +1,70 @@
+from django.test import TestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.plan import PlanError, SeedPlan
+from data_seeder.writers import RawWriter
+
+from . import models
+
+
+class TestTreeSeed(TestCase):
+
+    def test_levels(self):
+        DataSeeder(models.TreeModel, seeds=2, tree_field="parent", depth=3,
+                   branching=3).seed()
+
+        roots = models.TreeModel.objects.filter(parent=None)
+        self.assertEqual(roots.count(), 2)
+        self.assertEqual(models.TreeModel.objects.count(), 2 + 6 + 18)
+
+        for root in roots:
+            self.assertEqual(root.treemodel_set.count(), 3)
+            for child in root.treemodel_set.all():
+                self.assertEqual(child.treemodel_set.count(), 3)
+
+    def test_raw(self):
+        pks = DataSeeder(models.TreeModel, seeds=1, tree_field="parent",
+                         depth=4, branching=2, writer=RawWriter,
+                         preallocate_pks=True, return_seeds=False).seed()
+
+        self.assertEqual(len(pks), 15)
+        self.assertEqual(models.TreeModel.objects.count(), 15)
+        self.assertEqual(
+            models.TreeModel.objects.filter(parent=None).count(), 1
+        )
+
+    def test_unknown_pks(self):
+        # Rejected before the root level is written
+        with self.assertRaises(ValueError):
+            DataSeeder(models.TreeModel, tree_field="parent", depth=2,
+                       writer=RawWriter)
+
+        self.assertEqual(models.TreeModel.objects.count(), 0)
+
+    def test_plan_unknown_pks(self):
+        plan = SeedPlan.from_dict({
+            "writer": "raw",
+            "models": [{"model": "tests.TreeModel", "seeds": 2,
+                        "tree": {"field": "parent", "depth": 2}}]
+        })
+
+        with self.assertRaises(PlanError):
+            plan.run()
+
+        self.assertEqual(models.TreeModel.objects.count(), 0)
+
+    def test_invalid_field(self):
+        with self.assertRaises(ValueError):
+            DataSeeder(models.TreeModel, tree_field="name")
+
+        with self.assertRaises(ValueError):
+            DataSeeder(models.RelationModel, tree_field="other")
+
+    def test_plan(self):
+        SeedPlan.from_dict({
+            "models": [{"model": "tests.TreeModel", "seeds": 2,
+                        "tree": {"field": "parent", "depth": 2,
+                                 "branching": 4}}]
+        }).run()
+
+        self.assertEqual(models.TreeModel.objects.count(), 10)
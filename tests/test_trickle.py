@@ -0,0 +1,96 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from data_seeder.base import DataSeeder
+from data_seeder.trickle import TokenBucket, TrickleReport
+
+from . import models
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket(TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(100, capacity=10, clock=self.clock,
+                                  sleep=self.clock.sleep)
+
+    def test_acquire(self):
+        # The bucket starts empty and fills at the rate
+        self.assertTrue(self.bucket.acquire(10))
+        self.assertAlmostEqual(self.clock.now, 0.1)
+
+        self.assertTrue(self.bucket.acquire(5))
+        self.assertAlmostEqual(self.clock.now, 0.15)
+
+    def test_capacity(self):
+        # Idle time does not accrue more than the capacity
+        self.clock.now = 10.0
+        self.assertTrue(self.bucket.acquire(10))
+        self.assertTrue(self.bucket.acquire(10))
+        self.assertAlmostEqual(self.clock.now, 10.1)
+
+        with self.assertRaises(ValueError):
+            self.bucket.acquire(11)
+
+    def test_deadline(self):
+        self.assertFalse(self.bucket.acquire(10, deadline=0.05))
+        self.assertEqual(self.clock.now, 0.0)
+        self.assertTrue(self.bucket.acquire(10, deadline=0.1))
+
+
+class TestTrickleReport(TestCase):
+
+    def test_report(self):
+        report = TrickleReport(100)
+        for latency in range(1, 101):
+            report.record(10, latency * 1000000)
+        report.elapsed = 10.0
+
+        self.assertEqual(report.rows, 1000)
+        self.assertEqual(report.achieved_rate(), 100.0)
+        self.assertEqual(report.percentile(50), 50000000)
+        self.assertEqual(report.percentile(99), 99000000)
+        self.assertEqual(report.percentile(100), 100000000)
+        self.assertIn("p99 99.0ms", report.summary())
+
+
+class TestTrickleSeed(TestCase):
+
+    def test_trickle(self):
+        report = DataSeeder(models.ComplexModel).trickle(200, 0.3)
+
+        self.assertEqual(report.rows, models.ComplexModel.objects.count())
+        self.assertGreater(report.rows, 0)
+        self.assertEqual(report.batches, report.rows // 20)
+        self.assertLessEqual(report.achieved_rate(), 200 * 1.1)
+
+        created = list(models.ComplexModel.objects.order_by("pk")
+                       .values_list("created", flat=True))
+        self.assertEqual(created, sorted(set(created)))
+
+    def test_values(self):
+        created = timezone.make_aware(datetime.datetime(2020, 1, 1))
+        DataSeeder(models.ComplexModel, values={"created": created}) \
+            .trickle(100, 0.15, batch_size=5)
+
+        self.assertTrue(models.ComplexModel.objects.exists())
+        self.assertFalse(models.ComplexModel.objects
+                         .exclude(created=created).exists())
+
+    def test_target_count(self):
+        with self.assertRaises(ValueError):
+            DataSeeder(models.SimpleIntModel, target_count=5).trickle(1, 1)
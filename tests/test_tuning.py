@@ -0,0 +1,166 @@
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.plan import PlanStep, SeedPlan
+from data_seeder.tuning import (SqliteProfile, TuningProfile, get_profile,
+                                tuned_database)
+
+from . import models
+
+
+class RecordingProfile(TuningProfile):
+
+    settings = {"durability": "off"}
+
+    def __init__(self, **settings):
+        super().__init__(**settings)
+        self.values = {"durability": "full"}
+        self.during = []
+
+    def get(self, cursor, name):
+        return self.values[name]
+
+    def set(self, cursor, name, value):
+        self.values[name] = value
+
+
+class FailingProfile(RecordingProfile):
+
+    settings = {"durability": "off", "broken": "on"}
+
+    def set(self, cursor, name, value):
+        if name == "broken" and value == "on":
+            raise ValueError("Cannot set broken")
+
+        super().set(cursor, name, value)
+
+
+class TestTuningProfile(TestCase):
+
+    def get_cache_size(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA cache_size")
+            return cursor.fetchone()[0]
+
+    def test_get_profile(self):
+        profile = RecordingProfile()
+
+        self.assertIsInstance(get_profile("default", True), SqliteProfile)
+        self.assertIsNone(get_profile("default", False))
+        self.assertIs(get_profile("default", profile), profile)
+
+    def test_apply_and_revert(self):
+        before = self.get_cache_size()
+        profile = SqliteProfile(cache_size=-1234)
+
+        # journal_mode and synchronous cannot change inside a transaction
+        previous = profile.apply(connection)
+        self.assertEqual(list(previous), ["cache_size"])
+        self.assertEqual(self.get_cache_size(), -1234)
+
+        profile.revert(connection, previous)
+        self.assertEqual(self.get_cache_size(), before)
+
+    def test_apply_database(self):
+        profile = SqliteProfile()
+        profile.database_settings = ("cache_size",)
+
+        self.assertEqual(list(profile.apply_database(connection)),
+                         ["cache_size"])
+        self.assertNotIn("cache_size", profile.apply(connection))
+
+    def test_apply_failure(self):
+        profile = FailingProfile()
+        profile.values["broken"] = "off"
+
+        with self.assertRaises(ValueError):
+            profile.apply(connection)
+
+        self.assertEqual(profile.values, {"durability": "full",
+                                          "broken": "off"})
+
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            TuningProfile()
+
+    def test_seeder(self):
+        profile = RecordingProfile()
+        seeder = DataSeeder(models.SimpleIntModel, seeds=3, tuning=profile,
+                            values={"value": lambda: profile.during.append(
+                                profile.values["durability"]) or 1})
+        seeder.seed()
+
+        self.assertEqual(profile.during, ["off"] * 3)
+        self.assertEqual(profile.values, {"durability": "full"})
+
+    def test_reverted_on_error(self):
+        profile = RecordingProfile()
+        seeder = DataSeeder(models.SimpleIntModel, seeds=3, tuning=profile,
+                            values={"value": lambda: 1 // 0})
+
+        with self.assertRaises(ZeroDivisionError):
+            seeder.seed()
+
+        self.assertEqual(profile.values, {"durability": "full"})
+
+
+class TestPipelinedTuning(TransactionTestCase):
+
+    def test_pipelined(self):
+        profile = RecordingProfile()
+        DataSeeder(models.SimpleIntModel, seeds=5, batch_size=2,
+                   pipeline=True, tuning=True).seed()
+        DataSeeder(models.SimpleIntModel, seeds=5, batch_size=2,
+                   pipeline=True, tuning=profile).seed()
+
+        self.assertEqual(models.SimpleIntModel.objects.count(), 10)
+        self.assertEqual(profile.values, {"durability": "full"})
+
+    def get_journal_mode(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            return cursor.fetchone()[0]
+
+    def test_pipelined_relation(self):
+        before = self.get_journal_mode()
+        modes = []
+        DataSeeder(models.SimpleCharModel, seeds=10).seed()
+
+        # Values are generated on this thread while the writer thread
+        # writes over its own connection
+        DataSeeder(models.RelationModel, seeds=50, batch_size=5,
+                   pipeline=True, tuning=True,
+                   values={"id": lambda: modes.append(
+                       self.get_journal_mode()) or None}).seed()
+
+        self.assertEqual(models.RelationModel.objects.count(), 50)
+        self.assertEqual(set(modes), {"wal"})
+        self.assertEqual(self.get_journal_mode(), before)
+
+    def test_workers(self):
+        before = self.get_journal_mode()
+        plan = SeedPlan([
+            PlanStep(models.SimpleCharModel, seeds=20),
+            PlanStep(models.RelationModel, seeds=20),
+            PlanStep(models.SimpleIntModel, seeds=20)
+        ], batch_size=5, pipeline=True, tuning=True)
+
+        plan.run(workers=2)
+
+        self.assertEqual(models.RelationModel.objects.count(), 20)
+        self.assertEqual(models.SimpleIntModel.objects.count(), 20)
+        self.assertEqual(self.get_journal_mode(), before)
+
+    def test_nested(self):
+        before = self.get_journal_mode()
+
+        with tuned_database("default", True):
+            self.assertEqual(self.get_journal_mode(), "wal")
+
+            with tuned_database("default", True):
+                pass
+
+            self.assertEqual(self.get_journal_mode(), "wal")
+
+        self.assertEqual(self.get_journal_mode(), before)
@@ -0,0 +1,123 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+
+from data_seeder.base import DataSeeder
+from data_seeder.writers import OrmWriter, RawWriter
+
+from . import models
+
+
+class TestOrmWriter(TestCase):
+
+    def test_write(self):
+        seeder = DataSeeder(models.ComplexModel)
+        batch = seeder.generate_batch(0, 5)
+        OrmWriter(models.ComplexModel, "default").write(batch)
+
+        self.assertEqual(models.ComplexModel.objects.count(), 5)
+        self.assertEqual(
+            sorted(batch.pks),
+            sorted(models.ComplexModel.objects.values_list("pk", flat=True))
+        )
+
+
+class TestRawWriter(TestCase):
+
+    def test_write(self):
+        seeder = DataSeeder(models.ComplexModel)
+        batch = seeder.generate_batch(0, 5)
+        RawWriter(models.ComplexModel, "default").write(batch)
+
+        self.assertEqual(models.ComplexModel.objects.count(), 5)
+
+        names = sorted(models.ComplexModel.objects
+                       .values_list("name", flat=True))
+        self.assertEqual(names, sorted(batch.columns["name"]))
+
+    def test_chunks(self):
+        DataSeeder(models.SimpleIntModel, seeds=25, writer=RawWriter).seed()
+        self.assertEqual(models.SimpleIntModel.objects.count(), 25)
+
+        writer = RawWriter(models.SimpleIntModel, "default", chunk_size=4)
+        writer.write(DataSeeder(models.SimpleIntModel).generate_batch(0, 10))
+        self.assertEqual(models.SimpleIntModel.objects.count(), 35)
+
+    def test_constants(self):
+        DataSeeder(models.SimpleIntModel, seeds=3, values={"value": 9},
+                   writer=RawWriter).seed()
+
+        self.assertEqual(
+            models.SimpleIntModel.objects.filter(value=9).count(), 3
+        )
+
+    def test_relations(self):
+        others = DataSeeder(models.SimpleCharModel, seeds=2,
+                            return_seeds=False).seed()
+        DataSeeder(models.RelationModel, seeds=4, writer=RawWriter).seed()
+
+        for relation_model in models.RelationModel.objects.all():
+            self.assertIn(relation_model.other_id, others)
+
+    def test_update_auto_now(self):
+        DataSeeder(models.TimestampedModel, seeds=3,
+                   writer=RawWriter).seed()
+        pks = sorted(models.TimestampedModel.objects
+                     .values_list("pk", flat=True))
+
+        fields = [models.TimestampedModel._meta.get_field(name)
+                  for name in ("created", "updated")]
+        created = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+        batch = DataSeeder(models.TimestampedModel,
+                           values={"created": created}).generate_batch(0, 3)
+        batch["id"] = pks
+        RawWriter(models.TimestampedModel, "default").update(batch, fields)
+
+        # auto_now_add keeps the given values, only auto_now is refreshed
+        rows = models.TimestampedModel.objects.values("created", "updated")
+        for row in rows:
+            self.assertEqual(row["created"], created)
+            self.assertGreater(row["updated"], created)
+
+    def test_sql_cached(self):
+        writer = RawWriter(models.SimpleCharModel, "default")
+        batch = DataSeeder(models.SimpleCharModel).generate_batch(0, 1)
+        fields = writer._get_fields(batch)
+
+        self.assertIs(writer._get_sql(connection, fields),
+                      writer._get_sql(connection, fields))
+        self.assertNotIn("id", [field.attname for field in fields])
+
+
+class TestPreallocatedPks(TestCase):
+
+    def test_orm(self):
+        existing = DataSeeder(models.SimpleIntModel, seeds=2,
+                              return_seeds=False).seed()
+        pks = DataSeeder(models.SimpleIntModel, seeds=7, batch_size=3,
+                         preallocate_pks=True, return_seeds=False).seed()
+
+        self.assertEqual(pks, list(range(max(existing) + 1,
+                                         max(existing) + 8)))
+        self.assertEqual(
+            models.SimpleIntModel.objects.filter(pk__in=pks).count(), 7
+        )
+
+    def test_raw(self):
+        pks = DataSeeder(models.SimpleCharModel, seeds=5, writer=RawWriter,
+                         preallocate_pks=True, return_seeds=False).seed()
+        DataSeeder(models.RelationModel, seeds=10, writer=RawWriter,
+                   related_pks={"other": pks}).seed()
+
+        for pk in pks:
+            self.assertEqual(
+                models.RelationModel.objects.filter(other_id=pk).count(), 2
+            )
+
+    def test_sequence_continues(self):
+        pks = DataSeeder(models.SimpleIntModel, seeds=3, writer=RawWriter,
+                         preallocate_pks=True, return_seeds=False).seed()
+        created = models.SimpleIntModel.objects.create(value=1)
+
+        self.assertGreater(created.pk, max(pks))